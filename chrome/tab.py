@@ -2,15 +2,18 @@
 
 # MODIFIED: Added os and QMessageBox for the new direct-opening functionality
 import os
+import traceback
+from collections import OrderedDict
 from PySide6.QtWidgets import (QWidget, QHBoxLayout, QPushButton, QStackedWidget,
                                QTabBar, QGridLayout, QSizePolicy, QMessageBox)
 from PySide6.QtCore import QObject, Qt
 import qtawesome as qta
 
 # MODIFIED: AVAILABLE_TOOLS is now needed for the new method
-from tools.tool_loader import AVAILABLE_TOOLS
+from tools.tool_loader import AVAILABLE_TOOLS, get_widget_class
 from tools.placeholder_tool.placeholder_tool import PlaceholderTool
 from dashboard import DashboardWidget
+from session_journal import plain_entry_state
 
 class DraggableTabBar(QTabBar):
     """
@@ -67,20 +70,41 @@ class TabContainer(QWidget):
         self.tab_bar.setMaximumWidth(max_tab_width)
 
 
+# Tool and dashboard widgets kept alive across all tabs. Beyond this, the least
+# recently shown ones that are not on screen are hibernated: their state is
+# saved, the widget is deleted and it is recreated when navigated back to.
+MAX_LIVE_WIDGETS = 8
+
 class TabManager(QObject):
     """
     A non-visual class to manage the logic behind the tab system.
+
+    Each tab has a history of entries: {'widget', 'tool_id', 'title', 'state',
+    'edits'}. 'tool_id' is None for the dashboard. A hibernated entry has no
+    widget, only the 'state' its widget returned from save_state(). Tools opt
+    in to hibernation by implementing save_state() and restore_state(state);
+    save_state() may return None to stay alive, e.g. while a job is running.
+
+    With a SessionJournal (session_journal.py), each tab's history also has
+    a 'journal' following the entry it shows, so the tabs can be recovered
+    after a crash. Restored tabs, from a crash or a saved session, start with
+    every entry hibernated; 'edits' are the journaled edits still to be made
+    again once the entry's widget is created.
     """
-    def __init__(self, main_window, pages_widget, tab_container):
+    def __init__(self, main_window, pages_widget, tab_container, max_live_widgets=MAX_LIVE_WIDGETS, journal=None):
         super().__init__(main_window)
         self.main_window = main_window
         self.pages_widget = pages_widget
         self.tab_container = tab_container
         self.tab_histories = []
+        self.max_live_widgets = max_live_widgets
+        self.journal = journal
+        # History entries with a live widget, least recently shown first.
+        self._live_entries = OrderedDict()
 
         # Connect signals from the TabContainer UI to the manager's logic
         self.tab_container.tab_bar.tabCloseRequested.connect(self.close_tab)
-        self.tab_container.tab_bar.currentChanged.connect(self.pages_widget.setCurrentIndex)
+        self.tab_container.tab_bar.currentChanged.connect(self._on_current_tab_changed)
         self.tab_container.add_tab_button.clicked.connect(self.open_new_dashboard_tab)
 
     def go_back(self):
@@ -91,10 +115,7 @@ class TabManager(QObject):
         history_data = self.tab_histories[current_tab_index]
         if history_data['current_index'] > 0:
             history_data['current_index'] -= 1
-            stacked_widget = self.pages_widget.widget(current_tab_index)
-            history_item = history_data['history'][history_data['current_index']]
-            stacked_widget.setCurrentIndex(history_item['widget_index'])
-            self.tab_container.tab_bar.setTabText(current_tab_index, history_item['title'])
+            self._show_entry(current_tab_index, history_data['history'][history_data['current_index']])
 
     def go_forward(self):
         """Navigates to the next widget in the current tab's history."""
@@ -104,10 +125,7 @@ class TabManager(QObject):
         history_data = self.tab_histories[current_tab_index]
         if history_data['current_index'] < len(history_data['history']) - 1:
             history_data['current_index'] += 1
-            stacked_widget = self.pages_widget.widget(current_tab_index)
-            history_item = history_data['history'][history_data['current_index']]
-            stacked_widget.setCurrentIndex(history_item['widget_index'])
-            self.tab_container.tab_bar.setTabText(current_tab_index, history_item['title'])
+            self._show_entry(current_tab_index, history_data['history'][history_data['current_index']])
 
     def create_dashboard(self):
         """Creates the dashboard widget and connects its tool selection signal."""
@@ -116,6 +134,18 @@ class TabManager(QObject):
         dashboard_widget.tool_selected.connect(self.open_tool)
         return dashboard_widget
 
+    def create_tool_widget(self, tool_id):
+        """
+        Instantiates a tool's widget, importing the tool on first use.
+        Returns None if the tool's module could not be loaded.
+        """
+        # The tool's module is imported here, the first time it is opened.
+        ToolWidgetClass = get_widget_class(tool_id)
+        if ToolWidgetClass is None:
+            return None
+        tool_display_name = AVAILABLE_TOOLS[tool_id]['display_name']
+        return ToolWidgetClass(tool_display_name) if issubclass(ToolWidgetClass, PlaceholderTool) else ToolWidgetClass()
+
     def open_tool(self, tool_key):
         """Adds the selected tool to the current tab's content stack."""
         current_tab_index = self.tab_container.tab_bar.currentIndex()
@@ -125,48 +155,33 @@ class TabManager(QObject):
             print(f"Error: Tool '{tool_key}' not found in tool manager.")
             return
 
-        tool_info = AVAILABLE_TOOLS[tool_key]
-        ToolWidgetClass = tool_info['widget_class']
-        tool_display_name = tool_info['display_name']
-        
-        tool_widget = ToolWidgetClass(tool_display_name) if issubclass(ToolWidgetClass, PlaceholderTool) else ToolWidgetClass()
+        tool_display_name = AVAILABLE_TOOLS[tool_key]['display_name']
+        tool_widget = self.create_tool_widget(tool_key)
+        if tool_widget is None:
+            QMessageBox.critical(self.main_window, "Tool Error",
+                                 f"The tool '{tool_display_name}' could not be loaded.")
+            return
 
         stacked_widget = self.pages_widget.widget(current_tab_index)
-        tool_widget_index = stacked_widget.addWidget(tool_widget)
+        stacked_widget.addWidget(tool_widget)
 
         history_data = self.tab_histories[current_tab_index]
         current_pos = history_data['current_index']
 
-        # Clear forward history when a new tool is opened
+        # Clear forward history when a new tool is opened. Those entries can no
+        # longer be reached, so their widgets are disposed of right away.
+        for entry in history_data['history'][current_pos + 1:]:
+            self._dispose_entry(entry)
         history_data['history'] = history_data['history'][:current_pos + 1]
-        history_data['history'].append({'widget_index': tool_widget_index, 'title': tool_display_name})
-        history_data['current_index'] += 1
 
-        stacked_widget.setCurrentWidget(tool_widget)
-        self.tab_container.tab_bar.setTabText(current_tab_index, tool_display_name)
+        entry = self._new_entry(tool_widget, tool_key, tool_display_name)
+        history_data['history'].append(entry)
+        history_data['current_index'] += 1
+        self._show_entry(current_tab_index, entry)
 
     def open_new_dashboard_tab(self):
         """Opens a new tab with the dashboard view."""
-        new_dashboard = self.create_dashboard()
-        
-        # Each tab needs its own QStackedWidget to manage its history
-        stacked_widget = QStackedWidget()
-        dashboard_index_in_stack = stacked_widget.addWidget(new_dashboard)
-
-        # Initialize the history for this new tab
-        self.tab_histories.append({
-            'history': [{'widget_index': dashboard_index_in_stack, 'title': 'Dashboard'}],
-            'current_index': 0
-        })
-        
-        # Add the tab's QStackedWidget to the main pages widget
-        page_index = self.pages_widget.addWidget(stacked_widget)
-        
-        # Add a tab to the UI and make it current
-        new_tab_index = self.tab_container.tab_bar.addTab("Dashboard")
-        self.tab_container.tab_bar.setTabsClosable(True)
-        self.tab_container.tab_bar.setCurrentIndex(new_tab_index)
-        self.pages_widget.setCurrentIndex(page_index)
+        self._add_tab([self._new_entry(self.create_dashboard(), None, 'Dashboard')])
 
 
     # NEW: This method handles opening a file directly into a chosen tool
@@ -181,10 +196,13 @@ class TabManager(QObject):
             self.open_new_dashboard_tab()
             return
 
-        tool_info = AVAILABLE_TOOLS[tool_id]
-        ToolWidgetClass = tool_info['widget_class']
-        tool_display_name = tool_info['display_name']
-        tool_widget = ToolWidgetClass(tool_display_name) if issubclass(ToolWidgetClass, PlaceholderTool) else ToolWidgetClass()
+        tool_display_name = AVAILABLE_TOOLS[tool_id]['display_name']
+        tool_widget = self.create_tool_widget(tool_id)
+        if tool_widget is None:
+            QMessageBox.critical(self.main_window, "Tool Error",
+                                 f"The tool '{tool_display_name}' could not be loaded.")
+            self.open_new_dashboard_tab()
+            return
 
         # Convention: Check for a method to load the file on startup
         if hasattr(tool_widget, 'load_file_on_startup'):
@@ -193,32 +211,95 @@ class TabManager(QObject):
             except Exception as e:
                 QMessageBox.critical(self.main_window, "File Load Error",
                                      f"Failed to load '{os.path.basename(file_path)}' in {tool_display_name}.\n\nError: {e}")
+                tool_widget.deleteLater()
                 self.open_new_dashboard_tab()
                 return
         else:
             QMessageBox.warning(self.main_window, "Tool Incompatible",
                                 f"The tool '{tool_display_name}' cannot open files directly.")
+            tool_widget.deleteLater()
             self.open_new_dashboard_tab()
             return
 
-        # Create a new tab for this tool (logic adapted from open_new_dashboard_tab)
+        self._add_tab([self._new_entry(tool_widget, tool_id, tool_display_name)])
+
+    def _add_tab(self, history, current_index=0, make_current=True):
+        """
+        Adds a tab with a history of entries, showing the one at current_index.
+        Hibernated entries get their widget once they are shown.
+        """
+        # Each tab needs its own QStackedWidget to manage its history
         stacked_widget = QStackedWidget()
-        tool_widget_index = stacked_widget.addWidget(tool_widget)
-        self.tab_histories.append({
-            'history': [{'widget_index': tool_widget_index, 'title': tool_display_name}],
-            'current_index': 0
-        })
+        for entry in history:
+            if entry['widget'] is not None:
+                stacked_widget.addWidget(entry['widget'])
+        history_data = {
+            'history': history,
+            'current_index': current_index,
+            'journal': self.journal.open_tab() if self.journal is not None else None,
+        }
+        self.tab_histories.append(history_data)
         page_index = self.pages_widget.addWidget(stacked_widget)
-        new_tab_index = self.tab_container.tab_bar.addTab(tool_display_name)
+        new_tab_index = self.tab_container.tab_bar.addTab(history[current_index]['title'])
         self.tab_container.tab_bar.setTabsClosable(True)
-        self.tab_container.tab_bar.setCurrentIndex(new_tab_index)
-        self.pages_widget.setCurrentIndex(page_index)
-
+        if history_data['journal'] is not None:
+            history_data['journal'].show_entry(history[current_index])
+        if make_current:
+            self.tab_container.tab_bar.setCurrentIndex(new_tab_index)
+            self.pages_widget.setCurrentIndex(page_index)
+
+    # --- Sessions ---
+
+    def session_state(self):
+        """The open tabs and their histories as plain data, for restore_session()."""
+        return {
+            "current_tab": self.tab_container.tab_bar.currentIndex(),
+            "tabs": [{
+                "current_index": history_data['current_index'],
+                "history": [{"tool_id": entry['tool_id'], "title": entry['title'],
+                             "state": plain_entry_state(entry), "edits": entry['edits']}
+                            for entry in history_data['history']],
+            } for history_data in self.tab_histories],
+        }
+
+    def restore_session(self, session):
+        """
+        Reopens the tabs of a session_state() after the open ones. Only the
+        current tab's entry gets its widget now, every other entry stays
+        hibernated until it is first shown. Returns the number of tabs opened.
+        """
+        tabs = [tab for tab in session.get("tabs", []) if tab.get("history")]
+        if not tabs:
+            return 0
+        tab_bar = self.tab_container.tab_bar
+        first_tab_index = tab_bar.count()
+        current_tab_index = first_tab_index + min(max(session.get("current_tab", 0), 0), len(tabs) - 1)
+        # No tab is shown while they are added, adding the first one would otherwise create its widget.
+        tab_bar.blockSignals(True)
+        try:
+            for tab in tabs:
+                history = [self._new_entry(None, entry.get("tool_id"), entry.get("title", ""),
+                                           entry.get("state"), entry.get("edits"))
+                           for entry in tab["history"]]
+                current_index = min(max(tab.get("current_index", 0), 0), len(history) - 1)
+                self._add_tab(history, current_index, make_current=False)
+            tab_bar.setCurrentIndex(current_tab_index)
+        finally:
+            tab_bar.blockSignals(False)
+        self._on_current_tab_changed(current_tab_index)
+        return len(tabs)
 
     def close_tab(self, index):
         """Closes the tab at the given index, ensuring at least one tab remains."""
         if self.tab_container.tab_bar.count() <= 1: return
 
+        # Remove the corresponding history first, removing the tab changes the current index.
+        for entry in self.tab_histories[index]['history']:
+            self._live_entries.pop(id(entry), None)
+        if self.tab_histories[index]['journal'] is not None:
+            self.journal.close_tab(self.tab_histories[index]['journal'])
+        del self.tab_histories[index]
+
         widget = self.pages_widget.widget(index)
         self.pages_widget.removeWidget(widget)
         if widget is not None:
@@ -226,5 +307,102 @@ class TabManager(QObject):
             widget.deleteLater()
             
         self.tab_container.tab_bar.removeTab(index)
-        # Remove the corresponding history for the closed tab
-        del self.tab_histories[index]
\ No newline at end of file
+
+    # --- History Entries and Hibernation ---
+
+    def _new_entry(self, widget, tool_id, title, state=None, edits=None):
+        """Creates a history entry, for a live widget or a hibernated one with its state."""
+        return {'widget': widget, 'tool_id': tool_id, 'title': title, 'state': state, 'edits': edits or []}
+
+    def _on_current_tab_changed(self, index):
+        """Shows the selected tab's page and wakes its current widget if it was hibernated."""
+        self.pages_widget.setCurrentIndex(index)
+        if 0 <= index < len(self.tab_histories):
+            history_data = self.tab_histories[index]
+            self._show_entry(index, history_data['history'][history_data['current_index']])
+
+    def _show_entry(self, tab_index, entry):
+        """Makes a history entry the visible page of its tab, recreating its widget if needed."""
+        stacked_widget = self.pages_widget.widget(tab_index)
+        if entry['widget'] is None:
+            self._wake_entry(stacked_widget, entry)
+        stacked_widget.setCurrentWidget(entry['widget'])
+        self.tab_container.tab_bar.setTabText(tab_index, entry['title'])
+        tab_journal = self.tab_histories[tab_index]['journal']
+        if tab_journal is not None:
+            tab_journal.show_entry(entry)
+
+        # Mark as most recently shown, then make room if over the limit.
+        self._live_entries.pop(id(entry), None)
+        self._live_entries[id(entry)] = entry
+        self._enforce_live_limit(entry)
+
+    def _enforce_live_limit(self, visible_entry):
+        """Hibernates the least recently shown widgets until the limit is met."""
+        for entry in list(self._live_entries.values()):
+            if len(self._live_entries) <= self.max_live_widgets:
+                break
+            if entry is not visible_entry:
+                self._hibernate_entry(entry)
+
+    def _hibernate_entry(self, entry):
+        """
+        Saves an entry's state and deletes its widget. Returns False if the
+        widget does not support hibernation or refuses it right now.
+        """
+        widget = entry['widget']
+        if entry['tool_id'] is None:
+            state = {}  # The dashboard has nothing to save
+        elif hasattr(widget, 'save_state'):
+            state = widget.save_state()
+        else:
+            state = None
+        if state is None:
+            return False
+
+        entry['state'] = state
+        self._dispose_entry(entry)
+        return True
+
+    def _wake_entry(self, stacked_widget, entry):
+        """Recreates a hibernated entry's widget and restores its saved state."""
+        if entry['tool_id'] is None:
+            widget = self.create_dashboard()
+        else:
+            widget = self.create_tool_widget(entry['tool_id'])
+            if widget is None:
+                # The module failed to load, or a restored session names a tool
+                # that is gone; fall back to an empty placeholder.
+                widget = PlaceholderTool(entry['title'])
+            else:
+                self._restore_widget(widget, entry)
+        entry['state'] = None
+        entry['edits'] = []
+        entry['widget'] = widget
+        stacked_widget.addWidget(widget)
+
+    def _restore_widget(self, widget, entry):
+        """
+        Restores an entry's state and makes its journaled edits again on its
+        new widget. A failure is reported, the widget keeps what was restored.
+        """
+        try:
+            if entry['state'] and hasattr(widget, 'restore_state'):
+                widget.restore_state(entry['state'])
+            for data in entry['edits']:
+                widget.replay_journal_record(data)
+        except Exception:
+            print(f"Error: '{entry['title']}' could not be fully restored.")
+            traceback.print_exc()
+
+    def _dispose_entry(self, entry):
+        """Removes an entry's widget from its stack and deletes it."""
+        self._live_entries.pop(id(entry), None)
+        widget = entry['widget']
+        if widget is None:
+            return
+        entry['widget'] = None
+        stacked_widget = widget.parentWidget()
+        if isinstance(stacked_widget, QStackedWidget):
+            stacked_widget.removeWidget(widget)
+        widget.deleteLater()
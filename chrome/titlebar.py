@@ -6,6 +6,7 @@ from PySide6.QtCore import Qt, QObject, QEvent, QRect, QPoint, Signal
 from PySide6.QtGui import QCursor, QPainter, QAction
 import qtawesome as qta
 from chrome.tab import TabContainer
+from jobs import job_manager
 
 class CustomTitleBar(QWidget):
     """
@@ -66,6 +67,16 @@ class CustomTitleBar(QWidget):
 
         layout.addStretch(1)
 
+        # Background jobs indicator, only visible while tool jobs are running
+        self.jobs_button = QPushButton(qta.icon('mdi.progress-clock'), "")
+        self.jobs_button.setObjectName("jobs_button")
+        self.jobs_button.setFixedHeight(30)
+        self.jobs_button.setMinimumWidth(30)
+        self.jobs_button.clicked.connect(self.show_jobs_menu)
+        self.jobs_button.setVisible(False)
+        job_manager.jobs_changed.connect(self.update_jobs_indicator)
+        layout.addWidget(self.jobs_button)
+
         self.menu_button = QPushButton(qta.icon('mdi.dots-vertical'), "")
         self.menu_button.setFixedSize(30, 30)
         self.menu_button.clicked.connect(self.show_options_menu)
@@ -172,6 +183,35 @@ class CustomTitleBar(QWidget):
         button_pos = self.menu_button.mapToGlobal(QPoint(0, self.menu_button.height()))
         context_menu.exec(button_pos)
 
+    def update_jobs_indicator(self):
+        """Shows the number of running jobs, or the progress of a single one."""
+        jobs = job_manager.active_jobs
+        self.jobs_button.setVisible(bool(jobs))
+        if not jobs:
+            return
+        if len(jobs) == 1:
+            self.jobs_button.setText(f" {jobs[0].percent}%")
+        else:
+            self.jobs_button.setText(f" {len(jobs)}")
+        self.jobs_button.setToolTip("\n".join(f"{job.title}: {job.percent}%" for job in jobs))
+
+    def show_jobs_menu(self):
+        """Lists the running jobs with an option to cancel each of them."""
+        jobs_menu = QMenu(self)
+        for job in job_manager.active_jobs:
+            status = "cancelling..." if job.is_cancelled() else f"{job.percent}%"
+            cancel_action = QAction(qta.icon('mdi.close-circle-outline'), f"{job.title} ({status})", jobs_menu)
+            cancel_action.setToolTip("Cancel this job")
+            cancel_action.triggered.connect(job.cancel)
+            jobs_menu.addAction(cancel_action)
+        if len(job_manager.active_jobs) > 1:
+            jobs_menu.addSeparator()
+            cancel_all_action = QAction("Cancel All", jobs_menu)
+            cancel_all_action.triggered.connect(job_manager.cancel_all)
+            jobs_menu.addAction(cancel_all_action)
+        button_pos = self.jobs_button.mapToGlobal(QPoint(0, self.jobs_button.height()))
+        jobs_menu.exec(button_pos)
+
     def paintEvent(self, event):
         option = QStyleOption()
         option.initFrom(self)
@@ -183,7 +223,7 @@ class CustomTitleBar(QWidget):
         if hasattr(self, 'tab_container'):
             button_width = 30
             spacing = 5
-            fixed_elements_width = (6 * button_width) + (7 * spacing) + 100
+            fixed_elements_width = (7 * button_width) + (8 * spacing) + 100
             available_width = self.width() - fixed_elements_width
             self.tab_container.update_tab_bar_width(available_width)
 
@@ -0,0 +1,233 @@
+# core/cue_store.py
+#
+# A compact, tool-agnostic in-memory representation of a subtitle track.
+# Every tool reads subtitle files into a CueStore and writes them back out
+# through it, instead of keeping its own list of dicts or srt.Subtitle objects.
+
+import os
+from array import array
+
+from core.srt_stream import Cue, iter_cues, iter_file_cues, format_srt_block, write_srt
+from core.mapped_srt import is_mappable_encoding, map_file, validate_utf8, iter_mapped_cues, decode_text
+from core.encoding import AUTO, resolve_encoding
+from core.progress import step_progress
+
+
+class CueStore:
+    """
+    Stores cues as parallel columns instead of one Python object per cue.
+
+    - starts, ends: array('q') of start/end times in integer milliseconds.
+      They are plain buffers, so they can be wrapped by NumPy without copying
+      to run per-cue operations on whole columns at once.
+    - All cue texts live in a single UTF-8 bytearray, each cue only keeps the
+      begin/end offsets of its slice. Texts are decoded on access.
+
+    Replacing a cue's text appends the new bytes and repoints the offsets; the
+    buffer is compacted once more than half of it is unreferenced.
+
+    A store loaded by from_file() can instead keep its texts in the mapped
+    file (see core/mapped_srt.py). Those offsets are stored inverted (~offset,
+    always negative) and point into the map; a replaced text moves to the buffer.
+    """
+    def __init__(self):
+        self.starts = array('q')
+        self.ends = array('q')
+        self._text_begins = array('q')
+        self._text_ends = array('q')
+        self._text_buffer = bytearray()
+        self._dead_bytes = 0
+        # The mapped input file and its path, if texts still point into it.
+        # A copy() holds the file's bytes instead, without a path.
+        self._source = None
+        self._source_path = None
+
+    # --- Construction ---
+
+    @classmethod
+    def from_cues(cls, cues):
+        """Builds a new CueStore from an iterable of Cue tuples."""
+        store = cls()
+        for start_ms, end_ms, text in cues:
+            store.append(start_ms, end_ms, text)
+        return store
+
+    @classmethod
+    def from_srt(cls, content):
+        """Parses SRT content (a string) into a new CueStore."""
+        return cls.from_cues(iter_cues([content]))
+
+    @classmethod
+    def from_file(cls, path, encoding=AUTO, progress=None, mapped=True):
+        """
+        Loads an SRT file into a new CueStore without reading it whole.
+
+        The encoding is detected unless given. UTF-8 files are memory-mapped
+        and their cue texts decoded on access, unless mapped is False. Other
+        encodings are streamed.
+        """
+        detection = resolve_encoding(path, encoding)
+        if mapped and is_mappable_encoding(detection.encoding):
+            try:
+                return cls._from_mapped_file(path, progress)
+            except UnicodeDecodeError:
+                # An ASCII start only suggested UTF-8, stream it with the legacy fallback.
+                if not detection.ascii_only:
+                    raise
+        return cls.from_cues(iter_file_cues(path, encoding=encoding, progress=progress))
+
+    @classmethod
+    def _from_mapped_file(cls, path, progress=None):
+        store = cls()
+        source = map_file(path)
+        if source is None:
+            return store
+        # Invalid bytes must fail here, as they would when streaming, not on first access.
+        try:
+            validate_utf8(source, step_progress(progress, 0, 2))
+        except UnicodeDecodeError:
+            source.close()
+            raise
+        for start_ms, end_ms, text_begin, text_end in iter_mapped_cues(source, step_progress(progress, 1, 2)):
+            store.starts.append(start_ms)
+            store.ends.append(end_ms)
+            store._text_begins.append(~text_begin)
+            store._text_ends.append(~text_end)
+        store._source = source
+        store._source_path = path
+        return store
+
+    def append(self, start_ms, end_ms, text):
+        """Adds a cue at the end of the store."""
+        encoded = text.encode('utf-8')
+        begin = len(self._text_buffer)
+        self._text_buffer += encoded
+        self.starts.append(start_ms)
+        self.ends.append(end_ms)
+        self._text_begins.append(begin)
+        self._text_ends.append(begin + len(encoded))
+
+    def extend(self, cues):
+        """Appends every cue of another CueStore (or any Cue iterable) to this one."""
+        for start_ms, end_ms, text in cues:
+            self.append(start_ms, end_ms, text)
+
+    # --- Access ---
+
+    def __len__(self):
+        return len(self.starts)
+
+    def __iter__(self):
+        """Yields Cue tuples in store order."""
+        for i in range(len(self.starts)):
+            yield Cue(self.starts[i], self.ends[i], self.text(i))
+
+    def __getitem__(self, i):
+        return Cue(self.starts[i], self.ends[i], self.text(i))
+
+    def text(self, i):
+        """Returns the decoded text of cue i."""
+        begin = self._text_begins[i]
+        if begin < 0:
+            return decode_text(self._source[~begin:~self._text_ends[i]])
+        return self._text_buffer[begin:self._text_ends[i]].decode('utf-8')
+
+    def texts(self):
+        """Returns a list with the decoded text of every cue."""
+        return [self.text(i) for i in range(len(self.starts))]
+
+    # --- Mutation ---
+
+    def set_times(self, i, start_ms, end_ms):
+        self.starts[i] = start_ms
+        self.ends[i] = end_ms
+
+    def set_text(self, i, text):
+        """Replaces the text of cue i."""
+        if self._text_begins[i] >= 0:
+            self._dead_bytes += self._text_ends[i] - self._text_begins[i]
+        encoded = text.encode('utf-8')
+        begin = len(self._text_buffer)
+        self._text_buffer += encoded
+        self._text_begins[i] = begin
+        self._text_ends[i] = begin + len(encoded)
+        if self._dead_bytes * 2 > len(self._text_buffer):
+            self._compact()
+
+    def sort(self):
+        """Stable-sorts the cues by (start, end), as srt.compose does on export."""
+        order = sorted(range(len(self.starts)), key=lambda i: (self.starts[i], self.ends[i]))
+        if all(position == i for i, position in enumerate(order)):
+            return
+        self.starts = array('q', (self.starts[i] for i in order))
+        self.ends = array('q', (self.ends[i] for i in order))
+        self._text_begins = array('q', (self._text_begins[i] for i in order))
+        self._text_ends = array('q', (self._text_ends[i] for i in order))
+
+    def _compact(self):
+        """Rebuilds the text buffer without the slices no cue points to anymore."""
+        buffer = bytearray()
+        for i in range(len(self.starts)):
+            if self._text_begins[i] < 0:
+                continue  # Still in the mapped file
+            begin = len(buffer)
+            buffer += self._text_buffer[self._text_begins[i]:self._text_ends[i]]
+            self._text_begins[i] = begin
+            self._text_ends[i] = len(buffer)
+        self._text_buffer = buffer
+        self._dead_bytes = 0
+
+    def copy(self):
+        """
+        Returns a copy sharing nothing that this store changes, so it can be
+        read from another thread. Texts still in the mapped file stay
+        undecoded, the copy keeps the bytes of the whole file instead.
+        """
+        store = CueStore()
+        store.starts = array('q', self.starts)
+        store.ends = array('q', self.ends)
+        store._text_begins = array('q', self._text_begins)
+        store._text_ends = array('q', self._text_ends)
+        store._text_buffer = bytearray(self._text_buffer)
+        store._dead_bytes = self._dead_bytes
+        if self._source is not None:
+            store._source = bytes(self._source)
+        return store
+
+    def release_source(self, path=None):
+        """
+        Copies the texts still in the mapped input file into the store and
+        unmaps the file, e.g. before overwriting it. With a path, only does
+        so if that is the mapped file.
+        """
+        if self._source is None or self._source_path is None:
+            return
+        if path is not None and not (os.path.exists(path) and os.path.samefile(path, self._source_path)):
+            return
+        for i in range(len(self.starts)):
+            begin = self._text_begins[i]
+            if begin < 0:
+                encoded = decode_text(self._source[~begin:~self._text_ends[i]]).encode('utf-8')
+                self._text_begins[i] = len(self._text_buffer)
+                self._text_buffer += encoded
+                self._text_ends[i] = len(self._text_buffer)
+        self._source.close()
+        self._source = None
+        self._source_path = None
+
+    # --- Output ---
+
+    def iter_srt_blocks(self, start_index=1):
+        """Yields each cue as a complete SRT block, ending with a blank line."""
+        for offset in range(len(self.starts)):
+            yield format_srt_block(start_index + offset, self.starts[offset], self.ends[offset], self.text(offset))
+
+    def to_srt(self, start_index=1):
+        """Composes the whole store into an SRT string."""
+        return "".join(self.iter_srt_blocks(start_index))
+
+    def write(self, path, encoding='utf-8', start_index=1):
+        """Writes the store to an SRT file block by block."""
+        # A mapped file cannot be replaced on every platform, and must not change under the map.
+        self.release_source(path)
+        write_srt(path, self, encoding, start_index)
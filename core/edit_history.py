@@ -0,0 +1,118 @@
+# core/edit_history.py
+#
+# Undo and redo stacks with a memory cap, independent of what is edited.
+# The history only keeps the edits and their sizes; applying or reverting an
+# edit is left to the owner, which knows the document (see PieceTable splices
+# in core/piece_table.py).
+
+from collections import deque
+from contextlib import contextmanager
+
+# Memory the undo and redo stacks may use together, in bytes (estimated).
+DEFAULT_MAX_HISTORY_BYTES = 64 * 1024 * 1024
+
+
+class EditHistory:
+    """
+    Undo and redo stacks of steps, a step being the list of edits one user
+    action made. Edits recorded inside group() make a single step, so a bulk
+    operation touching thousands of places is undone at once.
+
+    Each edit is recorded with its estimated size in bytes. Once the steps
+    take more than max_bytes, the oldest ones are forgotten; the latest step
+    is always kept so the last action can be undone.
+    """
+    def __init__(self, max_bytes=DEFAULT_MAX_HISTORY_BYTES):
+        self.max_bytes = max_bytes
+        # Steps are [edits, size] lists, the newest at the right.
+        self._undo = deque()
+        self._redo = []
+        self._bytes = 0
+        # The step being collected by group(), and how deeply groups are nested.
+        self._group = None
+        self._group_depth = 0
+
+    def __len__(self):
+        """The number of steps that can be undone."""
+        return len(self._undo)
+
+    @property
+    def size(self):
+        """Estimated bytes held by the undo and redo stacks."""
+        return self._bytes
+
+    def can_undo(self):
+        return bool(self._undo)
+
+    def can_redo(self):
+        return bool(self._redo)
+
+    def clear(self):
+        self._undo.clear()
+        self._redo.clear()
+        self._bytes = 0
+
+    @contextmanager
+    def group(self):
+        """Records every edit made inside the block as one step. Groups may be nested."""
+        if not self._group_depth:
+            self._group = [[], 0]
+        self._group_depth += 1
+        try:
+            yield
+        finally:
+            self._group_depth -= 1
+            if not self._group_depth:
+                step, self._group = self._group, None
+                if step[0]:
+                    self._push(step)
+
+    def record(self, edit, size, merge=None):
+        """
+        Records an edit of the given size. Outside a group, merge(last, edit)
+        may return one edit replacing the previous step's only edit and this
+        one (e.g. consecutive keystrokes), or None to start a new step.
+        """
+        if self._group is not None:
+            self._group[0].append(edit)
+            self._group[1] += size
+            return
+        if merge and not self._redo and self._undo and len(self._undo[-1][0]) == 1:
+            last = self._undo[-1]
+            merged = merge(last[0][0], edit)
+            if merged is not None:
+                last[0][0] = merged
+                last[1] += size
+                self._bytes += size
+                self._trim()
+                return
+        self._push([[edit], size])
+
+    def undo(self):
+        """Moves the latest step to the redo stack and returns its edits in recorded order, or None."""
+        if not self._undo:
+            return None
+        step = self._undo.pop()
+        self._redo.append(step)
+        return step[0]
+
+    def redo(self):
+        """Moves the latest undone step back and returns its edits in recorded order, or None."""
+        if not self._redo:
+            return None
+        step = self._redo.pop()
+        self._undo.append(step)
+        return step[0]
+
+    def _push(self, step):
+        # A new action makes the undone steps unreachable.
+        for _, size in self._redo:
+            self._bytes -= size
+        self._redo.clear()
+        self._undo.append(step)
+        self._bytes += step[1]
+        self._trim()
+
+    def _trim(self):
+        while self._bytes > self.max_bytes and len(self._undo) > 1:
+            self._bytes -= self._undo.popleft()[1]
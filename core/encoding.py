@@ -0,0 +1,196 @@
+# core/encoding.py
+#
+# Encoding detection for subtitle inputs, shared by every reader. Only the
+# first SAMPLE_SIZE bytes of a file are looked at:
+# 1. A byte order mark decides (UTF-8, UTF-16, UTF-32).
+# 2. NUL bytes in every other position mean UTF-16 without a BOM.
+# 3. A sample that decodes as UTF-8 is UTF-8.
+# 4. Otherwise a legacy encoding is picked: GB18030 if the sample decodes as
+#    mostly CJK text and reads better that way than as cp1252, else cp1252.
+#    Two accented cp1252 letters often form a valid GB18030 character, so a
+#    few ideographs alone prove nothing (see _detect_legacy_encoding).
+# A sample that is plain ASCII proves nothing, so such files are decoded as
+# UTF-8 but switch to cp1252 at the first byte that is not UTF-8 (see
+# Utf8OrLegacyDecoder). Detection never costs a pass over the whole file.
+
+import codecs
+from collections import namedtuple
+
+# Pass as encoding to detect it from the file's content.
+AUTO = 'auto'
+
+# Bytes read from the start of a file to detect its encoding.
+SAMPLE_SIZE = 32 * 1024
+
+# The legacy encoding assumed for text that is not UTF-8 nor CJK.
+LEGACY_ENCODING = 'cp1252'
+
+# At least this share of the non-ASCII characters of a sample decoded as
+# GB18030 must be CJK for the sample to count as Chinese.
+CJK_MIN_RATIO = 0.6
+
+# Nor does it count with fewer CJK characters than this, however high the share.
+CJK_MIN_CHARS = 2
+
+# Checked in this order, UTF-32 LE starts with the UTF-16 LE mark.
+BOMS = (
+    (codecs.BOM_UTF32_LE, 'utf-32'),
+    (codecs.BOM_UTF32_BE, 'utf-32'),
+    (codecs.BOM_UTF8, 'utf-8-sig'),
+    (codecs.BOM_UTF16_LE, 'utf-16'),
+    (codecs.BOM_UTF16_BE, 'utf-16'),
+)
+
+# encoding: a codec name. ascii_only: the sample was plain ASCII, the
+# encoding is a guess that Utf8OrLegacyDecoder may still revise.
+Detection = namedtuple('Detection', ['encoding', 'ascii_only'])
+
+
+def detect_encoding(sample):
+    """Returns the Detection for the first bytes of a file."""
+    for bom, encoding in BOMS:
+        if sample.startswith(bom):
+            return Detection(encoding, False)
+
+    utf16_encoding = _detect_bomless_utf16(sample)
+    if utf16_encoding:
+        return Detection(utf16_encoding, False)
+
+    if sample.isascii():
+        return Detection('utf-8', True)
+    try:
+        # Not final: the sample may end in the middle of a character.
+        codecs.getincrementaldecoder('utf-8')().decode(sample, final=False)
+        return Detection('utf-8', False)
+    except UnicodeDecodeError:
+        pass
+    return Detection(_detect_legacy_encoding(sample), False)
+
+
+def _detect_bomless_utf16(sample):
+    """Returns 'utf-16-le' or 'utf-16-be' if NUL bytes fill every other position, else None."""
+    if len(sample) < 4 or b'\x00' not in sample:
+        return None
+    even_zeros = sample[0::2].count(0)
+    odd_zeros = sample[1::2].count(0)
+    half = len(sample) // 2
+    # Mostly ASCII text in UTF-16: every character has one NUL byte.
+    if odd_zeros > half * 0.3 and even_zeros < half * 0.05:
+        return 'utf-16-le'
+    if even_zeros > half * 0.3 and odd_zeros < half * 0.05:
+        return 'utf-16-be'
+    return None
+
+
+def _detect_legacy_encoding(sample):
+    """
+    Picks GB18030 for samples that decode as mostly CJK text, unless they
+    read at least as well as Latin text in cp1252; cp1252 otherwise.
+    """
+    try:
+        text = codecs.getincrementaldecoder('gb18030')().decode(sample, final=False)
+    except UnicodeDecodeError:
+        return LEGACY_ENCODING
+    non_ascii = [char for char in text if ord(char) > 0x7F]
+    cjk = sum(1 for char in non_ascii if _is_cjk(char))
+    if cjk < CJK_MIN_CHARS or cjk < len(non_ascii) * CJK_MIN_RATIO:
+        return LEGACY_ENCODING
+    latin_text = sample.decode(LEGACY_ENCODING, errors='replace')
+    if _cjk_score(text) <= _latin_score(latin_text):
+        return LEGACY_ENCODING
+    return 'gb18030'
+
+
+def _cjk_score(text):
+    """
+    The share of the non-ASCII characters that are CJK next to another CJK
+    character. Chinese is written in runs of ideographs, while the ones
+    decoded from accented Latin letters stand alone between ASCII letters.
+    """
+    non_ascii = 0
+    in_runs = 0
+    for index, char in enumerate(text):
+        if ord(char) <= 0x7F:
+            continue
+        non_ascii += 1
+        if _is_cjk(char) and ((index > 0 and _is_cjk(text[index - 1]))
+                              or (index + 1 < len(text) and _is_cjk(text[index + 1]))):
+            in_runs += 1
+    return in_runs / non_ascii if non_ascii else 0.0
+
+
+def _latin_score(text):
+    """
+    The share of the non-ASCII characters that are letters next to an ASCII
+    letter, as the accented letters inside Latin words are.
+    """
+    non_ascii = 0
+    in_words = 0
+    for index, char in enumerate(text):
+        if ord(char) <= 0x7F:
+            continue
+        non_ascii += 1
+        if char.isalpha() and ((index > 0 and _is_ascii_letter(text[index - 1]))
+                               or (index + 1 < len(text) and _is_ascii_letter(text[index + 1]))):
+            in_words += 1
+    return in_words / non_ascii if non_ascii else 0.0
+
+
+def _is_ascii_letter(char):
+    return char.isascii() and char.isalpha()
+
+
+def _is_cjk(char):
+    code = ord(char)
+    return (0x4E00 <= code <= 0x9FFF      # CJK Unified Ideographs
+            or 0x3000 <= code <= 0x303F   # CJK punctuation
+            or 0xFF00 <= code <= 0xFFEF   # Full-width forms
+            or 0x3400 <= code <= 0x4DBF)  # Extension A
+
+
+def detect_file_encoding(path):
+    """Returns the Detection for a file, reading only its first SAMPLE_SIZE bytes."""
+    with open(path, 'rb') as f:
+        return detect_encoding(f.read(SAMPLE_SIZE))
+
+
+def resolve_encoding(path, encoding=AUTO):
+    """Returns the Detection for a file, detecting only when encoding is AUTO."""
+    if encoding == AUTO:
+        return detect_file_encoding(path)
+    return Detection(encoding, False)
+
+
+class Utf8OrLegacyDecoder:
+    """
+    An incremental decoder for files whose first bytes were plain ASCII.
+    Decodes UTF-8 until a byte that is not valid UTF-8, then decodes the
+    rest as LEGACY_ENCODING. As long as everything before was ASCII the
+    switch changes nothing already decoded, so no byte is read twice.
+    """
+    def __init__(self, legacy_encoding=LEGACY_ENCODING):
+        self.legacy_encoding = legacy_encoding
+        self._decoder = codecs.getincrementaldecoder('utf-8')()
+        self._switched = False
+        self._ascii_so_far = True
+
+    def decode(self, data, final=False):
+        if self._switched or not self._ascii_so_far:
+            return self._decoder.decode(data, final)
+        # Bytes of an incomplete character held back from the previous call.
+        pending = self._decoder.getstate()[0]
+        try:
+            text = self._decoder.decode(data, final)
+        except UnicodeDecodeError:
+            self._decoder = codecs.getincrementaldecoder(self.legacy_encoding)()
+            self._switched = True
+            return self._decoder.decode(pending + data, final)
+        self._ascii_so_far = text.isascii()
+        return text
+
+
+def get_incremental_decoder(detection):
+    """Returns an incremental decoder for a Detection."""
+    if detection.ascii_only and codecs.lookup(detection.encoding).name == 'utf-8':
+        return Utf8OrLegacyDecoder()
+    return codecs.getincrementaldecoder(detection.encoding)()
@@ -0,0 +1,182 @@
+# core/journal.py
+#
+# Append-only journal files of checksummed records, written on a thread of
+# their own so the caller never waits for the disk.
+#
+# A journal file starts with MAGIC, followed by records framed as
+#   payload length (uint32, little endian) | CRC-32 of the payload (uint32) | payload
+# A crash in the middle of a write leaves a torn last record; its checksum
+# does not match, and read_records() stops there.
+#
+# Operations queued within FLUSH_INTERVAL_S of each other are written as one
+# batch: one write and one fsync per file, however many records it holds.
+# Compacting a journal (JournalWriter.rewrite) writes a new file holding a
+# single snapshot record and swaps it in, the old one stays intact until then.
+
+import os
+import queue
+import struct
+import threading
+import time
+import traceback
+import zlib
+
+MAGIC = b'SUBTLJ1\n'
+RECORD_HEADER = struct.Struct('<II')
+
+# How long the writer collects operations before writing them, in seconds.
+FLUSH_INTERVAL_S = 0.5
+
+_APPEND, _REWRITE, _REMOVE, _FLUSH, _STOP = range(5)
+
+
+def frame_record(payload):
+    """Returns the bytes of a record holding payload, as written to a journal file."""
+    return RECORD_HEADER.pack(len(payload), zlib.crc32(payload)) + payload
+
+
+def read_records(path):
+    """
+    Returns the payloads of a journal file's records in order. Reading stops
+    at the first record that is incomplete or fails its checksum.
+    """
+    with open(path, 'rb') as f:
+        data = f.read()
+    if not data.startswith(MAGIC):
+        return []
+    payloads = []
+    offset = len(MAGIC)
+    while offset + RECORD_HEADER.size <= len(data):
+        length, checksum = RECORD_HEADER.unpack_from(data, offset)
+        start = offset + RECORD_HEADER.size
+        payload = data[start:start + length]
+        if len(payload) < length or zlib.crc32(payload) != checksum:
+            break
+        payloads.append(payload)
+        offset = start + length
+    return payloads
+
+
+class JournalWriter:
+    """
+    Writes journal files on a background thread. append(), rewrite() and
+    remove() only queue the operation and return; operations are carried
+    out in the order they were queued. Errors are printed and the writer
+    carries on, a journal must never take the application down.
+    """
+    def __init__(self, flush_interval=FLUSH_INTERVAL_S):
+        self.flush_interval = flush_interval
+        self._queue = queue.Queue()
+        # Open append handles, by path. Only used on the writer thread.
+        self._files = {}
+        self._thread = threading.Thread(target=self._run, name="journal writer", daemon=True)
+        self._thread.start()
+
+    def append(self, path, payload):
+        """Appends a record holding payload (bytes) to the journal at path."""
+        self._queue.put((_APPEND, path, payload))
+
+    def rewrite(self, path, make_payload):
+        """
+        Replaces the journal at path with one holding the single record
+        make_payload() returns, dropping the records appended before. The
+        function runs on the writer thread, so it must only read data the
+        caller does not change anymore.
+        """
+        self._queue.put((_REWRITE, path, make_payload))
+
+    def remove(self, path):
+        """Deletes the journal at path."""
+        self._queue.put((_REMOVE, path, None))
+
+    def flush(self, wait=False):
+        """Writes the queued operations now instead of at the end of the interval, waiting for it with wait."""
+        written = threading.Event()
+        self._queue.put((_FLUSH, None, written))
+        if wait:
+            written.wait()
+
+    def close(self):
+        """Writes the queued operations, closes the files and stops the thread."""
+        self._queue.put((_STOP, None, None))
+        self._thread.join()
+
+    # --- Writer Thread ---
+
+    def _run(self):
+        running = True
+        while running:
+            batch = [self._queue.get()]
+            deadline = time.monotonic() + self.flush_interval
+            while batch[-1][0] not in (_FLUSH, _STOP):
+                timeout = deadline - time.monotonic()
+                if timeout <= 0:
+                    break
+                try:
+                    batch.append(self._queue.get(timeout=timeout))
+                except queue.Empty:
+                    break
+            running = self._write_batch(batch)
+        for f in self._files.values():
+            f.close()
+        self._files.clear()
+
+    def _write_batch(self, batch):
+        """Carries out a batch of operations. Returns False once the writer was stopped."""
+        # Framed records per path, written together at the end of the batch.
+        pending = {}
+        flushed = []
+        running = True
+        for operation, path, argument in batch:
+            try:
+                if operation == _APPEND:
+                    pending.setdefault(path, bytearray()).extend(frame_record(argument))
+                elif operation == _REWRITE:
+                    # The snapshot covers whatever was appended before it.
+                    pending.pop(path, None)
+                    self._replace(path, argument())
+                elif operation == _REMOVE:
+                    pending.pop(path, None)
+                    self._close_file(path)
+                    if os.path.exists(path):
+                        os.remove(path)
+                elif operation == _FLUSH:
+                    flushed.append(argument)
+                else:
+                    running = False
+            except Exception:
+                traceback.print_exc()
+
+        for path, data in pending.items():
+            try:
+                self._append(path, data)
+            except Exception:
+                traceback.print_exc()
+        for written in flushed:
+            written.set()
+        return running
+
+    def _append(self, path, data):
+        f = self._files.get(path)
+        if f is None:
+            f = self._files[path] = open(path, 'ab')
+            if f.tell() == 0:
+                f.write(MAGIC)
+        f.write(data)
+        f.flush()
+        os.fsync(f.fileno())
+
+    def _replace(self, path, payload):
+        temporary_path = path + '.tmp'
+        with open(temporary_path, 'wb') as f:
+            f.write(MAGIC)
+            f.write(frame_record(payload))
+            f.flush()
+            os.fsync(f.fileno())
+        self._close_file(path)
+        os.replace(temporary_path, path)
+
+    def _close_file(self, path):
+        f = self._files.pop(path, None)
+        if f is not None:
+            f.close()
@@ -0,0 +1,108 @@
+# core/mapped_srt.py
+#
+# Memory-mapped SRT input. The file is mapped instead of read and the timing
+# lines are parsed straight from the mapped bytes; each cue only records
+# where its text is in the file. Texts are decoded when they are accessed,
+# so loading a file costs an index of a few integers per cue, not a decoded
+# copy of its content. The OS pages the file in and out as needed.
+#
+# Only UTF-8 files are mapped, since cue texts are decoded slice by slice.
+# CueStore.from_file() falls back to the streaming reader for the others.
+
+import re
+import mmap
+import codecs
+
+from core.timecode import parse_timestamp
+
+UTF8_BOM = codecs.BOM_UTF8
+
+# The timing line of core.srt_stream.TIMING_PATTERN, for bytes. Leading
+# whitespace must not run into the previous line, hence [^\S\n].
+_TIMING_BODY = rb'[^\S\n]*(\d+:\d{2}:\d{2}[,.]\d{3})[^\S\n]*-->[^\S\n]*(\d+:\d{2}:\d{2}[,.]\d{3})'
+TIMING_LINE_PATTERN = re.compile(rb'^' + _TIMING_BODY, re.MULTILINE)
+TIMING_AT_PATTERN = re.compile(_TIMING_BODY)
+# The line break before a whitespace-only line, which ends a cue's text.
+BLANK_LINE_PATTERN = re.compile(rb'\n[^\S\n]*(?=\n|\Z)')
+
+# Cues parsed between two progress reports.
+PROGRESS_INTERVAL_CUES = 4096
+# Bytes validated at a time by validate_utf8().
+VALIDATION_CHUNK_SIZE = 1 << 20
+
+
+def is_mappable_encoding(encoding):
+    """Returns True for the encodings whose files can be mapped (UTF-8, with or without BOM)."""
+    return codecs.lookup(encoding).name in ('utf-8', 'utf-8-sig')
+
+
+def map_file(path):
+    """Maps a file read-only. Returns None for an empty file, which cannot be mapped."""
+    with open(path, 'rb') as f:
+        try:
+            return mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        except ValueError:
+            return None
+
+
+def validate_utf8(data, progress=None):
+    """
+    Raises UnicodeDecodeError if data is not valid UTF-8, like reading the
+    file would. Decodes chunk by chunk and keeps nothing.
+    """
+    decoder = codecs.getincrementaldecoder('utf-8')()
+    for offset in range(0, len(data), VALIDATION_CHUNK_SIZE):
+        decoder.decode(data[offset:offset + VALIDATION_CHUNK_SIZE])
+        if progress:
+            progress(min(offset + VALIDATION_CHUNK_SIZE, len(data)), len(data))
+    decoder.decode(b'', final=True)
+
+
+def iter_mapped_cues(data, progress=None):
+    """
+    Parses SRT bytes (e.g. a mapped file) and yields
+    (start_ms, end_ms, text_begin, text_end) per cue, the text being
+    data[text_begin:text_end] with surrounding whitespace already cut off.
+
+    Follows core.srt_stream.iter_cues(): a cue starts at a timing line and
+    its text runs up to the next blank line, everything else is skipped.
+    """
+    size = len(data)
+    position = len(UTF8_BOM) if data[:len(UTF8_BOM)] == UTF8_BOM else 0
+    # The first line is not preceded by a line break, ^ cannot find it after a BOM.
+    match = TIMING_AT_PATTERN.match(data, position) or TIMING_LINE_PATTERN.search(data, position)
+    count = 0
+
+    while match:
+        start_ms = parse_timestamp(match.group(1).decode('ascii'))
+        end_ms = parse_timestamp(match.group(2).decode('ascii'))
+
+        line_end = data.find(b'\n', match.end())
+        if line_end == -1:
+            text_begin = text_end = position = size
+        else:
+            text_begin = line_end + 1
+            blank = BLANK_LINE_PATTERN.search(data, line_end)
+            text_end, position = (blank.start(), blank.end()) if blank else (size, size)
+            # Cut the surrounding whitespace (and \r) off the text slice.
+            while text_begin < text_end and data[text_begin] in b' \t\r\n\f\v':
+                text_begin += 1
+            while text_end > text_begin and data[text_end - 1] in b' \t\r\n\f\v':
+                text_end -= 1
+        yield start_ms, end_ms, text_begin, max(text_begin, text_end)
+
+        count += 1
+        if progress and count % PROGRESS_INTERVAL_CUES == 0:
+            progress(position, size)
+        match = TIMING_LINE_PATTERN.search(data, position)
+
+    if progress:
+        progress(size, size)
+
+
+def decode_text(raw):
+    """Decodes a cue text slice the way the streaming reader returns it."""
+    text = raw.decode('utf-8')
+    if '\r' in text:
+        text = text.replace('\r\n', '\n')
+    return text.strip()
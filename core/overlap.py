@@ -0,0 +1,84 @@
+# core/overlap.py
+#
+# Interval overlap engine shared by the tools that combine subtitle tracks.
+# It replaces "compare every cue against every other cue" loops with a
+# sorted index that only visits the cues that can actually overlap.
+
+from bisect import bisect_left
+
+
+class IntervalIndex:
+    """
+    A static index over a list of (start, end) intervals.
+
+    Intervals are sorted by start time and a max-end segment tree is built over
+    them. A query first bisects away every interval that starts too late and
+    then walks the tree, pruning any subtree whose latest end is too early, so
+    it only descends towards intervals that really overlap.
+
+    Building costs O(M log M) and each query costs O(log M + k log M) for k
+    results, so matching N cues against M cues is O((N + M) log M + output)
+    instead of O(N * M).
+
+    Start and end values only need to be mutually comparable, so plain
+    integers (milliseconds) and timedelta objects both work.
+    """
+    def __init__(self, starts, ends):
+        count = len(starts)
+        # Positions of the intervals in their original order, sorted by start.
+        self._order = sorted(range(count), key=starts.__getitem__)
+        self._starts = [starts[i] for i in self._order]
+        self._count = count
+
+        size = 1
+        while size < count:
+            size <<= 1
+        self._size = size
+
+        # tree[1] is the root, leaves live at tree[size:size + count].
+        # Padding leaves stay None and are never descended into.
+        tree = [None] * (2 * size)
+        for leaf, position in enumerate(self._order):
+            tree[size + leaf] = ends[position]
+        for node in range(size - 1, 0, -1):
+            left, right = tree[2 * node], tree[2 * node + 1]
+            if left is None:
+                tree[node] = right
+            elif right is None or left >= right:
+                tree[node] = left
+            else:
+                tree[node] = right
+        self._tree = tree
+
+    def __len__(self):
+        return self._count
+
+    def overlapping(self, start, end):
+        """
+        Returns the original positions of every interval that satisfies
+        `interval.start < end and interval.end > start`, in ascending order.
+        """
+        # Only intervals that start before `end` can overlap.
+        limit = bisect_left(self._starts, end)
+        if limit == 0:
+            return []
+
+        tree, size, order = self._tree, self._size, self._order
+        result = []
+        stack = [(1, 0, size)]
+        while stack:
+            node, low, high = stack.pop()
+            if low >= limit:
+                continue
+            latest_end = tree[node]
+            if latest_end is None or latest_end <= start:
+                continue
+            if node >= size:
+                result.append(order[node - size])
+                continue
+            middle = (low + high) // 2
+            stack.append((2 * node + 1, middle, high))
+            stack.append((2 * node, low, middle))
+
+        result.sort()
+        return result
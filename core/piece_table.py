@@ -0,0 +1,320 @@
+# core/piece_table.py
+#
+# A piece table: text kept as a sequence of spans ("pieces") over immutable
+# buffers, the original text and the strings inserted since. An edit only
+# splits and replaces the pieces around it, so it costs O(edit size) however
+# large the text is, and the pieces an edit removed are all it takes to undo
+# it: the removed text itself is never copied.
+#
+# Inserted strings are never copied into a shared buffer either; each one is
+# kept as it arrived and acts as its own slice of the append buffer.
+
+from bisect import bisect_right
+from collections import namedtuple
+from itertools import accumulate
+
+# A span buffer[start:end] of one of the buffers.
+Piece = namedtuple('Piece', ['buffer', 'start', 'end'])
+
+# Estimated bytes of one Piece tuple, for the memory cap of edit histories.
+PIECE_BYTES = 80
+
+# Replacing the pieces at position: removed is what was there before,
+# inserted what is there after. See undo_edits() and redo_edits().
+Splice = namedtuple('Splice', ['position', 'removed', 'inserted'])
+
+
+def pieces_length(pieces):
+    """The number of characters the pieces span."""
+    return sum(end - start for _, start, end in pieces)
+
+
+def join_pieces(pieces):
+    """The text the pieces span, as one string."""
+    return ''.join(buffer[start:end] for buffer, start, end in pieces)
+
+
+def is_simultaneous(edits):
+    """
+    True when (position, length, ...) edits run from the last position to the
+    first without overlapping. Applying those one after the other is the
+    same as applying them all at once, none moves the text of the next one.
+    """
+    return all(later[0] + later[1] <= earlier[0] for earlier, later in zip(edits, edits[1:]))
+
+
+def redo_edits(splices):
+    """The (position, length, pieces) edits that make splices again, in order."""
+    return [(splice.position, pieces_length(splice.removed), splice.inserted) for splice in splices]
+
+
+def undo_edits(splices):
+    """
+    The (position, length, pieces) edits that undo splices, in order. Splices
+    that were simultaneous are undone from the last position to the first as
+    well, so the undo can be applied in one pass too.
+    """
+    if not is_simultaneous(redo_edits(splices)):
+        return [(splice.position, pieces_length(splice.inserted), splice.removed) for splice in reversed(splices)]
+    # Each splice's text was moved by the length change of the ones before it.
+    edits = []
+    moved = 0
+    for splice in reversed(splices):
+        inserted_length = pieces_length(splice.inserted)
+        edits.append((splice.position + moved, inserted_length, splice.removed))
+        moved += inserted_length - pieces_length(splice.removed)
+    edits.reverse()
+    return edits
+
+
+def merge_splices(first, second):
+    """
+    Returns one Splice doing first then second when they are consecutive
+    plain insertions (typing) or deletions (backspace or delete), or None.
+    """
+    if first.removed or second.removed:
+        if first.inserted or second.inserted:
+            return None
+        if second.position == first.position:
+            # Delete: the text after the cursor goes, the cursor stays.
+            return Splice(first.position, first.removed + second.removed, [])
+        if second.position + pieces_length(second.removed) == first.position:
+            # Backspace: the text before the cursor goes.
+            return Splice(second.position, second.removed + first.removed, [])
+        return None
+    if second.position == first.position + pieces_length(first.inserted):
+        return Splice(first.position, [], first.inserted + second.inserted)
+    return None
+
+
+class PieceTable:
+    """
+    Text stored as pieces. The pieces are kept in blocks of at most
+    BLOCK_SIZE with the total length of each block, so finding the piece at
+    a position walks the block totals and one block instead of every piece,
+    however fragmented many small edits left the table.
+    """
+    BLOCK_SIZE = 128
+
+    def __init__(self, text=''):
+        self.original = text
+        self._blocks = [[Piece(text, 0, len(text))] if text else []]
+        self._block_lengths = [len(text)]
+        self._length = len(text)
+
+    def __len__(self):
+        return self._length
+
+    def text(self):
+        """The whole text, as one string."""
+        return ''.join(buffer[start:end] for block in self._blocks for buffer, start, end in block)
+
+    def pieces(self, position, length):
+        """Returns the pieces spanning text[position:position + length], without changing the table."""
+        self._check_range(position, length)
+        block_index, offset = self._locate(position)
+        pieces = []
+        while length > 0:
+            for buffer, start, end in self._blocks[block_index]:
+                size = end - start
+                if offset >= size:
+                    offset -= size
+                    continue
+                take = min(size - offset, length)
+                pieces.append(Piece(buffer, start + offset, start + offset + take))
+                offset = 0
+                length -= take
+                if not length:
+                    break
+            block_index += 1
+            offset = 0
+        return pieces
+
+    def substring(self, position, length):
+        """Returns text[position:position + length]."""
+        return join_pieces(self.pieces(position, length))
+
+    def splice_bytes(self, splice):
+        """
+        Estimated memory an edit history keeps alive by holding splice: its
+        pieces, and the text they span outside the original.
+        """
+        size = 0
+        for piece in splice.removed + splice.inserted:
+            size += PIECE_BYTES
+            if piece.buffer is not self.original:
+                size += piece.end - piece.start
+        return size
+
+    # --- Editing ---
+
+    def apply_edits(self, edits):
+        """
+        Applies (position, length, pieces) edits in order and returns the
+        Splices they made. Simultaneous edits (see is_simultaneous) are
+        applied in a single pass over the pieces.
+        """
+        if len(edits) > 1 and is_simultaneous(edits):
+            removed = self.splice_many(edits)
+        else:
+            removed = [self.splice(position, length, pieces) for position, length, pieces in edits]
+        return [Splice(position, removed_pieces, [piece for piece in pieces if piece.end > piece.start])
+                for (position, _, pieces), removed_pieces in zip(edits, removed)]
+
+    def replace(self, position, length, text):
+        """
+        Replaces length characters at position with text. Returns the Splice
+        describing the edit, to be handed to splice() to undo or redo it.
+        """
+        inserted = [Piece(text, 0, len(text))] if text else []
+        return Splice(position, self.splice(position, length, inserted), inserted)
+
+    def splice(self, position, length, pieces):
+        """
+        Replaces length characters at position with the given pieces and
+        returns the pieces that were removed.
+        """
+        self._check_range(position, length)
+        pieces = [piece for piece in pieces if piece.end > piece.start]
+
+        # Piece boundaries at both ends of the range; the end first, splitting
+        # at the start may shift the pieces after it.
+        if length:
+            self._boundary(position + length)
+        block_index, index = self._boundary(position)
+
+        removed = []
+        remaining = length
+        current_block, current_index = block_index, index
+        while remaining:
+            block = self._blocks[current_block]
+            stop = current_index
+            while remaining and stop < len(block):
+                remaining -= block[stop].end - block[stop].start
+                stop += 1
+            taken = block[current_index:stop]
+            del block[current_index:stop]
+            self._block_lengths[current_block] -= pieces_length(taken)
+            removed.extend(taken)
+            current_block, current_index = current_block + 1, 0
+
+        block = self._blocks[block_index]
+        block[index:index] = pieces
+        self._block_lengths[block_index] += pieces_length(pieces)
+        self._length += pieces_length(pieces) - length
+
+        # Pieces that continue each other are joined again, so undoing an edit
+        # leaves no trace of the splits it made.
+        self._merge_at(block, index + len(pieces))
+        if pieces:
+            self._merge_at(block, index)
+        self._rebalance(block_index, current_block)
+        return removed
+
+    def splice_many(self, edits):
+        """
+        Applies simultaneous (position, length, pieces) edits, given from the
+        last position to the first, by rebuilding the piece list once instead
+        of locating every edit: O(pieces + edits) for any number of edits.
+        Returns the removed pieces of each edit, in the same order.
+        """
+        old_pieces = [piece for block in self._blocks for piece in block]
+        new_pieces = []
+        removed = []
+        # The walk through old_pieces: the next piece and how much of it was taken.
+        index = 0
+        taken = 0
+        text_position = 0
+
+        def take(length):
+            nonlocal index, taken, text_position
+            pieces = []
+            text_position += length
+            while length:
+                buffer, start, end = old_pieces[index]
+                start += taken
+                if end - start > length:
+                    pieces.append(Piece(buffer, start, start + length))
+                    taken += length
+                    break
+                pieces.append(Piece(buffer, start, end))
+                length -= end - start
+                index += 1
+                taken = 0
+            return pieces
+
+        def keep(pieces):
+            for piece in pieces:
+                if piece.end == piece.start:
+                    continue
+                last = new_pieces[-1] if new_pieces else None
+                if last and last.buffer is piece.buffer and last.end == piece.start:
+                    new_pieces[-1] = Piece(last.buffer, last.start, piece.end)
+                else:
+                    new_pieces.append(piece)
+
+        # Being simultaneous, the edits lie between the last one's start and the first one's end.
+        self._check_range(edits[-1][0], edits[0][0] + edits[0][1] - edits[-1][0])
+        old_length = self._length
+        for position, length, pieces in reversed(edits):
+            keep(take(position - text_position))
+            removed.append(take(length))
+            keep(pieces)
+            self._length += pieces_length(pieces) - length
+        keep(take(old_length - text_position))
+
+        self._blocks = [new_pieces[start:start + self.BLOCK_SIZE]
+                        for start in range(0, len(new_pieces), self.BLOCK_SIZE)] or [[]]
+        self._block_lengths = [pieces_length(block) for block in self._blocks]
+        removed.reverse()
+        return removed
+
+    # --- Internals ---
+
+    def _check_range(self, position, length):
+        if position < 0 or length < 0 or position + length > self._length:
+            raise IndexError(f"Range {position}+{length} is outside the text of length {self._length}.")
+
+    def _locate(self, position):
+        """Returns (block_index, offset) of position in its block."""
+        block_ends = list(accumulate(self._block_lengths))
+        # The first block ending after position, the last one for the end of the text.
+        block_index = min(bisect_right(block_ends, position), len(block_ends) - 1)
+        return block_index, position - block_ends[block_index] + self._block_lengths[block_index]
+
+    def _boundary(self, position):
+        """
+        Makes a piece start at position, splitting the one it falls into.
+        Returns (block_index, index) of that piece; index is the block's
+        length when position is at the end of the block.
+        """
+        block_index, offset = self._locate(position)
+        block = self._blocks[block_index]
+        for index, (buffer, start, end) in enumerate(block):
+            if offset == 0:
+                return block_index, index
+            if offset < end - start:
+                block[index:index + 1] = [Piece(buffer, start, start + offset), Piece(buffer, start + offset, end)]
+                return block_index, index + 1
+            offset -= end - start
+        return block_index, len(block)
+
+    def _merge_at(self, block, index):
+        """Joins block[index - 1] and block[index] if they are adjacent spans of the same buffer."""
+        if 0 < index < len(block):
+            left, right = block[index - 1], block[index]
+            if left.buffer is right.buffer and left.end == right.start:
+                block[index - 1:index + 1] = [Piece(left.buffer, left.start, right.end)]
+
+    def _rebalance(self, first_block, last_block):
+        """Splits the oversized blocks and drops the emptied ones between two block indexes."""
+        last_block = min(last_block, len(self._blocks) - 1)
+        for block_index in range(last_block, first_block - 1, -1):
+            block = self._blocks[block_index]
+            if not block and len(self._blocks) > 1:
+                del self._blocks[block_index]
+                del self._block_lengths[block_index]
+            elif len(block) > 2 * self.BLOCK_SIZE:
+                parts = [block[start:start + self.BLOCK_SIZE] for start in range(0, len(block), self.BLOCK_SIZE)]
+                self._blocks[block_index:block_index + 1] = parts
+                self._block_lengths[block_index:block_index + 1] = [pieces_length(part) for part in parts]
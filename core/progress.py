@@ -0,0 +1,39 @@
+# core/progress.py
+#
+# Helpers for the optional progress callbacks accepted by processing
+# functions. A callback is called as progress(done, total) and may raise to
+# cancel the work (see jobs.py).
+
+
+def step_progress(progress, step, step_count):
+    """
+    Maps the progress of one of several equally weighted steps onto an
+    overall progress callback. Returns None when progress is None.
+    """
+    if progress is None:
+        return None
+
+    def report(done, total):
+        fraction = done / total if total else 1.0
+        progress(int((step + fraction) * 1000), step_count * 1000)
+    return report
+
+
+def weighted_progress(progress, weights):
+    """
+    Returns one callback per weight for work items that advance side by side,
+    such as files read in parallel. Each item counts towards the overall
+    progress in proportion to its weight (e.g. its size in bytes). Returns
+    a list of None when progress is None.
+    """
+    if progress is None:
+        return [None] * len(weights)
+    total_weight = sum(weights) or 1
+    fractions = [0.0] * len(weights)
+
+    def reporter(index):
+        def report(done, total):
+            fractions[index] = done / total if total else 1.0
+            progress(int(sum(f * w for f, w in zip(fractions, weights)) * 1000 / total_weight), 1000)
+        return report
+    return [reporter(index) for index in range(len(weights))]
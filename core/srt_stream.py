@@ -0,0 +1,151 @@
+# core/srt_stream.py
+#
+# Streaming SRT reader and writer. Files are read in fixed-size chunks and
+# cues are yielded one at a time, so memory use is bounded by the chunk size
+# plus the largest cue rather than by the size of the file.
+
+import os
+import re
+from collections import namedtuple
+
+from core.timecode import parse_timestamp, format_timestamp
+from core.encoding import AUTO, resolve_encoding, get_incremental_decoder
+
+DEFAULT_CHUNK_SIZE = 64 * 1024
+
+# Formatted blocks are joined and written this many at a time.
+WRITE_BATCH_SIZE = 256
+
+TIMING_PATTERN = re.compile(
+    r'^\s*(\d+:\d{2}:\d{2}[,.]\d{3})\s*-->\s*(\d+:\d{2}:\d{2}[,.]\d{3})'
+)
+
+# A single parsed cue. Times are integer milliseconds.
+Cue = namedtuple('Cue', ['start', 'end', 'text'])
+
+
+def read_chunks(path, chunk_size=DEFAULT_CHUNK_SIZE, encoding=AUTO, progress=None):
+    """
+    Yields the decoded content of a file, read chunk_size bytes at a time.
+
+    Args:
+        encoding (str): A codec name, or AUTO to detect it (see core/encoding.py).
+        progress (callable, optional): Called as progress(bytes_read, file_size)
+            after every chunk. It may raise to abort reading.
+    """
+    decoder = get_incremental_decoder(resolve_encoding(path, encoding))
+    total = os.path.getsize(path)
+    done = 0
+    with open(path, 'rb') as f:
+        while True:
+            raw = f.read(chunk_size)
+            if not raw:
+                break
+            done += len(raw)
+            if progress:
+                progress(done, total)
+            text = decoder.decode(raw)
+            if text:
+                yield text
+    tail = decoder.decode(b'', final=True)
+    if tail:
+        yield tail
+
+
+def read_text(path, encoding=AUTO):
+    """Returns the whole decoded content of a file, for inputs that are needed as one string."""
+    return ''.join(read_chunks(path, encoding=encoding))
+
+
+def iter_lines(chunks):
+    """Splits an iterable of text chunks into lines without joining the chunks."""
+    pending = ''
+    for chunk in chunks:
+        pending += chunk
+        lines = pending.split('\n')
+        # The last piece may be an incomplete line, keep it for the next chunk.
+        pending = lines.pop()
+        for line in lines:
+            yield line.rstrip('\r')
+    if pending:
+        yield pending.rstrip('\r')
+
+
+def iter_cues(chunks):
+    """
+    Parses an iterable of SRT text chunks and yields Cue tuples.
+
+    A cue starts at a timing line and takes every following line up to the
+    next blank line as its text. Index lines and stray lines between cues are
+    skipped, so files with missing or wrong indices still parse.
+    """
+    timing = None
+    text_lines = []
+
+    for line in iter_lines(chunks):
+        if timing is not None:
+            if line.strip():
+                text_lines.append(line)
+                continue
+            yield Cue(timing[0], timing[1], '\n'.join(text_lines).strip())
+            timing, text_lines = None, []
+            continue
+
+        match = TIMING_PATTERN.match(line)
+        if match:
+            timing = (parse_timestamp(match.group(1)), parse_timestamp(match.group(2)))
+        # Anything else outside a cue (index lines, stray text) carries no
+        # information we keep; cues are renumbered on output.
+
+    if timing is not None:
+        yield Cue(timing[0], timing[1], '\n'.join(text_lines).strip())
+
+
+def iter_file_cues(path, chunk_size=DEFAULT_CHUNK_SIZE, encoding=AUTO, progress=None):
+    """Yields the cues of an SRT file one at a time."""
+    return iter_cues(read_chunks(path, chunk_size, encoding, progress))
+
+
+def format_srt_block(number, start_ms, end_ms, text):
+    """Formats a single cue as an SRT block, ending with a blank line."""
+    return f"{number}\n{format_timestamp(start_ms)} --> {format_timestamp(end_ms)}\n{text}\n\n"
+
+
+def write_blocks(path, blocks, encoding='utf-8', header=''):
+    """
+    Writes formatted text blocks to a file as they are produced. Returns the
+    number of blocks written.
+
+    Blocks are joined and written WRITE_BATCH_SIZE at a time, so the number
+    of write calls stays low without ever holding the whole document. The
+    file is written next to its destination and moved into place at the
+    end, so an error or a cancelled job never leaves a half-written file.
+    """
+    count = 0
+    temp_path = path + '.part'
+    try:
+        with open(temp_path, 'w', encoding=encoding) as f:
+            f.write(header)
+            batch = []
+            for count, block in enumerate(blocks, 1):
+                batch.append(block)
+                if len(batch) == WRITE_BATCH_SIZE:
+                    f.write(''.join(batch))
+                    batch.clear()
+            f.write(''.join(batch))
+        os.replace(temp_path, path)
+    except BaseException:
+        if os.path.exists(temp_path):
+            os.remove(temp_path)
+        raise
+    return count
+
+
+def write_srt(path, cues, encoding='utf-8', start_index=1):
+    """
+    Writes Cue tuples to an SRT file as they are produced, renumbering them
+    from start_index. Returns the number of cues written.
+    """
+    blocks = (format_srt_block(number, start_ms, end_ms, text)
+              for number, (start_ms, end_ms, text) in enumerate(cues, start_index))
+    return write_blocks(path, blocks, encoding)
@@ -0,0 +1,374 @@
+# core/subtitle_formats.py
+#
+# Readers and writers of the subtitle formats the Subtitle Converter handles.
+# A reader turns an iterable of text chunks (see srt_stream.read_chunks) into
+# a stream of Cue tuples and a writer formats one cue at a time, so any two
+# formats chain into a streaming pipeline:
+#
+#   read_chunks -> reader -> format_block -> write_blocks
+#
+# Cue texts use SRT conventions in between: lines separated by '\n' and the
+# <i>, <b>, <u> and <font color> tags. Readers translate their format's
+# markup into these, writers translate it back and drop what their format
+# cannot express.
+#
+# Formats are looked up in FORMATS. Supporting another one means writing a
+# reader and a block formatter and passing them to register_format().
+
+import html
+import os
+import re
+from collections import namedtuple
+
+from core.srt_stream import Cue, iter_lines, iter_cues, format_srt_block, write_blocks
+from core.timecode import parse_timestamp, format_timestamp
+
+# name: the id used by the tool and the command line, also the file extension
+# extensions: lower-case input extensions read with this format
+# read: callable(chunks) yielding Cue tuples
+# header: text written before the first cue
+# format_block: callable(number, start_ms, end_ms, text) returning one cue as text
+SubtitleFormat = namedtuple('SubtitleFormat', ['name', 'description', 'extensions', 'read', 'header', 'format_block'])
+
+FORMATS = {}
+
+
+def register_format(subtitle_format):
+    """Adds a format to FORMATS, replacing any format of the same name."""
+    FORMATS[subtitle_format.name] = subtitle_format
+
+
+def format_for_path(path):
+    """Returns the format of a file by its extension. Raises ValueError for unknown extensions."""
+    extension = os.path.splitext(path)[1].lower()
+    for subtitle_format in FORMATS.values():
+        if extension in subtitle_format.extensions:
+            return subtitle_format
+    raise ValueError(f"Unsupported subtitle format: '{extension or os.path.basename(path)}'")
+
+
+def write_cues(path, cues, format_name, encoding='utf-8'):
+    """Writes Cue tuples to a file in the named format. Returns the number of cues written."""
+    subtitle_format = FORMATS[format_name]
+    blocks = (subtitle_format.format_block(number, start_ms, end_ms, text)
+              for number, (start_ms, end_ms, text) in enumerate(cues, 1))
+    return write_blocks(path, blocks, encoding, subtitle_format.header)
+
+
+# --- Markup ---
+
+# The SRT tags carried in cue texts. Anything else between angle brackets is
+# treated as text.
+SRT_TAG_PATTERN = re.compile(r'<(/?)(i|b|u|font)\b([^>]*)>', re.IGNORECASE)
+FONT_COLOR_PATTERN = re.compile(r'color\s*=\s*["\']?#([0-9a-fA-F]{6})', re.IGNORECASE)
+
+
+def translate_tags(text, translate_tag, escape=None):
+    """
+    Rewrites the SRT tags of a cue text. translate_tag(closing, name, attributes)
+    returns the replacement of each tag, escape(text) the replacement of the
+    text between them.
+    """
+    pieces = []
+    position = 0
+    for match in SRT_TAG_PATTERN.finditer(text):
+        between = text[position:match.start()]
+        pieces.append(escape(between) if escape else between)
+        pieces.append(translate_tag(match.group(1) == '/', match.group(2).lower(), match.group(3)))
+        position = match.end()
+    between = text[position:]
+    pieces.append(escape(between) if escape else between)
+    return ''.join(pieces)
+
+
+def strip_tags(text):
+    """Returns a cue text without its SRT tags, for formats without markup."""
+    return SRT_TAG_PATTERN.sub('', text)
+
+
+# --- SubRip (.srt) ---
+
+register_format(SubtitleFormat(
+    name='srt',
+    description='SubRip',
+    extensions=('.srt',),
+    read=iter_cues,
+    header='',
+    format_block=format_srt_block,
+))
+
+
+# --- WebVTT (.vtt) ---
+
+# Hours are optional in WebVTT timestamps, cue settings may follow the end time.
+VTT_TIMING_PATTERN = re.compile(r'^\s*((?:\d+:)?\d{2}:\d{2}\.\d{3})\s+-->\s+((?:\d+:)?\d{2}:\d{2}\.\d{3})')
+# Any WebVTT tag, including classes (<i.loud>), voices (<v Bob>) and timestamps.
+VTT_TAG_PATTERN = re.compile(r'<(/?)([^\s.>]*)[^>]*>')
+# Blocks that are not cues, skipped up to the next blank line.
+VTT_SKIPPED_BLOCKS = ('WEBVTT', 'NOTE', 'STYLE', 'REGION')
+
+
+def parse_vtt_timestamp(vtt_time):
+    """Converts an '[hh:]mm:ss.mmm' timestamp into integer milliseconds."""
+    if vtt_time.count(':') == 1:
+        vtt_time = '0:' + vtt_time
+    return parse_timestamp(vtt_time)
+
+
+def _vtt_tag_to_srt(match):
+    name = match.group(2)
+    # Classes and voices only style the cue in a browser, keep the basic tags.
+    if name in ('i', 'b', 'u'):
+        return f"<{match.group(1)}{name}>"
+    return ''
+
+
+def iter_vtt_cues(chunks):
+    """
+    Parses an iterable of WebVTT text chunks and yields Cue tuples. Cue
+    identifiers, settings and the header, NOTE, STYLE and REGION blocks are
+    skipped.
+    """
+    timing = None
+    text_lines = []
+    skipping = False
+
+    for line in iter_lines(chunks):
+        if timing is not None:
+            if line.strip():
+                text_lines.append(line)
+                continue
+            text = VTT_TAG_PATTERN.sub(_vtt_tag_to_srt, '\n'.join(text_lines).strip())
+            yield Cue(timing[0], timing[1], html.unescape(text))
+            timing, text_lines = None, []
+            continue
+
+        if skipping:
+            skipping = bool(line.strip())
+            continue
+
+        match = VTT_TIMING_PATTERN.match(line)
+        if match:
+            timing = (parse_vtt_timestamp(match.group(1)), parse_vtt_timestamp(match.group(2)))
+        elif line.split(' ', 1)[0].split('\t', 1)[0] in VTT_SKIPPED_BLOCKS:
+            skipping = True
+
+    if timing is not None:
+        text = VTT_TAG_PATTERN.sub(_vtt_tag_to_srt, '\n'.join(text_lines).strip())
+        yield Cue(timing[0], timing[1], html.unescape(text))
+
+
+def _escape_vtt(text):
+    # '>' is escaped as well, so a cue text can never contain '-->'.
+    return text.replace('&', '&amp;').replace('<', '&lt;').replace('>', '&gt;')
+
+
+def _srt_tag_to_vtt(closing, name, attributes):
+    # WebVTT has no font colors without a style sheet.
+    if name == 'font':
+        return ''
+    return f"</{name}>" if closing else f"<{name}>"
+
+
+def format_vtt_block(number, start_ms, end_ms, text):
+    """Formats a single cue as a WebVTT block, ending with a blank line."""
+    start = format_timestamp(start_ms).replace(',', '.')
+    end = format_timestamp(end_ms).replace(',', '.')
+    return f"{number}\n{start} --> {end}\n{translate_tags(text, _srt_tag_to_vtt, _escape_vtt)}\n\n"
+
+
+register_format(SubtitleFormat(
+    name='vtt',
+    description='WebVTT',
+    extensions=('.vtt',),
+    read=iter_vtt_cues,
+    header='WEBVTT\n\n',
+    format_block=format_vtt_block,
+))
+
+
+# --- Advanced SubStation Alpha (.ass, .ssa) ---
+
+ASS_HEADER = """[Script Info]
+ScriptType: v4.00+
+WrapStyle: 0
+ScaledBorderAndShadow: yes
+PlayResX: 384
+PlayResY: 288
+
+[V4+ Styles]
+Format: Name, Fontname, Fontsize, PrimaryColour, SecondaryColour, OutlineColour, BackColour, Bold, Italic, Underline, StrikeOut, ScaleX, ScaleY, Spacing, Angle, BorderStyle, Outline, Shadow, Alignment, MarginL, MarginR, MarginV, Encoding
+Style: Default,Arial,16,&H00FFFFFF,&H000000FF,&H00000000,&H80000000,0,0,0,0,100,100,0,0,1,1,0,2,10,10,10,1
+
+[Events]
+Format: Layer, Start, End, Style, Name, MarginL, MarginR, MarginV, Effect, Text
+"""
+
+# Event fields when a file has no Format line. SSA v4 names the first field
+# 'Marked' instead of 'Layer', the positions of the others are the same.
+ASS_DEFAULT_EVENT_FIELDS = ['layer', 'start', 'end', 'style', 'name', 'marginl', 'marginr', 'marginv', 'effect', 'text']
+ASS_OVERRIDE_PATTERN = re.compile(r'\{([^}]*)\}')
+# The overrides with an SRT equivalent: italic, bold, underline and the
+# primary color. '\b700' (a font weight) counts as bold.
+ASS_STYLE_OVERRIDE_PATTERN = re.compile(r'\\([ibu])(\d+)|\\1?c(?:&H([0-9a-fA-F]+)&?|(?![a-z]))')
+
+
+def parse_ass_timestamp(ass_time):
+    """Converts an 'h:mm:ss.cc' timestamp into integer milliseconds."""
+    hours, minutes, rest = ass_time.strip().split(':')
+    seconds, _, fraction = rest.partition('.')
+    millis = int(fraction.ljust(3, '0')[:3]) if fraction else 0
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + millis
+
+
+def format_ass_timestamp(ms):
+    """Converts integer milliseconds into an 'h:mm:ss.cc' timestamp, rounded to centiseconds."""
+    centis = (int(ms) + 5) // 10
+    seconds, centis = divmod(centis, 100)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}.{centis:02d}"
+
+
+def ass_text_to_srt(text):
+    """Translates the override tags of an ASS event text into SRT tags and drops the rest."""
+    open_tags = []
+    pieces = []
+    position = 0
+
+    def set_tag(tag, enabled, opening=None):
+        if tag in open_tags:
+            pieces.append(f"</{tag}>")
+            open_tags.remove(tag)
+        if enabled:
+            pieces.append(opening or f"<{tag}>")
+            open_tags.append(tag)
+
+    for block in ASS_OVERRIDE_PATTERN.finditer(text):
+        pieces.append(text[position:block.start()])
+        position = block.end()
+        for override in ASS_STYLE_OVERRIDE_PATTERN.finditer(block.group(1)):
+            if override.group(1):
+                set_tag(override.group(1), override.group(2) != '0')
+            elif override.group(3):
+                # ASS colors are &HBBGGRR, possibly with a leading alpha byte.
+                bgr = override.group(3).rjust(6, '0')[-6:]
+                set_tag('font', True, f'<font color="#{bgr[4:6]}{bgr[2:4]}{bgr[0:2]}">')
+            else:
+                set_tag('font', False)
+    pieces.append(text[position:])
+    for tag in reversed(open_tags):
+        pieces.append(f"</{tag}>")
+
+    srt_text = ''.join(pieces)
+    return srt_text.replace('\\N', '\n').replace('\\n', '\n').replace('\\h', '\u00a0').strip()
+
+
+def iter_ass_cues(chunks):
+    """
+    Parses an iterable of ASS or SSA text chunks and yields a Cue tuple for
+    every Dialogue line of the [Events] section, in file order.
+    """
+    in_events = False
+    fields = ASS_DEFAULT_EVENT_FIELDS
+
+    for line in iter_lines(chunks):
+        line = line.strip()
+        if line.startswith('['):
+            in_events = line.lower() == '[events]'
+            continue
+        if not in_events:
+            continue
+
+        kind, separator, value = line.partition(':')
+        if not separator:
+            continue
+        kind = kind.strip().lower()
+        if kind == 'format':
+            fields = [field.strip().lower() for field in value.split(',')]
+        elif kind == 'dialogue':
+            # The text is the last field and may itself contain commas.
+            values = value.lstrip().split(',', len(fields) - 1)
+            if len(values) < len(fields):
+                continue
+            event = dict(zip(fields, values))
+            yield Cue(parse_ass_timestamp(event['start']), parse_ass_timestamp(event['end']),
+                      ass_text_to_srt(event['text']))
+
+
+def _srt_tag_to_ass(closing, name, attributes):
+    if name == 'font':
+        if closing:
+            return '{\\c}'
+        color = FONT_COLOR_PATTERN.search(attributes)
+        if not color:
+            return ''
+        rgb = color.group(1).upper()
+        return f"{{\\c&H{rgb[4:6]}{rgb[2:4]}{rgb[0:2]}&}}"
+    return f"{{\\{name}{0 if closing else 1}}}"
+
+
+def format_ass_block(number, start_ms, end_ms, text):
+    """Formats a single cue as an ASS Dialogue line."""
+    ass_text = translate_tags(text, _srt_tag_to_ass).replace('\n', '\\N')
+    return f"Dialogue: 0,{format_ass_timestamp(start_ms)},{format_ass_timestamp(end_ms)},Default,,0,0,0,,{ass_text}\n"
+
+
+register_format(SubtitleFormat(
+    name='ass',
+    description='Advanced SubStation Alpha',
+    extensions=('.ass', '.ssa'),
+    read=iter_ass_cues,
+    header=ASS_HEADER,
+    format_block=format_ass_block,
+))
+
+
+# --- YouTube SubViewer (.sbv) ---
+
+SBV_TIMING_PATTERN = re.compile(r'^\s*(\d+:\d{2}:\d{2}\.\d{3}),(\d+:\d{2}:\d{2}\.\d{3})\s*$')
+
+
+def iter_sbv_cues(chunks):
+    """Parses an iterable of SBV text chunks and yields Cue tuples."""
+    timing = None
+    text_lines = []
+
+    for line in iter_lines(chunks):
+        if timing is not None:
+            if line.strip():
+                text_lines.append(line)
+                continue
+            yield Cue(timing[0], timing[1], '\n'.join(text_lines).strip().replace('[br]', '\n'))
+            timing, text_lines = None, []
+            continue
+
+        match = SBV_TIMING_PATTERN.match(line)
+        if match:
+            timing = (parse_timestamp(match.group(1)), parse_timestamp(match.group(2)))
+
+    if timing is not None:
+        yield Cue(timing[0], timing[1], '\n'.join(text_lines).strip().replace('[br]', '\n'))
+
+
+def format_sbv_timestamp(ms):
+    """Converts integer milliseconds into an 'h:mm:ss.mmm' timestamp."""
+    seconds, millis = divmod(int(ms), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours}:{minutes:02d}:{seconds:02d}.{millis:03d}"
+
+
+def format_sbv_block(number, start_ms, end_ms, text):
+    """Formats a single cue as an SBV block, ending with a blank line. SBV has no markup."""
+    return f"{format_sbv_timestamp(start_ms)},{format_sbv_timestamp(end_ms)}\n{strip_tags(text)}\n\n"
+
+
+register_format(SubtitleFormat(
+    name='sbv',
+    description='YouTube SubViewer',
+    extensions=('.sbv',),
+    read=iter_sbv_cues,
+    header='',
+    format_block=format_sbv_block,
+))
@@ -0,0 +1,185 @@
+# core/text_metrics.py
+#
+# Line widths and line break opportunities for layout decisions.
+#
+# A width is the sum of memoized per-character advances: every distinct
+# character is measured once per font, after that measuring a line costs
+# one dictionary lookup per character instead of a font metrics call per
+# string. Kerning is ignored, it is far below the margins layout rules leave.
+#
+# Without a font (the subtl command line, batch workers) CELL_METRICS counts
+# cells the way terminals do: East Asian wide and fullwidth characters take
+# two, combining marks and format characters none, everything else one.
+
+import re
+import unicodedata
+from functools import lru_cache
+from itertools import accumulate
+
+# Inline SRT and ASS tags, which take no room on screen.
+TAG_PATTERN = re.compile(r'<[^>]*>|\{\\[^}]*\}')
+
+# Kinsoku rules: CJK text breaks between any two characters, except before
+# closing punctuation, small kana, iteration marks and the prolonged sound
+# and wave dashes, and after opening punctuation.
+NO_BREAK_BEFORE = frozenset("、。，．！？：；）］｝｠」』】〕〉》〗〙〛〟”’ー〜～…‥・々〻ゝゞヽヾ〃"
+                            "ぁぃぅぇぉっゃゅょゎゕゖァィゥェォッャュョヮヵヶㇰㇱㇲㇳㇴㇵㇶㇷㇸㇹㇺㇻㇼㇽㇾㇿ!),.:;?]}")
+NO_BREAK_AFTER = frozenset("（［｛｟「『【〔〈《〖〘〚〝“‘([{")
+
+SPACE_RUN_PATTERN = re.compile(r' +')
+
+# Runs of characters of the main East Asian wide ranges (Hangul, CJK
+# ideographs and punctuation, kana, fullwidth forms).
+WIDE_RANGES = ('\u1100-\u115f\u2e80-\u303e\u3041-\u33ff\u3400-\u4dbf\u4e00-\u9fff\ua000-\ua4cf'
+               '\uac00-\ud7a3\uf900-\ufaff\ufe30-\ufe4f\uff00-\uff60\uffe0-\uffe6'
+               '\U00020000-\U0002fffd\U00030000-\U0003fffd')
+WIDE_RUN_PATTERN = re.compile(f'[{WIDE_RANGES}]+')
+
+
+@lru_cache(maxsize=None)
+def is_zero_width(char):
+    """True for combining marks and format characters, which are drawn onto their neighbours."""
+    return unicodedata.combining(char) != 0 or unicodedata.category(char) in ('Mn', 'Me', 'Cf')
+
+
+@lru_cache(maxsize=None)
+def is_wide(char):
+    """True for East Asian wide and fullwidth characters."""
+    return unicodedata.east_asian_width(char) in ('W', 'F')
+
+
+def cell_width(char):
+    """The number of terminal cells a character takes."""
+    if is_zero_width(char):
+        return 0
+    return 2 if is_wide(char) else 1
+
+
+class AdvanceCache:
+    """
+    Memoized per-character advances of one font. measure_char(char) is only
+    called the first time a character is seen; zero-width characters are
+    never measured, fonts often give a lone combining mark an advance.
+    """
+    def __init__(self, measure_char):
+        self._measure_char = measure_char
+        self._advances = {}
+
+    def _learn(self, text):
+        for char in set(text).difference(self._advances):
+            self._advances[char] = 0 if is_zero_width(char) else self._measure_char(char)
+
+    def advances(self, text):
+        """The advance of every character of text, as a list."""
+        try:
+            return list(map(self._advances.__getitem__, text))
+        except KeyError:
+            self._learn(text)
+            return list(map(self._advances.__getitem__, text))
+
+    def width(self, text):
+        """The width of a single line of text without tags."""
+        try:
+            return sum(map(self._advances.__getitem__, text))
+        except KeyError:
+            self._learn(text)
+            return sum(map(self._advances.__getitem__, text))
+
+    def line_widths(self, text):
+        """The widths of the lines of a cue text, tags excluded."""
+        return [self.width(line) for line in TAG_PATTERN.sub('', text).split('\n')]
+
+
+CELL_METRICS = AdvanceCache(cell_width)
+
+
+def visible_length(text):
+    """The number of characters a viewer reads: no tags, line breaks, spaces or combining marks."""
+    return sum(1 for char in TAG_PATTERN.sub('', text) if not char.isspace() and not is_zero_width(char))
+
+
+def join_lines(text):
+    """Joins the lines of a cue text into one, without a space between two CJK characters."""
+    lines = text.split('\n')
+    joined = lines[0]
+    for line in lines[1:]:
+        if joined and line and is_wide(joined[-1]) and is_wide(line[0]):
+            joined += line
+        else:
+            joined += ' ' + line
+    return joined
+
+
+def break_opportunities(text):
+    """
+    Returns (cut_start, cut_end) pairs for every place a single line of text
+    may be broken: text[:cut_start] and text[cut_end:] become the two parts.
+    Breaks are at spaces (which are dropped) and between CJK characters;
+    never inside a tag or before a combining mark.
+    """
+    in_tag = set()
+    for match in TAG_PATTERN.finditer(text):
+        in_tag.update(range(match.start(), match.end()))
+
+    if in_tag or '  ' in text:
+        cuts = [span for span in map(re.Match.span, SPACE_RUN_PATTERN.finditer(text))
+                if span[0] and span[1] < len(text) and span[0] not in in_tag]
+    else:
+        # Single spaces only: each word ends one position before the next begins.
+        word_ends = list(accumulate([len(word) + 1 for word in text.split(' ')]))
+        cuts = [(end - 1, end) for end in word_ends[:-1] if 1 < end < len(text)]
+    if text.isascii():
+        return cuts
+
+    if not in_tag:
+        # Candidates are the edges and insides of runs of the common wide
+        # ranges, is_wide() still has the final say.
+        for run in WIDE_RUN_PATTERN.finditer(text):
+            for position in range(max(run.start(), 1), min(run.end() + 1, len(text))):
+                if _cjk_break_allowed(text[position - 1], text[position]):
+                    cuts.append((position, position))
+        return cuts
+
+    # Tags are skipped, so a break can fall between two characters they separate.
+    visible = [position for position in range(len(text)) if position not in in_tag]
+    for previous_position, position in zip(visible, visible[1:]):
+        if _cjk_break_allowed(text[previous_position], text[position]):
+            cuts.append((position, position))
+    return cuts
+
+
+def _cjk_break_allowed(previous, char):
+    return ((is_wide(previous) or is_wide(char)) and previous != ' ' and char != ' '
+            and not is_zero_width(char) and char not in NO_BREAK_BEFORE
+            and previous not in NO_BREAK_AFTER)
+
+
+def balanced_break(text, metrics=CELL_METRICS):
+    """
+    Returns the (cut_start, cut_end) of text's break opportunity that makes
+    the wider of the two parts as narrow as possible, or None if text cannot
+    be broken. On a tie the upper part is the shorter one.
+    """
+    advances = metrics.advances(text)
+    for match in TAG_PATTERN.finditer(text):
+        advances[match.start():match.end()] = [0] * (match.end() - match.start())
+    # prefix[i] is the width of text[:i].
+    prefix = [0, *accumulate(advances)]
+    total = prefix[-1]
+
+    # Moving the cut right widens the upper part and narrows the lower one,
+    # so the best cut is next to the first one where the upper part is the
+    # wider; binary search for it and compare it with its predecessor.
+    cuts = sorted(break_opportunities(text))
+    if not cuts:
+        return None
+    low, high = 0, len(cuts)
+    while low < high:
+        middle = (low + high) // 2
+        cut_start, cut_end = cuts[middle]
+        if prefix[cut_start] >= total - prefix[cut_end]:
+            high = middle
+        else:
+            low = middle + 1
+    candidates = cuts[max(low - 1, 0):low + 1]
+    return min(candidates, key=lambda cut: (max(prefix[cut[0]], total - prefix[cut[1]]), prefix[cut[0]]))
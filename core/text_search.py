@@ -0,0 +1,116 @@
+# core/text_search.py
+#
+# Find-all over a text document. Every match is kept in an OccurrenceIndex,
+# as sorted NumPy arrays of start and end offsets, so the match count is
+# known up front, finding the match at a position is a binary search, and
+# moving to the next or previous match is an index step.
+#
+# Matches never span lines. An edit therefore only invalidates the matches
+# on the lines it touched: those lines are searched again and the offsets
+# after them shifted, instead of searching the whole document.
+
+import re
+
+import numpy as np
+
+# Characters searched between two progress reports (and cancellation checks).
+PROGRESS_CHUNK_CHARS = 1 << 20
+
+
+def compile_query(query, regex=False, case_sensitive=False):
+    """
+    Returns the compiled pattern for a search query. In regex mode ^ and $
+    match at line boundaries. Raises re.error for an invalid regex.
+    """
+    if not regex:
+        query = re.escape(query)
+    flags = re.MULTILINE
+    if not case_sensitive:
+        flags |= re.IGNORECASE
+    return re.compile(query, flags)
+
+
+def find_occurrences(text, pattern, begin=0, end=None, progress=None):
+    """
+    Returns (starts, ends) int64 arrays of the matches of pattern in
+    text[begin:end], as offsets into text. Empty matches and matches that
+    span lines are left out. begin and end should be line boundaries.
+    """
+    end = len(text) if end is None else end
+    starts = []
+    ends = []
+    chunk_begin = begin
+    while chunk_begin < end:
+        # Chunks end on a line break, no match is ever cut in two.
+        chunk_end = text.find('\n', min(chunk_begin + PROGRESS_CHUNK_CHARS, end), end)
+        chunk_end = end if chunk_end == -1 else chunk_end
+        for match in pattern.finditer(text, chunk_begin, chunk_end):
+            match_start, match_end = match.span()
+            if match_end > match_start and text.find('\n', match_start, match_end) == -1:
+                starts.append(match_start)
+                ends.append(match_end)
+        chunk_begin = chunk_end + 1
+        if progress:
+            progress(min(chunk_begin, end) - begin, end - begin)
+    return np.array(starts, dtype=np.int64), np.array(ends, dtype=np.int64)
+
+
+def build_occurrence_index(text, pattern, progress=None):
+    """Searches the whole text. Run on the job pool for large documents."""
+    starts, ends = find_occurrences(text, pattern, progress=progress)
+    return OccurrenceIndex(pattern, starts, ends)
+
+
+class OccurrenceIndex:
+    """
+    The matches of one pattern in a document, sorted by start offset.
+    Matches are addressed by their number, 0 to len(index) - 1.
+    """
+    def __init__(self, pattern, starts=None, ends=None):
+        self.pattern = pattern
+        self.starts = np.zeros(0, dtype=np.int64) if starts is None else starts
+        self.ends = np.zeros(0, dtype=np.int64) if ends is None else ends
+
+    def __len__(self):
+        return len(self.starts)
+
+    def span(self, number):
+        """Returns the (start, end) offsets of a match."""
+        return int(self.starts[number]), int(self.ends[number])
+
+    def first_at_or_after(self, position):
+        """Returns the number of the first match starting at or after position (len(self) if none)."""
+        return int(np.searchsorted(self.starts, position, side='left'))
+
+    def next_from(self, position):
+        """Returns the number of the first match starting at or after position, wrapping around, or -1."""
+        if not len(self):
+            return -1
+        number = self.first_at_or_after(position)
+        return number if number < len(self) else 0
+
+    def previous_before(self, position):
+        """Returns the number of the last match before position, wrapping around, or -1."""
+        if not len(self):
+            return -1
+        number = int(np.searchsorted(self.starts, position, side='left')) - 1
+        return number if number >= 0 else len(self) - 1
+
+    def replace_lines(self, begin, old_end, new_text):
+        """
+        Updates the index after the whole lines between the offsets begin
+        and old_end were replaced by new_text: their matches are searched
+        again and the offsets of the matches after them shifted.
+        Returns False if the matches did not change, e.g. when a highlighter
+        only re-laid out the lines.
+        """
+        first = self.first_at_or_after(begin)
+        last = self.first_at_or_after(old_end)
+        new_starts, new_ends = find_occurrences(new_text, self.pattern)
+        shift = len(new_text) - (old_end - begin)
+        if (not shift and np.array_equal(new_starts + begin, self.starts[first:last])
+                and np.array_equal(new_ends + begin, self.ends[first:last])):
+            return False
+        self.starts = np.concatenate((self.starts[:first], new_starts + begin, self.starts[last:] + shift))
+        self.ends = np.concatenate((self.ends[:first], new_ends + begin, self.ends[last:] + shift))
+        return True
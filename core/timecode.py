@@ -0,0 +1,19 @@
+# core/timecode.py
+#
+# Conversions between SRT timestamps and integer milliseconds, the time unit
+# used by every cue representation in the application.
+
+
+def parse_timestamp(srt_time):
+    """Converts an 'hh:mm:ss,mmm' timestamp into integer milliseconds."""
+    hours, minutes, rest = srt_time.split(':')
+    seconds, millis = rest.replace('.', ',').split(',')
+    return ((int(hours) * 60 + int(minutes)) * 60 + int(seconds)) * 1000 + int(millis)
+
+
+def format_timestamp(ms):
+    """Converts integer milliseconds into an 'hh:mm:ss,mmm' timestamp."""
+    seconds, millis = divmod(int(ms), 1000)
+    minutes, seconds = divmod(seconds, 60)
+    hours, minutes = divmod(minutes, 60)
+    return f"{hours:02d}:{minutes:02d}:{seconds:02d},{millis:03d}"
@@ -0,0 +1,134 @@
+# core/timing.py
+#
+# Batch timing transforms. Instead of converting every timestamp into Python
+# objects one by one, whole start/end columns of a CueStore are wrapped as
+# NumPy int64 arrays (without copying) and transformed in place.
+
+import re
+
+import numpy as np
+
+
+def frame_rate_factor(source_fps, target_fps):
+    """
+    Returns the time scale factor for converting subtitles timed against a
+    video at source_fps to the same video played back at target_fps.
+    """
+    return float(source_fps) / float(target_fps)
+
+
+def transform_times(store, shift_ms=0, scale=1.0, min_ms=0, max_ms=None):
+    """
+    Scales, shifts and clamps every start and end time of a CueStore in place:
+
+        time = clamp(round(time * scale) + shift_ms, min_ms, max_ms)
+
+    Args:
+        store (CueStore): The cues to retime.
+        shift_ms (int): Milliseconds to add after scaling, may be negative.
+        scale (float): Factor applied first, e.g. from frame_rate_factor().
+        min_ms (int, optional): Lower bound, 0 keeps SRT times valid.
+        max_ms (int, optional): Upper bound, or None for no limit.
+    """
+    if not len(store):
+        return
+
+    for column in (store.starts, store.ends):
+        # A writable view over the array('q') buffer; no copy is made.
+        times = np.frombuffer(column, dtype=np.int64)
+        if scale != 1.0:
+            times[:] = np.rint(times * scale)
+        if shift_ms:
+            times += int(shift_ms)
+        if min_ms is not None or max_ms is not None:
+            np.clip(times, min_ms, max_ms, out=times)
+        # The view must be released before the array can be resized again.
+        del times
+
+
+def shift_times(store, shift_ms):
+    """Shifts every cue of a CueStore by shift_ms milliseconds, in place."""
+    transform_times(store, shift_ms=shift_ms)
+
+
+# --- Retiming ---
+
+# Milliseconds per unit abbreviation of the Min and Max Length durations, in
+# the order of their unit menus. Shared by the UI and the batch options.
+TIME_UNITS_MS = {"ms": 1, "s": 1000, "m": 60_000}
+
+# Inline tags, which are not read and do not count towards reading speed.
+TAG_PATTERN = re.compile(r'<[^>]*>|\{\\[^}]*\}')
+
+
+def reading_lengths(store):
+    """Returns an int64 array with the number of readable characters of every cue."""
+    return np.fromiter(
+        (len(TAG_PATTERN.sub('', text).replace('\n', '')) for text in store.texts()),
+        dtype=np.int64, count=len(store))
+
+
+def retime(store, min_duration_ms=None, max_duration_ms=None, min_gap_ms=None, max_cps=None):
+    """
+    Fixes the timing of a CueStore in place, resolving every rule together
+    in one forward and one backward pass over whole columns:
+
+    - Each cue needs at least min_duration_ms, and enough time to read its
+      text at max_cps characters per second, but never more than max_duration_ms.
+    - Forward: ends are extended (or cut) to the needed duration, but an
+      extension never runs into the next cue. With min_gap_ms, every end is
+      also kept min_gap_ms before the next start.
+    - Backward: a cue that still lacks time starts earlier instead, as far
+      as the previous cue's end (plus the gap) allows.
+
+    Cues are sorted by start first. Cues that start together cannot be
+    separated and keep their overlap. Any rule may be None to disable it.
+
+    Returns the number of cues whose times changed.
+    """
+    if not len(store):
+        return 0
+    store.sort()
+
+    starts = np.frombuffer(store.starts, dtype=np.int64)
+    ends = np.frombuffer(store.ends, dtype=np.int64)
+    original_starts = starts.copy()
+    original_ends = ends.copy()
+
+    # The duration every cue should have.
+    needed = np.zeros(len(starts), dtype=np.int64)
+    if min_duration_ms:
+        needed[:] = min_duration_ms
+    if max_cps:
+        np.maximum(needed, np.ceil(reading_lengths(store) * 1000.0 / max_cps).astype(np.int64), out=needed)
+    if max_duration_ms:
+        np.minimum(needed, max_duration_ms, out=needed)
+
+    # --- Forward pass: ends ---
+    np.maximum(ends, starts + needed, out=ends)
+    if max_duration_ms:
+        np.minimum(ends, starts + max_duration_ms, out=ends)
+
+    next_starts = np.empty_like(starts)
+    next_starts[:-1] = original_starts[1:]
+    next_starts[-1] = np.iinfo(np.int64).max
+    if min_gap_ms is None:
+        # Extensions stop at the next cue, overlaps already in the file stay.
+        limits = np.maximum(next_starts, original_ends)
+    else:
+        limits = next_starts - min_gap_ms
+    # Only where there is room at all, cues starting together stay as they are.
+    limits = np.where(limits > starts, limits, np.maximum(ends, starts))
+    np.minimum(ends, limits, out=ends)
+
+    # --- Backward pass: starts of cues that are still too short ---
+    earliest = np.empty_like(starts)
+    earliest[0] = 0
+    earliest[1:] = ends[:-1] + (min_gap_ms or 0)
+    wanted = np.maximum(earliest, ends - needed)
+    np.minimum(starts, wanted, out=starts)
+
+    changed = int(np.count_nonzero((starts != original_starts) | (ends != original_ends)))
+    # The views must be released before the arrays can be resized again.
+    del starts, ends
+    return changed
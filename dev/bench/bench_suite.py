@@ -0,0 +1,250 @@
+# bench_suite.py
+#
+# USAGE: Run this script from your project's root directory:
+# > python dev/bench/bench_suite.py [--size medium] [--runs 5] [--only parse glue]
+# > python dev/bench/bench_suite.py --save dev/bench/suite_baseline.json
+# > python dev/bench/bench_suite.py --compare dev/bench/suite_baseline.json [--threshold 10]
+#
+# This is a developer utility script, NOT part of the main application.
+# It generates a synthetic corpus (see corpus.py) and times the processing
+# paths of the tools on it, reporting the median of several runs:
+# - parse: CueStore.from_file (memory-mapped) and iter_file_cues (streaming),
+#   the readers every tool parses its inputs with
+# - srt library: srt.parse + srt.compose, what the tools used before the
+#   shared readers, kept as a reference point
+# - min length, glue merge, stacked merge, split, convert: the tools' batch
+#   functions, input to output file
+# - editor load: the SRT Editor opening a file, offscreen
+# - editor shift + undo: shifting every cue in the editor's text view, then
+#   undoing it, as one grouped step of the piece table history
+# - editor typing (journaled): keystrokes in the editor's text view, each one
+#   recorded in a crash journal written to the scratch directory
+# Results can be saved as a baseline and later runs compared against it,
+# flagging every benchmark that got slower than the threshold.
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from corpus import write_corpus
+
+# Corpus presets: cues per file. Every preset uses the same density,
+# overlap and text length, so results only differ by size.
+SIZES = {"small": 2_000, "medium": 20_000, "large": 200_000}
+CORPUS_PARAMETERS = {"density": 20.0, "overlap": 0.1, "text_length": 40}
+SECONDARY_FILE_COUNT = 2
+
+# Differences below this many milliseconds are treated as noise when comparing.
+NOISE_FLOOR_MS = 5.0
+
+
+# --- Benchmarks ---
+# Each takes the corpus paths and a scratch directory for its output.
+
+def bench_parse_mapped(corpus, scratch):
+    from core.cue_store import CueStore
+    store = CueStore.from_file(corpus["main"])
+    # Decoding is deferred, touch every text so both readers do the same work.
+    store.texts()
+
+
+def bench_parse_streaming(corpus, scratch):
+    from core.srt_stream import iter_file_cues
+    for _ in iter_file_cues(corpus["main"]):
+        pass
+
+
+def bench_srt_library(corpus, scratch):
+    import srt
+    from core.srt_stream import read_text
+    srt.compose(list(srt.parse(read_text(corpus["main"]))))
+
+
+def bench_min_length(corpus, scratch):
+    from tools.min_length.min_length import apply_min_length_to_file
+    apply_min_length_to_file(corpus["main"], os.path.join(scratch, "min_length.srt"), min_length=2000)
+
+
+def bench_glue(corpus, scratch):
+    from tools.merge.merge import glue_subtitle_files
+    glue_subtitle_files([corpus["main"]] + corpus["secondary"], os.path.join(scratch, "glue.srt"))
+
+
+def bench_stacked(corpus, scratch):
+    from tools.merge.merge import stack_subtitle_files
+    stack_subtitle_files(corpus["main"], corpus["secondary"], os.path.join(scratch, "stacked.srt"))
+
+
+def bench_split(corpus, scratch):
+    from tools.split.split import split_lines_in_file
+    split_lines_in_file(corpus["main"], os.path.join(scratch, "split.srt"), max_width=32)
+
+
+def bench_convert(corpus, scratch):
+    from tools.subtitle_converter.subtitle_converter import convert_subtitle_file
+    convert_subtitle_file(corpus["main"], os.path.join(scratch, "converted.vtt"), to="vtt")
+
+
+def bench_editor_load(corpus, scratch):
+    from PySide6.QtWidgets import QApplication
+    from tools.srt_editor.srt_editor import SrtEditorTool
+    app = QApplication.instance() or QApplication(sys.argv)
+    editor = SrtEditorTool()
+    editor.load_file_on_startup(corpus["main"])
+    app.processEvents()
+    editor.deleteLater()
+    app.processEvents()
+
+
+def bench_editor_shift_undo(corpus, scratch):
+    from PySide6.QtWidgets import QApplication
+    from tools.srt_editor.srt_editor import SrtEditorTool
+    app = QApplication.instance() or QApplication(sys.argv)
+    editor = SrtEditorTool()
+    editor.load_file_on_startup(corpus["main"])
+    editor._show_view(table=False)
+    editor.shift_input.setValue(1500)
+    editor.shift_times()
+    editor.undo()
+    app.processEvents()
+    editor.deleteLater()
+    app.processEvents()
+
+
+def bench_editor_typing_journaled(corpus, scratch):
+    from PySide6.QtWidgets import QApplication
+    from core.journal import JournalWriter
+    from session_journal import TabJournal
+    from tools.srt_editor.srt_editor import SrtEditorTool
+    app = QApplication.instance() or QApplication(sys.argv)
+    editor = SrtEditorTool()
+    editor.load_file_on_startup(corpus["main"])
+    editor._show_view(table=False)
+    writer = JournalWriter()
+    journal = TabJournal(writer, os.path.join(scratch, "editor.journal"))
+    journal.show_entry({'widget': editor, 'tool_id': "srt_editor", 'title': "SRT Editor",
+                        'state': None, 'edits': []})
+    editor.move_to_bottom()
+    for _ in range(500):
+        editor.editor.insertPlainText("x")
+    writer.close()
+    editor.deleteLater()
+    app.processEvents()
+
+
+BENCHMARKS = {
+    "parse (mapped)": bench_parse_mapped,
+    "parse (streaming)": bench_parse_streaming,
+    "srt.parse + srt.compose": bench_srt_library,
+    "min length": bench_min_length,
+    "glue merge": bench_glue,
+    "stacked merge": bench_stacked,
+    "split lines": bench_split,
+    "convert to vtt": bench_convert,
+    "editor load": bench_editor_load,
+    "editor shift + undo": bench_editor_shift_undo,
+    "editor typing (journaled)": bench_editor_typing_journaled,
+}
+
+
+def generate_corpus(directory, cue_count):
+    """Writes the main and secondary files of the corpus. Returns their paths."""
+    main_path = os.path.join(directory, "main.srt")
+    write_corpus(main_path, cue_count, seed=0, **CORPUS_PARAMETERS)
+    secondary_paths = []
+    for number in range(SECONDARY_FILE_COUNT):
+        path = os.path.join(directory, f"secondary_{number + 1}.srt")
+        write_corpus(path, cue_count, seed=number + 1, **CORPUS_PARAMETERS)
+        secondary_paths.append(path)
+    return {"main": main_path, "secondary": secondary_paths}
+
+
+def run_benchmark(func, corpus, runs):
+    """Runs func once to warm up, then runs times. Returns the median in milliseconds."""
+    timings = []
+    for run in range(runs + 1):
+        scratch = tempfile.mkdtemp(prefix="subtl_bench_")
+        try:
+            started = time.perf_counter()
+            func(corpus, scratch)
+            elapsed_ms = (time.perf_counter() - started) * 1000.0
+        finally:
+            shutil.rmtree(scratch, ignore_errors=True)
+        if run:
+            timings.append(elapsed_ms)
+    return statistics.median(timings)
+
+
+def compare(results, baseline, threshold_percent):
+    """Prints the benchmarks that got slower than the baseline. Returns the regression count."""
+    if baseline.get("corpus") != results["corpus"]:
+        print("Warning: the baseline was measured on a different corpus, timings are not comparable.")
+    regressions = 0
+    for name, median_ms in results["benchmarks"].items():
+        baseline_ms = baseline.get("benchmarks", {}).get(name)
+        if baseline_ms is None:
+            continue
+        difference = median_ms - baseline_ms
+        if difference > NOISE_FLOOR_MS and difference > baseline_ms * threshold_percent / 100.0:
+            regressions += 1
+            print(f"REGRESSION  {name}: {baseline_ms:.1f} -> {median_ms:.1f} ms "
+                  f"(+{difference / baseline_ms * 100.0:.0f}%)")
+    if not regressions:
+        print(f"\nNo benchmark is more than {threshold_percent}% slower than the baseline.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the subtitle processing paths on a synthetic corpus.")
+    parser.add_argument("--size", choices=SIZES, default="medium", help="Corpus size preset.")
+    parser.add_argument("--cues", type=int, help="Cues per file, overrides --size.")
+    parser.add_argument("--runs", type=int, default=5, help="Measured runs per benchmark.")
+    parser.add_argument("--only", nargs="+", metavar="WORD", help="Only run benchmarks whose name contains one of these words.")
+    parser.add_argument("--save", metavar="PATH", help="Save the medians as a baseline JSON file.")
+    parser.add_argument("--compare", metavar="PATH", help="Compare the medians against a saved baseline.")
+    parser.add_argument("--threshold", type=float, default=10.0, help="Regression threshold in percent.")
+    args = parser.parse_args()
+
+    cue_count = args.cues or SIZES[args.size]
+    benchmarks = {name: func for name, func in BENCHMARKS.items()
+                  if not args.only or any(word in name for word in args.only)}
+
+    corpus_directory = tempfile.mkdtemp(prefix="subtl_corpus_")
+    try:
+        corpus = generate_corpus(corpus_directory, cue_count)
+        size_mb = os.path.getsize(corpus["main"]) / 1024 / 1024
+        print(f"Corpus: {cue_count} cues per file ({size_mb:.1f} MB), "
+              f"{SECONDARY_FILE_COUNT} secondary files, {args.runs} runs per benchmark\n")
+
+        results = {"corpus": dict(CORPUS_PARAMETERS, cues=cue_count), "benchmarks": {}}
+        print(f"{'Benchmark':<30}{'Median (ms)':>14}")
+        for name, func in benchmarks.items():
+            median_ms = run_benchmark(func, corpus, args.runs)
+            results["benchmarks"][name] = median_ms
+            print(f"{name:<30}{median_ms:>14.1f}")
+    finally:
+        shutil.rmtree(corpus_directory, ignore_errors=True)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,96 @@
+# corpus.py
+#
+# USAGE: Run this script from your project's root directory:
+# > python dev/bench/corpus.py OUTPUT.srt [--cues 10000] [--density 20] [--overlap 0.1] [--text-length 40] [--seed 0]
+#
+# This is a developer utility script, NOT part of the main application.
+# Generates synthetic SRT files for benchmarks. The same parameters and seed
+# always produce the same file, byte for byte, so timings of different
+# revisions are measured on identical input.
+#
+# - cues: number of cues
+# - density: cues per minute of playback, sets the average spacing
+# - overlap: share of cues that start before the previous one ended
+# - text length: average characters per cue, long texts wrap onto two lines
+
+import os
+import sys
+import random
+import argparse
+
+# Make the project root importable when the script is run directly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.srt_stream import Cue, write_srt
+
+# Texts are built from these words, with some accented and CJK ones so
+# decoding and line splitting see more than ASCII.
+WORDS = (
+    "the a we you they it is was not what where when why how there here now "
+    "yes no maybe never always again please thanks sorry wait look listen "
+    "come go stay run stop tell know think want need home night morning "
+    "café naïve déjà vu über señor 你好 世界 谢谢 なるほど"
+).split()
+
+# Texts longer than this are wrapped onto a second line.
+LINE_WRAP_LENGTH = 42
+
+
+def generate_text(rng, text_length):
+    """Returns a cue text of about text_length characters."""
+    target = max(1, int(rng.gauss(text_length, text_length * 0.25)))
+    words = []
+    length = 0
+    while length < target:
+        word = rng.choice(WORDS)
+        words.append(word)
+        length += len(word) + 1
+    text = " ".join(words).capitalize()
+    if len(text) > LINE_WRAP_LENGTH:
+        middle = text.rfind(" ", 0, len(text) // 2 + 1)
+        if middle > 0:
+            text = text[:middle] + "\n" + text[middle + 1:]
+    return text
+
+
+def generate_cues(cue_count, density=20.0, overlap=0.0, text_length=40, seed=0):
+    """Yields cue_count deterministic Cue tuples, see the module comment for the parameters."""
+    rng = random.Random(seed)
+    spacing_ms = 60_000.0 / density
+    previous_end = 0
+    position = 0
+    for _ in range(cue_count):
+        duration = max(300, int(rng.uniform(0.5, 0.9) * spacing_ms))
+        if previous_end and rng.random() < overlap:
+            # Start inside the previous cue.
+            start = max(0, previous_end - int(rng.uniform(0.1, 0.5) * duration))
+        else:
+            start = position + int(rng.uniform(0.05, 0.3) * spacing_ms)
+        end = start + duration
+        yield Cue(start, end, generate_text(rng, text_length))
+        previous_end = end
+        position = max(position + int(spacing_ms), end)
+
+
+def write_corpus(path, cue_count, density=20.0, overlap=0.0, text_length=40, seed=0):
+    """Writes a generated corpus to path. Returns the number of cues written."""
+    return write_srt(path, generate_cues(cue_count, density, overlap, text_length, seed))
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Generate a deterministic synthetic SRT file.")
+    parser.add_argument("output", help="Path of the SRT file to write.")
+    parser.add_argument("--cues", type=int, default=10000, help="Number of cues.")
+    parser.add_argument("--density", type=float, default=20.0, help="Cues per minute.")
+    parser.add_argument("--overlap", type=float, default=0.0, help="Share of cues overlapping the previous one (0-1).")
+    parser.add_argument("--text-length", type=int, default=40, help="Average characters per cue.")
+    parser.add_argument("--seed", type=int, default=0, help="Random seed, same seed same file.")
+    args = parser.parse_args()
+
+    count = write_corpus(args.output, args.cues, args.density, args.overlap, args.text_length, args.seed)
+    print(f"Wrote {count} cues to {args.output} ({os.path.getsize(args.output) / 1024 / 1024:.1f} MB)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
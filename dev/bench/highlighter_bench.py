@@ -0,0 +1,144 @@
+# highlighter_bench.py
+#
+# USAGE: Run this script from your project's root directory:
+# > python dev/bench/highlighter_bench.py [--lines 100000] [--keystrokes 200]
+#
+# This is a developer utility script, NOT part of the main application.
+# It loads a synthetic SRT document into the SRT Editor and measures, for each
+# highlighting mode:
+# - load time: setPlainText() until the event queue is drained (first paint)
+# - keystroke latency: one typed character until its repaint was processed
+# Modes: "regex" (the old QRegularExpression highlighter, kept here for
+# comparison), "full" (SrtHighlighter) and "viewport" (ViewportHighlighter).
+# Qt's offscreen platform is used, no window is shown.
+
+import os
+import sys
+import time
+import argparse
+import statistics
+
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+sys.path.insert(0, PROJECT_ROOT)
+
+from PySide6.QtWidgets import QApplication
+from PySide6.QtCore import QRegularExpression
+from PySide6.QtGui import QSyntaxHighlighter, QTextCursor
+
+MODES = ("regex", "full", "viewport")
+
+
+class RegexHighlighter(QSyntaxHighlighter):
+    """The SRT Editor's highlighter before the line classifier, as the baseline."""
+    def __init__(self, parent, formats):
+        super().__init__(parent)
+        self.rules = [
+            (QRegularExpression(r"^\d+$"), formats['index']),
+            (QRegularExpression(r"^\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}$"), formats['time']),
+            (QRegularExpression(r"^(?!\d+$)(?!\d{2}:\d{2}:\d{2},\d{3} --> \d{2}:\d{2}:\d{2},\d{3}$).+"), formats['text']),
+        ]
+
+    def highlightBlock(self, text):
+        for pattern, text_format in self.rules:
+            match_iterator = pattern.globalMatch(text)
+            while match_iterator.hasNext():
+                match = match_iterator.next()
+                self.setFormat(match.capturedStart(), match.capturedLength(), text_format)
+
+
+def build_document(line_count):
+    """Returns an SRT document of about line_count lines, a third of the cues in italics."""
+    lines = []
+    index = 0
+    while len(lines) < line_count:
+        start = index * 2000
+        lines.append(str(index + 1))
+        lines.append(f"{format_ms(start)} --> {format_ms(start + 1500)}")
+        if index % 3 == 0:
+            lines.append("<i>A line of dialogue that is spoken")
+            lines.append("in italics across two lines.</i>")
+        else:
+            lines.append(f"Subtitle number {index + 1}, plain text.")
+        lines.append("")
+        index += 1
+    return "\n".join(lines)
+
+
+def format_ms(ms):
+    hours, ms = divmod(ms, 3600000)
+    minutes, ms = divmod(ms, 60000)
+    seconds, ms = divmod(ms, 1000)
+    return f"{hours:02}:{minutes:02}:{seconds:02},{ms:03}"
+
+
+def create_editor(mode):
+    """Creates an SRT Editor whose highlighting is forced into the given mode."""
+    from tools.srt_editor import srt_editor
+
+    tool = srt_editor.SrtEditorTool()
+    tool.resize(1000, 700)
+    tool.show()
+    if mode == "regex":
+        tool.highlighter.setDocument(None)
+        tool.highlighter = RegexHighlighter(tool.editor.document(), tool.highlighter.formatter.formats)
+        tool._configure_highlighting = lambda line_count: None
+    else:
+        # The editor picks the mode from the document size, move the threshold to force it.
+        srt_editor.VIEWPORT_HIGHLIGHT_THRESHOLD_LINES = 0 if mode == "viewport" else sys.maxsize
+    return tool
+
+
+def measure(app, mode, text, keystrokes):
+    tool = create_editor(mode)
+    app.processEvents()
+
+    started = time.perf_counter()
+    tool._set_editor_text(text)
+    app.processEvents()
+    load_ms = (time.perf_counter() - started) * 1000.0
+
+    # Type into the middle of the document, where a full highlighter has the most work below.
+    cursor = tool.editor.textCursor()
+    cursor.setPosition(len(text) // 2)
+    cursor.movePosition(QTextCursor.MoveOperation.EndOfBlock)
+    tool.editor.setTextCursor(cursor)
+    tool.editor.centerCursor()
+    app.processEvents()
+
+    latencies = []
+    for i in range(keystrokes):
+        started = time.perf_counter()
+        tool.editor.insertPlainText("<" if i % 10 == 0 else "a")
+        tool.editor.viewport().repaint()
+        app.processEvents()
+        latencies.append((time.perf_counter() - started) * 1000.0)
+
+    tool.close()
+    tool.deleteLater()
+    app.processEvents()
+    return load_ms, latencies
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the SRT Editor's syntax highlighting.")
+    parser.add_argument("--lines", type=int, default=100000, help="Number of lines of the synthetic document.")
+    parser.add_argument("--keystrokes", type=int, default=200, help="Number of characters typed per mode.")
+    parser.add_argument("--modes", nargs="+", choices=MODES, default=list(MODES), help="Highlighting modes to measure.")
+    args = parser.parse_args()
+
+    app = QApplication(sys.argv)
+    text = build_document(args.lines)
+    print(f"Document: {text.count(chr(10)) + 1} lines, {len(text) / 1024 / 1024:.1f} MB\n")
+    print(f"{'Mode':<12}{'Load (ms)':>12}{'Key p50 (ms)':>15}{'Key p95 (ms)':>15}{'Key max (ms)':>15}")
+
+    for mode in args.modes:
+        load_ms, latencies = measure(app, mode, text, args.keystrokes)
+        latencies.sort()
+        p95 = latencies[min(len(latencies) - 1, int(len(latencies) * 0.95))]
+        print(f"{mode:<12}{load_ms:>12.1f}{statistics.median(latencies):>15.2f}{p95:>15.2f}{latencies[-1]:>15.2f}")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
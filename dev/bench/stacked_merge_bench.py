@@ -0,0 +1,94 @@
+# stacked_merge_bench.py
+#
+# USAGE: Run this script from your project's root directory:
+# > python dev/bench/stacked_merge_bench.py [--quick]
+#
+# This is a developer utility script, NOT part of the main application.
+# It compares the interval index used by the Stacked Merge against the old
+# "every main cue vs. every secondary cue" loop, checks that both produce the
+# same matches, and prints how the timings scale with cue and file count.
+
+import os
+import sys
+import random
+import time
+
+# Make the project root importable when the script is run directly.
+sys.path.insert(0, os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..')))
+
+from core.overlap import IntervalIndex
+
+# Naive loop is skipped above this many comparisons, it would take minutes.
+NAIVE_COMPARISON_LIMIT = 50_000_000
+
+
+def generate_track(cue_count, seed):
+    """Generates a deterministic track of (start_ms, end_ms) cues."""
+    rng = random.Random(seed)
+    starts, ends = [], []
+    position = 0
+    for _ in range(cue_count):
+        position += rng.randint(200, 2500)
+        duration = rng.randint(800, 6000)
+        starts.append(position)
+        ends.append(position + duration)
+        position += duration
+    return starts, ends
+
+
+def naive_matches(main, secondary):
+    """The original O(N * M) nested loop."""
+    sec_starts, sec_ends = secondary
+    matches = []
+    for main_start, main_end in zip(*main):
+        matches.append([i for i in range(len(sec_starts))
+                        if main_start < sec_ends[i] and main_end > sec_starts[i]])
+    return matches
+
+
+def indexed_matches(main, secondary):
+    """The interval index used by merge_subtitles_stacked() in tools/merge/merge.py."""
+    index = IntervalIndex(*secondary)
+    return [index.overlapping(start, end) for start, end in zip(*main)]
+
+
+def build_case(cue_count, file_count):
+    main = generate_track(cue_count, seed=0)
+    sec_starts, sec_ends = [], []
+    for file_number in range(file_count):
+        starts, ends = generate_track(cue_count, seed=file_number + 1)
+        sec_starts.extend(starts)
+        sec_ends.extend(ends)
+    return main, (sec_starts, sec_ends)
+
+
+def time_call(func, *args):
+    begin = time.perf_counter()
+    result = func(*args)
+    return time.perf_counter() - begin, result
+
+
+def main():
+    quick = '--quick' in sys.argv
+    cue_counts = [250, 1000, 4000] if quick else [250, 1000, 4000, 16000]
+    file_counts = [1, 4, 8]
+
+    print(f"{'cues':>8} {'files':>6} {'naive (s)':>12} {'indexed (s)':>12} {'speedup':>9}  identical")
+    for cue_count in cue_counts:
+        for file_count in file_counts:
+            main_track, secondary = build_case(cue_count, file_count)
+            indexed_time, indexed = time_call(indexed_matches, main_track, secondary)
+
+            if cue_count * cue_count * file_count <= NAIVE_COMPARISON_LIMIT:
+                naive_time, naive = time_call(naive_matches, main_track, secondary)
+                identical = 'yes' if naive == indexed else 'NO'
+                speedup = f"{naive_time / indexed_time:8.1f}x" if indexed_time else '     inf'
+                naive_column = f"{naive_time:12.3f}"
+            else:
+                identical, speedup, naive_column = 'skipped', '       -', f"{'-':>12}"
+
+            print(f"{cue_count:>8} {file_count:>6} {naive_column} {indexed_time:12.3f} {speedup:>9}  {identical}")
+
+
+if __name__ == "__main__":
+    main()
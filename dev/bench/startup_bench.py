@@ -0,0 +1,174 @@
+# startup_bench.py
+#
+# USAGE: Run this script from your project's root directory:
+# > python dev/bench/startup_bench.py [--runs 5] [--cold-runs 3] [--offscreen]
+# > python dev/bench/startup_bench.py --save dev/bench/startup_baseline.json
+# > python dev/bench/startup_bench.py --compare dev/bench/startup_baseline.json [--threshold 15]
+#
+# This is a developer utility script, NOT part of the main application.
+# It starts main.py repeatedly with --profile-startup and reports the median
+# time of every startup phase, for cold and warm starts:
+# - cold: each run gets an empty bytecode cache (PYTHONPYCACHEPREFIX) and an
+#   empty stylesheet cache (XDG_CACHE_HOME, honoured by Qt on Linux). The OS
+#   file cache is not dropped, that needs root.
+# - warm: all runs share both caches, after one discarded warm-up run.
+# Every run gets an empty data directory (XDG_DATA_HOME) as well, so no run
+# restores the tabs saved by the developer's own sessions or by the run
+# before it, and none overwrites them.
+# Results can be saved as a baseline and later runs compared against it, so
+# startup regressions show up release over release.
+
+import os
+import sys
+import json
+import time
+import shutil
+import argparse
+import tempfile
+import statistics
+import subprocess
+
+PROJECT_ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..', '..'))
+MAIN_SCRIPT = os.path.join(PROJECT_ROOT, 'main.py')
+
+# Phases computed by this script on top of the ones main.py records.
+INTERPRETER_STARTUP = "interpreter startup"
+TIME_TO_FIRST_PAINT = "time to first paint"
+PROCESS_WALL_TIME = "process wall time"
+
+# Differences below this many milliseconds are treated as noise when comparing.
+NOISE_FLOOR_MS = 5.0
+
+
+def run_once(env, timeout):
+    """Starts main.py once and returns {phase name: milliseconds} for that run."""
+    with tempfile.TemporaryDirectory() as temp_dir:
+        timeline_path = os.path.join(temp_dir, 'timeline.json')
+        env = dict(env, XDG_DATA_HOME=os.path.join(temp_dir, 'data'))
+        command = [sys.executable, MAIN_SCRIPT, f"--profile-startup={timeline_path}", "--profile-exit"]
+        spawn_epoch = time.time()
+        started = time.perf_counter()
+        subprocess.run(command, cwd=PROJECT_ROOT, env=env, timeout=timeout, check=True,
+                       stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+        wall_ms = (time.perf_counter() - started) * 1000.0
+
+        with open(timeline_path, 'r', encoding='utf-8') as f:
+            timeline = json.load(f)
+
+    interpreter_ms = (timeline['origin_epoch'] - spawn_epoch) * 1000.0
+    phases = {INTERPRETER_STARTUP: interpreter_ms, PROCESS_WALL_TIME: wall_ms}
+    for event in timeline['events']:
+        if event['name'] == "first paint":
+            phases[TIME_TO_FIRST_PAINT] = interpreter_ms + event['start_ms']
+        elif event['depth'] == 0:
+            phases[event['name']] = phases.get(event['name'], 0.0) + event['duration_ms']
+        else:
+            # Nested phases are reported under their own, indented name.
+            phases["  " + event['name']] = event['duration_ms']
+    return phases
+
+
+def run_series(run_count, cold, base_env, timeout):
+    """Runs main.py run_count times and returns the list of per-run phase dicts."""
+    runs = []
+    shared_dir = None if cold else tempfile.mkdtemp(prefix="subtl_bench_")
+    try:
+        if not cold:
+            # Fill the shared caches first, this run is not measured.
+            run_once(cache_env(base_env, shared_dir), timeout)
+        for _ in range(run_count):
+            if cold:
+                run_dir = tempfile.mkdtemp(prefix="subtl_bench_")
+                try:
+                    runs.append(run_once(cache_env(base_env, run_dir), timeout))
+                finally:
+                    shutil.rmtree(run_dir, ignore_errors=True)
+            else:
+                runs.append(run_once(cache_env(base_env, shared_dir), timeout))
+    finally:
+        if shared_dir:
+            shutil.rmtree(shared_dir, ignore_errors=True)
+    return runs
+
+
+def cache_env(base_env, cache_dir):
+    """Points the bytecode and stylesheet caches of a run into cache_dir."""
+    env = dict(base_env)
+    env["PYTHONPYCACHEPREFIX"] = os.path.join(cache_dir, "pycache")
+    env["XDG_CACHE_HOME"] = os.path.join(cache_dir, "cache")
+    return env
+
+
+def summarize(runs):
+    """Returns {phase: median milliseconds}, keeping the phase order of the first run."""
+    return {name: statistics.median(run[name] for run in runs if name in run) for name in runs[0]}
+
+
+def print_summary(results):
+    names = list(results['warm']) if results['warm'] else list(results['cold'])
+    print(f"\n{'Phase':<45}{'Cold (ms)':>12}{'Warm (ms)':>12}")
+    for name in names:
+        cold = results['cold'].get(name)
+        warm = results['warm'].get(name)
+        cold_text = f"{cold:.1f}" if cold is not None else "-"
+        warm_text = f"{warm:.1f}" if warm is not None else "-"
+        print(f"{name:<45}{cold_text:>12}{warm_text:>12}")
+
+
+def compare(results, baseline, threshold_percent):
+    """Prints the phases that got slower than the baseline. Returns the regression count."""
+    regressions = 0
+    for series in ('cold', 'warm'):
+        for name, median_ms in results[series].items():
+            if name.startswith("  "):
+                continue  # Nested phases are already part of their parent
+            baseline_ms = baseline.get(series, {}).get(name)
+            if baseline_ms is None:
+                continue
+            difference = median_ms - baseline_ms
+            if difference > NOISE_FLOOR_MS and difference > baseline_ms * threshold_percent / 100.0:
+                regressions += 1
+                print(f"REGRESSION  {series:<5} {name}: {baseline_ms:.1f} -> {median_ms:.1f} ms "
+                      f"(+{difference / baseline_ms * 100.0:.0f}%)")
+    if not regressions:
+        print(f"\nNo phase is more than {threshold_percent}% slower than the baseline.")
+    return regressions
+
+
+def main():
+    parser = argparse.ArgumentParser(description="Benchmark the startup of the Subtl application.")
+    parser.add_argument("--runs", type=int, default=5, help="Number of measured warm runs.")
+    parser.add_argument("--cold-runs", type=int, default=3, help="Number of measured cold runs.")
+    parser.add_argument("--offscreen", action="store_true", help="Use Qt's offscreen platform, no window is shown.")
+    parser.add_argument("--timeout", type=float, default=60.0, help="Seconds before a run is considered hung.")
+    parser.add_argument("--save", metavar="PATH", help="Save the medians as a baseline JSON file.")
+    parser.add_argument("--compare", metavar="PATH", help="Compare the medians against a saved baseline.")
+    parser.add_argument("--threshold", type=float, default=15.0, help="Regression threshold in percent.")
+    args = parser.parse_args()
+
+    base_env = dict(os.environ)
+    if args.offscreen:
+        base_env["QT_QPA_PLATFORM"] = "offscreen"
+
+    print(f"Measuring {args.cold_runs} cold and {args.runs} warm starts of {MAIN_SCRIPT}...")
+    results = {
+        "cold": summarize(run_series(args.cold_runs, True, base_env, args.timeout)) if args.cold_runs > 0 else {},
+        "warm": summarize(run_series(args.runs, False, base_env, args.timeout)) if args.runs > 0 else {},
+    }
+    print_summary(results)
+
+    if args.save:
+        with open(args.save, 'w', encoding='utf-8') as f:
+            json.dump(results, f, indent=2)
+        print(f"\nBaseline saved to {args.save}")
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(results, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -5,16 +5,21 @@
 #
 # This is a developer utility script, NOT part of the main application.
 # Its purpose is to scan the 'tools' directory and automatically generate
-# the 'tools/tool_registry.py' and 'tools/style_registry.py' files.
+# the 'tools/tool_registry.py', 'tools/tool_manifest.py' and
+# 'tools/style_registry.py' files.
 # These files contain explicit imports needed for a Nuitka build to succeed.
+# The manifest additionally holds each tool's metadata, so the application
+# can list tools without importing them.
 #
 # Run this script whenever you add, remove, or rename a tool or its style file.
 
 import os
+import ast
 
 # --- Configuration ---
 TOOLS_DIR = 'tools'
 TOOL_REGISTRY_PATH = os.path.join(TOOLS_DIR, 'tool_registry.py')
+TOOL_MANIFEST_PATH = os.path.join(TOOLS_DIR, 'tool_manifest.py')
 STYLE_REGISTRY_PATH = os.path.join(TOOLS_DIR, 'style_registry.py')
 # ---------------------
 
@@ -52,8 +57,8 @@ def write_tool_registry_file(tools_map):
 # !!! DO NOT EDIT MANUALLY. YOUR CHANGES WILL BE OVERWRITTEN. !!!
 #
 # This file contains the explicit list of all tools to be included in the
-# application. It is used by the tool_loader to populate the list of
-# available tools in a way that is compatible with compilers like Nuitka.
+# application. Importing it loads every tool module at once; the application
+# itself lists tools from tool_manifest.py and imports them lazily.
 
 # --- Tool Module Imports ---
 # Nuitka will trace these imports and include them in the final build.
@@ -65,7 +70,7 @@ def write_tool_registry_file(tools_map):
 # --- Tool Module Imports ---
 {''.join([line + chr(10) for line in import_lines])}
 # --- Tool Registration List ---
-# The tool_loader will iterate through this list to build the AVAILABLE_TOOLS dict.
+# Every registered tool module, in a stable order.
 REGISTERED_TOOL_MODULES = [
 {chr(10).join(module_list_lines)}
 ]
@@ -77,6 +82,91 @@ REGISTERED_TOOL_MODULES = [
     except IOError as e:
         print(f"\nError: Could not write to '{TOOL_REGISTRY_PATH}': {e}")
 
+def read_tool_definition(name):
+    """
+    Reads the TOOL_DEFINITION literal of a tool module without importing it,
+    so the manifest can be built without PySide6 or any tool dependency.
+    """
+    tool_module_path = os.path.join(TOOLS_DIR, name, f'{name}.py')
+    with open(tool_module_path, 'r', encoding='utf-8') as f:
+        tree = ast.parse(f.read(), filename=tool_module_path)
+
+    for node in tree.body:
+        if isinstance(node, ast.Assign) and any(getattr(target, 'id', None) == 'TOOL_DEFINITION' for target in node.targets):
+            return ast.literal_eval(node.value)
+    return None
+
+def format_literal(value, indent=0):
+    """Formats a literal as Python source, one dictionary key per line."""
+    if not isinstance(value, dict) or not value:
+        return repr(value)
+    padding = " " * (indent + 4)
+    lines = [f"{padding}{key!r}: {format_literal(item, indent + 4)}," for key, item in value.items()]
+    return "{\n" + "\n".join(lines) + "\n" + " " * indent + "}"
+
+def write_tool_manifest_file(tools_map):
+    """Generates and writes the content of tool_manifest.py."""
+    tool_names = sorted([name for name, data in tools_map.items() if data['has_tool_module']])
+
+    manifest = {}
+    for name in tool_names:
+        try:
+            definition = read_tool_definition(name)
+        except (SyntaxError, ValueError) as e:
+            print(f"  Warning: Could not read TOOL_DEFINITION of '{name}': {e}")
+            continue
+        if not definition or 'widget_class_name' not in definition:
+            print(f"  Warning: Tool '{name}' is missing a usable TOOL_DEFINITION, skipped.")
+            continue
+
+        entry = {
+            "display_name": definition['display_name'],
+            "description": definition.get('description', ''),
+            "can_open_file": definition.get('can_open_file', False),
+            "widget_class_path": f"tools.{name}.{name}.{definition['widget_class_name']}",
+        }
+        # Batch metadata lets the subtl command line build its options lazily too.
+        for key in ('batch_function_name', 'batch_output_suffix', 'batch_input_extensions',
+                    'batch_output_extension_option', 'batch_options'):
+            if key in definition:
+                entry[key] = definition[key]
+        manifest[name] = entry
+
+    header = """# tool_manifest.py
+#
+# !!! THIS FILE IS AUTO-GENERATED BY build_registries.py !!!
+# !!! DO NOT EDIT MANUALLY. YOUR CHANGES WILL BE OVERWRITTEN. !!!
+#
+# Static metadata of every tool, read from their TOOL_DEFINITION. The UI is
+# rendered from this manifest and a tool module is only imported when the tool
+# is first opened. The imports below stay explicit, one per tool, so Nuitka
+# can still trace and include every tool.
+"""
+    importer_lines = []
+    for position, name in enumerate(manifest):
+        keyword = "if" if position == 0 else "elif"
+        importer_lines.append(f'    {keyword} tool_id == "{name}":')
+        importer_lines.append(f"        from tools.{name} import {name} as module")
+    importer_lines.append("    else:")
+    importer_lines.append('        raise KeyError(f"Unknown tool \'{tool_id}\'")')
+    importer_lines.append("    return module")
+
+    manifest_body = f"""
+# --- Tool Metadata ---
+TOOL_MANIFEST = {format_literal(manifest)}
+
+# --- Lazy Tool Imports ---
+def import_tool_module(tool_id):
+    \"\"\"Imports and returns the module of a tool. Only called when the tool is opened.\"\"\"
+{chr(10).join(importer_lines)}
+"""
+    try:
+        with open(TOOL_MANIFEST_PATH, 'w', encoding='utf-8') as f:
+            f.write(header + manifest_body)
+        print(f"Successfully updated '{TOOL_MANIFEST_PATH}' with {len(manifest)} tools.")
+    except IOError as e:
+        print(f"\nError: Could not write to '{TOOL_MANIFEST_PATH}': {e}")
+
 def write_style_registry_file(tools_map):
     """Generates and writes the content of style_registry.py."""
     tools_with_styles = sorted([name for name, data in tools_map.items() if data['has_style_module']])
@@ -114,8 +204,10 @@ if __name__ == "__main__":
     found_items = scan_tools_directory()
     if found_items:
         write_tool_registry_file(found_items)
+        write_tool_manifest_file(found_items)
         write_style_registry_file(found_items)
     else:
         print("No items found. Registry files will be created empty.")
         write_tool_registry_file({})
+        write_tool_manifest_file({})
         write_style_registry_file({})
\ No newline at end of file
@@ -1,9 +1,39 @@
 # launcher.py
 
 import sys, subprocess, os
+import json
+import getpass
 # QSettings is from QtCore, which is a base module and less "heavy" than QtWidgets.
 # It is needed to read the configuration to decide which path to take.
 from PySide6.QtCore import QSettings
+# QLocalSocket reaches an already running Subtl window, see single_instance.py.
+from PySide6.QtNetwork import QLocalSocket
+
+# How long to wait for a running Subtl window to accept a file.
+FORWARD_TIMEOUT_MS = 1000
+
+def forward_to_running_app(file_to_open):
+    """
+    Hands the file to an already running Subtl window, which opens it in a new
+    tab. Returns True if it was accepted. This mirrors the client side of the
+    main application's single_instance.py, the launcher is built on its own.
+    """
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    socket = QLocalSocket()
+    socket.connectToServer(f"Liiesl-Subtl-{user}")
+    if not socket.waitForConnected(FORWARD_TIMEOUT_MS):
+        return False
+
+    message = json.dumps({"file": os.path.abspath(file_to_open), "tool": None}) + "\n"
+    socket.write(message.encode('utf-8'))
+    if not socket.waitForBytesWritten(FORWARD_TIMEOUT_MS):
+        return False
+    accepted = socket.waitForReadyRead(FORWARD_TIMEOUT_MS) and bytes(socket.readAll().data()).startswith(b"ok\n")
+    socket.disconnectFromServer()
+    return accepted
 
 def launch_main_app(python_path, script_path, file_to_open=None):
     """
@@ -74,7 +104,9 @@ def main():
     # Fast Path: If a file is provided and settings are configured, launch immediately.
     # On this path, no heavy GUI modules are imported unless a launch error occurs.
     if file_argument and python_path and script_path:
-        launch_main_app(python_path, script_path, file_argument)
+        # Fastest: a Subtl window is already open, it takes the file over.
+        if not forward_to_running_app(file_argument):
+            launch_main_app(python_path, script_path, file_argument)
     else:
         # Slow Path: Show the configuration GUI.
         # This is the point where the heavy GUI modules are imported because they
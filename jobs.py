@@ -0,0 +1,134 @@
+# jobs.py
+
+import threading
+import traceback
+from PySide6.QtCore import QObject, QRunnable, QThreadPool, QTimer, Signal
+
+
+class JobCancelled(Exception):
+    """Raised inside a job's processing function once cancellation was requested."""
+
+
+class JobSignals(QObject):
+    """
+    Signals of a single job. They are emitted from the worker thread and
+    delivered to connected slots on the GUI thread.
+    """
+    progress = Signal(int)       # Percent done, 0-100
+    finished = Signal(object)    # The processing function's return value
+    failed = Signal(str)         # Error message
+    cancelled = Signal()
+    done = Signal()              # Always emitted last, whatever the outcome
+
+
+class Job(QRunnable):
+    """
+    Runs a processing function on the thread pool.
+
+    The function receives a `progress` keyword argument: a callback taking
+    (done, total). Besides reporting progress, the callback is where
+    cancellation happens, it raises JobCancelled once cancel() was called,
+    so any function that reports progress can also be cancelled.
+    """
+    def __init__(self, title, func, *args, **kwargs):
+        super().__init__()
+        # The JobManager keeps the reference, Qt must not delete the runnable.
+        self.setAutoDelete(False)
+        self.title = title
+        self.func = func
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = JobSignals()
+        self.percent = 0
+        self._cancel_event = threading.Event()
+
+    def cancel(self):
+        """Requests cooperative cancellation, honoured at the next progress report."""
+        self._cancel_event.set()
+
+    def is_cancelled(self):
+        return self._cancel_event.is_set()
+
+    def report_progress(self, done, total):
+        if self._cancel_event.is_set():
+            raise JobCancelled()
+        percent = int(done * 100 / total) if total else 0
+        # Only emit when the visible value changes, to keep the event queue light.
+        if percent != self.percent:
+            self.percent = percent
+            self.signals.progress.emit(percent)
+
+    def run(self):
+        try:
+            if self._cancel_event.is_set():
+                raise JobCancelled()
+            result = self.func(*self.args, progress=self.report_progress, **self.kwargs)
+        except JobCancelled:
+            self.signals.cancelled.emit()
+        except Exception as e:
+            traceback.print_exc()
+            self.signals.failed.emit(str(e))
+        else:
+            self.signals.finished.emit(result)
+        finally:
+            self.signals.done.emit()
+
+
+class JobManager(QObject):
+    """
+    Submits long-running tool actions to a thread pool, keeping the GUI
+    thread (and with it the whole window) responsive.
+    """
+    # Emitted whenever a job starts, ends or reports progress.
+    jobs_changed = Signal()
+
+    def __init__(self):
+        super().__init__()
+        self.thread_pool = QThreadPool.globalInstance()
+        self.active_jobs = []
+        # Jobs started with submit_background(), kept out of the jobs indicator.
+        self.background_jobs = []
+
+    def submit(self, title, func, *args, **kwargs):
+        """
+        Creates a job for func(*args, progress=..., **kwargs) and returns it.
+
+        The job is started on the next event loop iteration, so the caller can
+        safely connect to job.signals right after submitting.
+        """
+        job = self._start(self.active_jobs, title, func, *args, **kwargs)
+        # Connected to this object's slot (not a lambda) so it is queued
+        # onto the GUI thread instead of running in the worker.
+        job.signals.progress.connect(self.jobs_changed)
+        self.jobs_changed.emit()
+        return job
+
+    def submit_background(self, func, *args, **kwargs):
+        """
+        Like submit(), for short internal work the user did not start, such as
+        the editor's search index: the job does not show in active_jobs.
+        """
+        return self._start(self.background_jobs, "", func, *args, **kwargs)
+
+    def cancel_all(self):
+        for job in self.active_jobs:
+            job.cancel()
+
+    def _start(self, jobs, title, func, *args, **kwargs):
+        job = Job(title, func, *args, **kwargs)
+        job.signals.done.connect(self._on_job_done)
+        # Holds the reference until the job is done, even once its submitter dropped it.
+        jobs.append(job)
+        QTimer.singleShot(0, lambda: self.thread_pool.start(job))
+        return job
+
+    def _on_job_done(self):
+        signals = self.sender()
+        if any(job.signals is signals for job in self.background_jobs):
+            self.background_jobs = [job for job in self.background_jobs if job.signals is not signals]
+            return
+        self.active_jobs = [job for job in self.active_jobs if job.signals is not signals]
+        self.jobs_changed.emit()
+
+# Create a single instance of the JobManager.
+job_manager = JobManager()
@@ -1,20 +1,47 @@
 # main.py
 
 import sys, os
+import tempfile
 import traceback
-from PySide6.QtWidgets import (
-    QApplication, QMainWindow, QWidget, QVBoxLayout, QStackedWidget, QMessageBox,
-    QDialog, QLabel, QPushButton
-)
-from PySide6.QtCore import Qt, QSettings
 from functools import partial
 
-# Assuming these are in the correct path
-from chrome.titlebar import CustomTitleBar
-from chrome.tab import TabManager
-from styles import style_manager
-from settings_dialog import SettingsDialog
-from tools.tool_loader import AVAILABLE_TOOLS # NEW: Import available tools
+# The profiler is set up before any heavy import, so those are timed as well.
+from startup_profiler import startup_profiler, parse_profile_arguments
+PROFILE_TIMELINE_PATH, PROFILE_EXIT, APPLICATION_ARGV = parse_profile_arguments(sys.argv)
+if PROFILE_TIMELINE_PATH:
+    startup_profiler.enable()
+
+# A second invocation hands its file to the already running window and exits,
+# before any widget module is imported. Profiling always measures a real start.
+with startup_profiler.phase("single instance check"):
+    from single_instance import InstanceServer, parse_instance_arguments, forward_to_running_instance
+    TOOL_TO_OPEN, NEW_INSTANCE, APPLICATION_ARGV = parse_instance_arguments(APPLICATION_ARGV)
+    if __name__ == "__main__" and not NEW_INSTANCE and not PROFILE_TIMELINE_PATH:
+        forwarded_file = APPLICATION_ARGV[1] if len(APPLICATION_ARGV) > 1 and os.path.exists(APPLICATION_ARGV[1]) else None
+        if forward_to_running_instance(forwarded_file, TOOL_TO_OPEN):
+            sys.exit(0)
+
+with startup_profiler.phase("import PySide6"):
+    from PySide6.QtWidgets import (
+        QApplication, QMainWindow, QWidget, QVBoxLayout, QStackedWidget, QMessageBox,
+        QDialog, QLabel, QPushButton
+    )
+    from PySide6.QtCore import Qt, QSettings, QStandardPaths, QObject, QEvent, QTimer
+
+with startup_profiler.phase("import qtawesome"):
+    # Loaded by the title bar anyway, imported first so it is timed on its own.
+    import qtawesome
+
+with startup_profiler.phase("import tool manifest"):
+    from tools.tool_loader import AVAILABLE_TOOLS # NEW: Import available tools
+
+with startup_profiler.phase("import application modules"):
+    # Assuming these are in the correct path
+    from chrome.titlebar import CustomTitleBar
+    from chrome.tab import TabManager
+    from session_journal import SessionJournal, save_session, session_file_path, take_saved_sessions
+    from styles import style_manager
+    from settings_dialog import SettingsDialog
 
 # MODIFIED: Centralized application constants to match Nuitka build
 ORGANIZATION_NAME = "Liiesl"
@@ -69,6 +96,27 @@ class ChooseToolWindow(QDialog):
         self.selected_tool_id = tool_id
         self.accept() # Close the dialog with an "Accepted" result
 
+class FirstPaintWatcher(QObject):
+    """
+    Event filter that marks the first paint of a window in the startup
+    timeline and writes the timeline out. Only installed with --profile-startup.
+    """
+    def __init__(self, timeline_path, exit_after_paint, parent=None):
+        super().__init__(parent)
+        self.timeline_path = timeline_path
+        self.exit_after_paint = exit_after_paint
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.Paint:
+            watched.removeEventFilter(self)
+            startup_profiler.mark("first paint")
+            startup_profiler.write(self.timeline_path)
+            print(f"Startup timeline written to {self.timeline_path}")
+            if self.exit_after_paint:
+                # Let the paint finish before quitting.
+                QTimer.singleShot(0, QApplication.quit)
+        return False
+
 class Subtle(QMainWindow):
     """
     The main window for the Subtitle Manipulation Tool with a Chrome-like UI.
@@ -83,50 +131,133 @@ class Subtle(QMainWindow):
 
         # MODIFIED: Use constants for QSettings organization and application names
         self.settings = QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
+        # Compiled stylesheets are reused across runs from the user's cache directory.
+        cache_root = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericCacheLocation)
+        if cache_root:
+            style_manager.set_cache_dir(os.path.join(cache_root, ORGANIZATION_NAME, APPLICATION_NAME))
+        # The tabs are saved on exit and restored on the next start. Until
+        # then, every tab is journaled so it can be recovered if the application dies.
+        data_root = QStandardPaths.writableLocation(QStandardPaths.StandardLocation.GenericDataLocation)
+        if PROFILE_TIMELINE_PATH:
+            # A profiled start must not restore (and so consume) the user's saved
+            # session, it runs on an empty data directory removed at exit.
+            self.profile_data_dir = tempfile.TemporaryDirectory(prefix="subtl-profile-")
+            data_root = self.profile_data_dir.name
+        self.session_journal = None
+        self.sessions_dir = None
+        self.session_path = None
+        if data_root:
+            data_dir = os.path.join(data_root, ORGANIZATION_NAME, APPLICATION_NAME)
+            # Every instance saves its own session, another window never overwrites it.
+            self.sessions_dir = os.path.join(data_dir, "sessions")
+            self.session_path = session_file_path(self.sessions_dir)
+            try:
+                self.session_journal = SessionJournal(os.path.join(data_dir, "journal"), self)
+            except OSError as e:
+                print(f"Crash recovery is disabled, the journal directory is not writable: {e}")
 
-        main_widget = QWidget()
-        main_widget.setObjectName("main_content")
-        main_layout = QVBoxLayout(main_widget)
-        main_layout.setContentsMargins(0, 0, 0, 0)
-        main_layout.setSpacing(0)
+        with startup_profiler.phase("build title bar and tab manager"):
+            main_widget = QWidget()
+            main_widget.setObjectName("main_content")
+            main_layout = QVBoxLayout(main_widget)
+            main_layout.setContentsMargins(0, 0, 0, 0)
+            main_layout.setSpacing(0)
 
-        self.pages_widget = QStackedWidget()
-        self.title_bar = CustomTitleBar(self, bar_type='main_window')
-        self.tab_manager = TabManager(self, self.pages_widget, self.title_bar.tab_container)
+            self.pages_widget = QStackedWidget()
+            self.title_bar = CustomTitleBar(self, bar_type='main_window')
+            self.tab_manager = TabManager(self, self.pages_widget, self.title_bar.tab_container,
+                                          journal=self.session_journal)
 
-        self.title_bar.back_button.clicked.connect(self.tab_manager.go_back)
-        self.title_bar.forward_button.clicked.connect(self.tab_manager.go_forward)
-        self.title_bar.settings_requested.connect(self.open_settings_dialog)
+            self.title_bar.back_button.clicked.connect(self.tab_manager.go_back)
+            self.title_bar.forward_button.clicked.connect(self.tab_manager.go_forward)
+            self.title_bar.settings_requested.connect(self.open_settings_dialog)
 
-        main_layout.addWidget(self.title_bar)
-        main_layout.addWidget(self.pages_widget)
+            main_layout.addWidget(self.title_bar)
+            main_layout.addWidget(self.pages_widget)
 
-        self.load_and_apply_style()
+        with startup_profiler.phase("apply stylesheet"):
+            self.load_and_apply_style()
+
+        # Tabs left by a session that crashed come back first, then the ones
+        # saved by the windows closed last. Only the current tab's widget is created now.
+        restored_tabs = 0
+        if self.session_journal is not None:
+            with startup_profiler.phase("recover crashed sessions"):
+                restored_tabs += self.tab_manager.restore_session(self.session_journal.recover())
+        if self.sessions_dir:
+            with startup_profiler.phase("restore saved sessions"):
+                for session in take_saved_sessions(self.sessions_dir):
+                    restored_tabs += self.tab_manager.restore_session(session)
 
         # MODIFIED: Conditional startup logic
         if tool_to_open and file_to_open:
             # A tool and file were specified, open them directly
-            self.tab_manager.open_tool_directly(tool_to_open, file_to_open)
-        else:
+            with startup_profiler.phase("TabManager.open_tool_directly"):
+                self.tab_manager.open_tool_directly(tool_to_open, file_to_open)
+        elif not restored_tabs:
             # Standard startup, open the dashboard
-            self.tab_manager.open_new_dashboard_tab()
+            with startup_profiler.phase("TabManager.open_new_dashboard_tab"):
+                self.tab_manager.open_new_dashboard_tab()
 
         self.setCentralWidget(main_widget)
         self.error_dialog = None
 
+    def open_forwarded_request(self, file_path, tool_id):
+        """
+        Opens a file forwarded by a later invocation of the application (see
+        single_instance.py), asking for a tool if none was given. Without a
+        file, a new dashboard tab is opened.
+        """
+        # Bring the window to the front first, so the tool chooser shows above it.
+        if self.isMinimized():
+            self.showNormal()
+        self.raise_()
+        self.activateWindow()
+
+        if not file_path or not os.path.exists(file_path):
+            self.tab_manager.open_new_dashboard_tab()
+            return
+
+        if tool_id not in AVAILABLE_TOOLS:
+            chooser = ChooseToolWindow(file_path, self)
+            if not chooser.exec():
+                return
+            tool_id = chooser.selected_tool_id
+        self.tab_manager.open_tool_directly(tool_id, file_path)
+
     def load_and_apply_style(self):
         saved_theme = self.settings.value("theme", "dark")
         saved_font_size = self.settings.value("font_size", 14, type=int)
         style_manager.set_style_properties(theme=saved_theme, font_size=saved_font_size)
-        self.setStyleSheet(style_manager.get_stylesheet())
+        stylesheet = style_manager.get_stylesheet()
+        # Re-applying an unchanged stylesheet would still re-polish every widget.
+        if stylesheet != self.styleSheet():
+            self.setStyleSheet(stylesheet)
 
     def open_settings_dialog(self):
         dialog = SettingsDialog(self)
         if dialog.exec():
             self.load_and_apply_style()
 
+    def closeEvent(self, event):
+        saved = False
+        if self.session_path:
+            try:
+                save_session(self.session_path, self.tab_manager.session_state())
+                saved = True
+            except OSError as e:
+                print(f"The open tabs could not be saved: {e}")
+        # A saved session leaves nothing to recover. Otherwise the journals
+        # are kept, and the next start recovers the tabs from them.
+        if self.session_journal is not None:
+            self.session_journal.close(keep_journals=not saved)
+        super().closeEvent(event)
+
     def handle_exception(self, exc_type, exc_value, exc_traceback):
         print("".join(traceback.format_exception(exc_type, exc_value, exc_traceback)))
+        # The application may not survive the error, get the latest edits to disk now.
+        if self.session_journal is not None:
+            self.session_journal.flush()
         error_message = f"An unexpected error occurred:\n\n{exc_value}\n\nSee the console for more details."
         self.error_dialog = QMessageBox(self)
         self.error_dialog.setIcon(QMessageBox.Icon.Critical)
@@ -138,33 +269,56 @@ class Subtle(QMainWindow):
         self.error_dialog.show()
 
 
+def show_main_window(window):
+    """
+    Shows the main window, watching for its first paint when profiling, and
+    otherwise starts accepting the files forwarded by later invocations.
+    """
+    sys.excepthook = window.handle_exception
+    # A profiled start runs next to the user's window, which must keep its socket.
+    if not NEW_INSTANCE and not PROFILE_TIMELINE_PATH:
+        window.instance_server = InstanceServer(window)
+        if window.instance_server.listen():
+            window.instance_server.open_requested.connect(window.open_forwarded_request)
+    if PROFILE_TIMELINE_PATH:
+        window.installEventFilter(FirstPaintWatcher(PROFILE_TIMELINE_PATH, PROFILE_EXIT, window))
+    with startup_profiler.phase("show window"):
+        window.show()
+
+
 if __name__ == "__main__":
-    app = QApplication(sys.argv)
+    with startup_profiler.phase("create QApplication"):
+        app = QApplication(APPLICATION_ARGV)
     
     # MODIFIED: Main entry point logic
-    file_to_open = sys.argv[1] if len(sys.argv) > 1 else None
+    file_to_open = APPLICATION_ARGV[1] if len(APPLICATION_ARGV) > 1 else None
 
     if file_to_open and os.path.exists(file_to_open):
         # A file was passed via the command line (from launcher.exe)
-        # Show the "Choose Tool" dialog first
-        chooser = ChooseToolWindow(file_to_open)
-        
-        # .exec() opens the dialog modally and waits for user interaction
-        if chooser.exec():
+        if TOOL_TO_OPEN in AVAILABLE_TOOLS:
+            # The tool was chosen up front with --tool
+            chosen, selected_tool = True, TOOL_TO_OPEN
+        else:
+            # Show the "Choose Tool" dialog first
+            chooser = ChooseToolWindow(file_to_open)
+
+            # .exec() opens the dialog modally and waits for user interaction
+            with startup_profiler.phase("choose tool dialog (includes user input)"):
+                chosen = chooser.exec()
             # The user chose a tool and clicked its button
             selected_tool = chooser.selected_tool_id
-            
+        if chosen:
             # Launch the main window with instructions to open the specific tool and file
-            window = Subtle(tool_to_open=selected_tool, file_to_open=file_to_open)
-            sys.excepthook = window.handle_exception
-            window.show()
+            with startup_profiler.phase("build Subtle"):
+                window = Subtle(tool_to_open=selected_tool, file_to_open=file_to_open)
+            show_main_window(window)
             sys.exit(app.exec())
         else:
             # The user cancelled the "Choose Tool" dialog
             sys.exit(0)
     else:
         # No file argument was passed, start the application normally
-        window = Subtle()
-        sys.excepthook = window.handle_exception
-        window.show()
-        sys.exit(app.exec())
\ No newline at end of file
+        with startup_profiler.phase("build Subtle"):
+            window = Subtle()
+        show_main_window(window)
+        sys.exit(app.exec())
@@ -0,0 +1,350 @@
+# session_journal.py
+#
+# Crash recovery for the open tabs. Every tab has a journal (see
+# core/journal.py) describing the history entry it shows: a snapshot of the
+# tool's state, followed by the edits made since. When the application dies,
+# the next start finds the journals and reopens the tabs from them.
+#
+# Each record is one line of UTF-8 JSON:
+#   ["snapshot", tool_id or null, title, state]   always the first record
+#   ["edit", data]                                 tool specific, see below
+#
+# Tools take part through the same duck-typed conventions as hibernation
+# (chrome/tab.py):
+#   journal_state()        The state to snapshot, accepted by restore_state().
+#                          May instead return a function computing it, run on
+#                          the writer thread. Without it, save_state() is used
+#                          when it returns plain JSON data.
+#   attach_journal(j)      For tools with frequent edits, e.g. typing. The tool
+#                          calls j.record(data) for each edit and j.snapshot()
+#                          after replacing its content; None detaches it.
+#   replay_journal_record(data)
+#                          Makes a recorded edit again after restore_state().
+# Tools without attach_journal() are snapshotted whenever their state changed,
+# checked every POLL_INTERVAL_MS.
+#
+# The journals of a session live in a directory of their own, locked while
+# the session runs. An unlocked directory belongs to a session that crashed.
+#
+# A clean exit saves the session instead (save_session): every tab with its
+# whole history, each entry as its tool, title and state in plain data. Each
+# instance saves to a file of its own (session_file_path), so windows started
+# with --new-instance never overwrite each other's tabs. The next start
+# restores every saved session once (take_saved_sessions), a crash after that
+# is recovered from the journals again.
+
+import os
+import json
+import shutil
+import time
+import traceback
+
+from PySide6.QtCore import QObject, QTimer, QLockFile
+
+from core.journal import JournalWriter, read_records
+from tools.tool_loader import loaded_widget_class
+
+SESSION_DIR_PREFIX = "session-"
+LOCK_FILE_NAME = "lock"
+TAB_JOURNAL_SUFFIX = ".journal"
+SESSION_FILE_SUFFIX = ".json"
+
+# Edit records a tab journal takes before it is compacted into a new snapshot, in bytes.
+COMPACT_AFTER_BYTES = 4 * 1024 * 1024
+
+# How often the tools without their own edit records are checked for changes.
+POLL_INTERVAL_MS = 2000
+
+
+def encode_record(record):
+    return json.dumps(record, ensure_ascii=False, separators=(',', ':')).encode('utf-8')
+
+
+def journal_state(widget):
+    """
+    The state a tool widget is journaled with, a function computing it, or
+    None if the tool has nothing to journal right now (e.g. a job is running).
+    """
+    if hasattr(widget, 'journal_state'):
+        return widget.journal_state()
+    if hasattr(widget, 'save_state'):
+        return widget.save_state()
+    return None
+
+
+def plain_entry_state(entry):
+    """
+    The state of a history entry as plain data. A hibernated entry keeps what
+    save_state() returned; tools that hibernate with live objects turn it
+    into plain data with a plain_state(state) static method.
+    """
+    if entry['tool_id'] is None:
+        return {}
+    if entry['widget'] is not None:
+        state = journal_state(entry['widget'])
+        return state() if callable(state) else state
+    # A tool never loaded in this session has no live objects in its state.
+    widget_class = loaded_widget_class(entry['tool_id'])
+    if entry['state'] is not None and hasattr(widget_class, 'plain_state'):
+        return widget_class.plain_state(entry['state'])
+    return entry['state']
+
+
+def session_file_path(directory):
+    """A new file under directory for this instance to save its session to, named like the journal directories."""
+    return os.path.join(directory, f"{SESSION_DIR_PREFIX}{time.time_ns()}-{os.getpid()}{SESSION_FILE_SUFFIX}")
+
+
+def save_session(path, session):
+    """Writes a TabManager.session_state() to path, replacing the previous one at once."""
+    os.makedirs(os.path.dirname(path), exist_ok=True)
+    temporary_path = path + '.tmp'
+    with open(temporary_path, 'w', encoding='utf-8') as f:
+        # Whatever is not plain data is saved as null, its entry is reopened empty.
+        json.dump(session, f, ensure_ascii=False, separators=(',', ':'), default=lambda value: None)
+    os.replace(temporary_path, path)
+
+
+def take_saved_sessions(directory):
+    """
+    Returns the sessions saved under directory, oldest first, and deletes
+    their files so each is restored only once, by a single instance.
+    """
+    if not os.path.isdir(directory):
+        return []
+    sessions = []
+    for name in sorted(os.listdir(directory)):
+        if not name.startswith(SESSION_DIR_PREFIX) or not name.endswith(SESSION_FILE_SUFFIX):
+            continue
+        path = os.path.join(directory, name)
+        # Claimed by renaming it first: of two instances starting at once, only one gets the file.
+        taken_path = f"{path}.{os.getpid()}.taken"
+        try:
+            os.replace(path, taken_path)
+        except OSError:
+            continue
+        try:
+            with open(taken_path, encoding='utf-8') as f:
+                sessions.append(json.load(f))
+        except (OSError, ValueError):
+            traceback.print_exc()
+        try:
+            os.remove(taken_path)
+        except OSError:
+            pass
+    return sessions
+
+
+class TabJournal:
+    """The journal of one tab, following the history entry the tab shows."""
+    def __init__(self, writer, path):
+        self.writer = writer
+        self.path = path
+        self.entry = None
+        # The widget the journal was handed to through attach_journal().
+        self._attached_widget = None
+        self._record_bytes = 0
+        # The last snapshot written for a tool without attach_journal(), to tell when its state changed.
+        self._snapshot_payload = None
+
+    def show_entry(self, entry):
+        """Follows entry from now on, snapshotting it if it is not the one already followed."""
+        if entry is not self.entry:
+            self.detach()
+            self.entry = entry
+            self.snapshot()
+        widget = entry['widget']
+        # A hibernated entry comes back with a new widget, which needs the journal again.
+        if widget is not self._attached_widget and hasattr(widget, 'attach_journal'):
+            widget.attach_journal(self)
+            self._attached_widget = widget
+
+    def detach(self):
+        """Takes the journal away from the widget it was attached to, if that is still alive."""
+        widget, self._attached_widget = self._attached_widget, None
+        if widget is not None and self.entry is not None and self.entry['widget'] is widget:
+            widget.attach_journal(None)
+
+    def record(self, data):
+        """Appends an edit; once the edits grow past COMPACT_AFTER_BYTES, they are compacted into a snapshot."""
+        payload = encode_record(["edit", data])
+        self.writer.append(self.path, payload)
+        self._record_bytes += len(payload)
+        if self._record_bytes > COMPACT_AFTER_BYTES:
+            self.snapshot()
+
+    def snapshot(self):
+        """Replaces the journal with a snapshot of the entry's current state."""
+        entry = self.entry
+        if entry is None:
+            return
+        tool_id, title = entry['tool_id'], entry['title']
+        if tool_id is None:
+            state = {}  # The dashboard has nothing to save
+        elif entry['widget'] is not None:
+            state = journal_state(entry['widget'])
+        else:
+            # Restored and not shown yet, the state is plain data already: encoded on the writer thread.
+            saved_state = entry['state']
+            state = lambda: saved_state
+        self._record_bytes = 0
+
+        if not callable(state):
+            self._snapshot_payload = self._encode_snapshot(tool_id, title, state)
+            payload = self._snapshot_payload
+            self.writer.rewrite(self.path, lambda: payload)
+        else:
+            self._snapshot_payload = None
+            self.writer.rewrite(self.path, lambda: self._encode_snapshot(tool_id, title, state()))
+        # Edits recovered from an earlier journal, not made again until the entry is woken.
+        for data in entry['edits']:
+            self.writer.append(self.path, encode_record(["edit", data]))
+
+    def poll(self):
+        """Snapshots a tool without its own edit records if its state changed since the last snapshot."""
+        widget = self.entry['widget'] if self.entry is not None else None
+        if widget is None or self.entry['tool_id'] is None or hasattr(widget, 'attach_journal'):
+            return
+        state = journal_state(widget)
+        if state is None or callable(state):
+            return
+        payload = self._encode_snapshot(self.entry['tool_id'], self.entry['title'], state)
+        if payload != self._snapshot_payload:
+            self._snapshot_payload = payload
+            self.writer.rewrite(self.path, lambda: payload)
+
+    @staticmethod
+    def _encode_snapshot(tool_id, title, state):
+        try:
+            return encode_record(["snapshot", tool_id, title, state])
+        except (TypeError, ValueError):
+            # Not plain data, e.g. the live objects some tools hibernate with. The tool is reopened empty.
+            return encode_record(["snapshot", tool_id, title, None])
+
+
+def read_tab_journal(path):
+    """
+    Returns (tool_id, title, state, edits) from a tab journal, edits being
+    the data of its edit records, or None if it holds no snapshot.
+    """
+    records = [json.loads(payload) for payload in read_records(path)]
+    if not records or records[0][0] != "snapshot":
+        return None
+    _, tool_id, title, state = records[0]
+    return tool_id, title, state, [data for kind, data in records[1:] if kind == "edit"]
+
+
+def find_crashed_sessions(root):
+    """
+    Returns the journal directories under root whose session is no longer
+    running, oldest first, each with its lock now held by the caller.
+    """
+    if not os.path.isdir(root):
+        return []
+    sessions = []
+    for name in sorted(os.listdir(root)):
+        directory = os.path.join(root, name)
+        if not name.startswith(SESSION_DIR_PREFIX) or not os.path.isdir(directory):
+            continue
+        lock = QLockFile(os.path.join(directory, LOCK_FILE_NAME))
+        # Only a dead owner makes a lock stale, never its age: sessions run for days.
+        lock.setStaleLockTime(0)
+        if lock.tryLock(0):
+            sessions.append((directory, lock))
+    return sessions
+
+
+class SessionJournal(QObject):
+    """
+    The journals of this session's tabs, in a locked directory under root.
+    The TabManager opens one per tab (see TabManager.journal) and hands it
+    the entry each tab shows.
+    """
+    def __init__(self, root, parent=None):
+        super().__init__(parent)
+        self.root = root
+        # Named by start time, so crashed sessions are recovered in the order they ran.
+        self.directory = os.path.join(root, f"{SESSION_DIR_PREFIX}{time.time_ns()}-{os.getpid()}")
+        os.makedirs(self.directory, exist_ok=True)
+        self._lock = QLockFile(os.path.join(self.directory, LOCK_FILE_NAME))
+        self._lock.setStaleLockTime(0)
+        self._lock.tryLock(0)
+
+        self.writer = JournalWriter()
+        self.tab_journals = []
+        self._next_tab_number = 0
+
+        self._poll_timer = QTimer(self)
+        self._poll_timer.setInterval(POLL_INTERVAL_MS)
+        self._poll_timer.timeout.connect(self.poll)
+        self._poll_timer.start()
+
+    def open_tab(self):
+        """Returns a new TabJournal for a tab."""
+        path = os.path.join(self.directory, f"tab-{self._next_tab_number:06d}{TAB_JOURNAL_SUFFIX}")
+        self._next_tab_number += 1
+        tab_journal = TabJournal(self.writer, path)
+        self.tab_journals.append(tab_journal)
+        return tab_journal
+
+    def close_tab(self, tab_journal):
+        """Deletes the journal of a closed tab."""
+        tab_journal.detach()
+        self.tab_journals.remove(tab_journal)
+        self.writer.remove(tab_journal.path)
+
+    def poll(self):
+        for tab_journal in self.tab_journals:
+            try:
+                tab_journal.poll()
+            except Exception:
+                traceback.print_exc()
+
+    def flush(self):
+        """Writes the queued records without waiting for the end of the batch, e.g. after an error."""
+        self.writer.flush()
+
+    def close(self, keep_journals=False):
+        """
+        Ends the session. Its journals are deleted, there is nothing to
+        recover; with keep_journals, e.g. when the session could not be
+        saved, they are left for the next start to recover instead.
+        """
+        self._poll_timer.stop()
+        for tab_journal in self.tab_journals:
+            tab_journal.detach()
+        self.tab_journals.clear()
+        self.writer.close()
+        self._lock.unlock()
+        if not keep_journals:
+            shutil.rmtree(self.directory, ignore_errors=True)
+
+    def recover(self):
+        """
+        Returns the tabs of the sessions that crashed, in their order, as a
+        session for TabManager.restore_session().
+        """
+        recovered_tabs = []
+        for directory, lock in find_crashed_sessions(self.root):
+            for name in sorted(os.listdir(directory)):
+                if not name.endswith(TAB_JOURNAL_SUFFIX):
+                    continue
+                try:
+                    tab = read_tab_journal(os.path.join(directory, name))
+                except (OSError, ValueError):
+                    traceback.print_exc()
+                    continue
+                if tab is not None:
+                    recovered_tabs.append(tab)
+            # Deleted before any tool sees its state: a journal that crashes
+            # the application must not be replayed on every start. The tabs
+            # are journaled again by this session once reopened.
+            lock.unlock()
+            shutil.rmtree(directory, ignore_errors=True)
+
+        return {
+            "current_tab": len(recovered_tabs) - 1,
+            "tabs": [{"current_index": 0,
+                      "history": [{"tool_id": tool_id, "title": title, "state": state, "edits": edits}]}
+                     for tool_id, title, state, edits in recovered_tabs],
+        }
@@ -93,19 +93,27 @@ class SettingsDialog(QDialog):
         self.stacked_widget.addWidget(appearance_page)
 
     def create_general_page(self):
-        """Creates a placeholder content widget for the 'General' tab."""
+        """Creates the content widget for the 'General' tab."""
         general_page = QWidget()
-        layout = QVBoxLayout(general_page)
-        label = QLabel("General settings will go here.")
-        label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        layout.addWidget(label)
+        form_layout = QFormLayout(general_page)
+        form_layout.setRowWrapPolicy(QFormLayout.RowWrapPolicy.DontWrapRows)
+
+        # --- Undo History Setting ---
+        # Memory each editor view's undo history may use, read when an editor opens.
+        self.undo_history_spinbox = QSpinBox()
+        self.undo_history_spinbox.setRange(4, 4096)
+        self.undo_history_spinbox.setSuffix(" MB")
+        self.undo_history_spinbox.setValue(self.settings.value("undo_history_mb", 64, type=int))
+        form_layout.addRow(QLabel("Undo History Limit:"), self.undo_history_spinbox)
+
         self.stacked_widget.addWidget(general_page)
 
     def get_selected_settings(self):
-        """Returns the selected appearance settings from the dialog."""
+        """Returns the selected settings from the dialog."""
         return {
             "theme": self.theme_combo.currentText().lower(),
-            "font_size": self.font_size_spinbox.value()
+            "font_size": self.font_size_spinbox.value(),
+            "undo_history_mb": self.undo_history_spinbox.value(),
         }
 
     def accept(self):
@@ -115,5 +123,5 @@ class SettingsDialog(QDialog):
         selected = self.get_selected_settings()
         self.settings.setValue("theme", selected["theme"])
         self.settings.setValue("font_size", selected["font_size"])
-
-        # Update the style manager in
\ No newline at end of file
+        self.settings.setValue("undo_history_mb", selected["undo_history_mb"])
+        super().accept()
@@ -0,0 +1,147 @@
+# single_instance.py
+#
+# Keeps a single running Subtl window. The first instance listens on a local
+# socket (a named pipe on Windows, a Unix domain socket elsewhere); later
+# invocations forward their file and tool choice to it and exit right away.
+# Only QtCore and QtNetwork are imported, so forwarding stays fast: main.py
+# does it before loading any widget module.
+#
+# The message is one line of UTF-8 JSON: {"file": path or null, "tool": id or null}
+# The running instance answers "ok\n" once it accepted the request.
+# dev/launcher/launcher.py speaks the same protocol, keep them in sync.
+
+import os
+import json
+import getpass
+
+from PySide6.QtCore import QObject, Signal
+from PySide6.QtNetwork import QLocalServer, QLocalSocket
+
+ORGANIZATION_NAME = "Liiesl"
+APPLICATION_NAME = "Subtl"
+
+# How long a second invocation waits for the running instance to answer.
+FORWARD_TIMEOUT_MS = 1000
+
+ACKNOWLEDGEMENT = b"ok\n"
+
+
+def server_name():
+    """Returns the local socket name, one per user so accounts never share a window."""
+    try:
+        user = getpass.getuser()
+    except Exception:
+        user = "user"
+    return f"{ORGANIZATION_NAME}-{APPLICATION_NAME}-{user}"
+
+
+def parse_instance_arguments(argv):
+    """
+    Removes the single-instance options from argv.
+    Returns (tool_id or None, force_new_instance, remaining_argv).
+
+    --tool=ID         Open the file with this tool instead of asking
+    --new-instance    Start a separate window even if one is already running
+    """
+    tool_id = None
+    new_instance = False
+    remaining = []
+    for argument in argv:
+        if argument.startswith("--tool="):
+            tool_id = argument.split("=", 1)[1] or None
+        elif argument == "--new-instance":
+            new_instance = True
+        else:
+            remaining.append(argument)
+    return tool_id, new_instance, remaining
+
+
+def forward_to_running_instance(file_path=None, tool_id=None, timeout_ms=FORWARD_TIMEOUT_MS):
+    """
+    Sends a file (and optionally the tool to open it with) to the running
+    instance. Returns True if it accepted, False if none is running.
+    """
+    socket = QLocalSocket()
+    socket.connectToServer(server_name())
+    if not socket.waitForConnected(timeout_ms):
+        return False
+
+    if file_path:
+        file_path = os.path.abspath(file_path)
+    message = json.dumps({"file": file_path, "tool": tool_id}) + "\n"
+    socket.write(message.encode('utf-8'))
+    if not socket.waitForBytesWritten(timeout_ms):
+        return False
+
+    # Wait for the acknowledgement, so the request is never lost by exiting early.
+    accepted = socket.waitForReadyRead(timeout_ms) and bytes(socket.readAll().data()).startswith(ACKNOWLEDGEMENT)
+    socket.disconnectFromServer()
+    return accepted
+
+
+def instance_is_running(timeout_ms=FORWARD_TIMEOUT_MS):
+    """True if an instance answers on the local socket."""
+    socket = QLocalSocket()
+    socket.connectToServer(server_name())
+    if not socket.waitForConnected(timeout_ms):
+        return False
+    socket.abort()
+    return True
+
+
+class InstanceServer(QObject):
+    """
+    Listens for requests of later invocations and re-emits them as
+    open_requested(file_path, tool_id); either may be an empty string.
+    """
+    open_requested = Signal(str, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.server = QLocalServer(self)
+        self.server.newConnection.connect(self._on_new_connection)
+        # Incoming bytes per socket until a full line arrived.
+        self._buffers = {}
+
+    def listen(self):
+        """Starts listening. Returns False if another instance already owns the name."""
+        name = server_name()
+        if self.server.listen(name):
+            return True
+        # A crashed instance can leave its Unix socket file behind. Removing
+        # it is only safe if nobody answers on it: another instance may have
+        # started listening since this one checked, and removing its socket
+        # would cut it off from every later invocation.
+        if instance_is_running():
+            return False
+        QLocalServer.removeServer(name)
+        return self.server.listen(name)
+
+    def _on_new_connection(self):
+        while self.server.hasPendingConnections():
+            socket = self.server.nextPendingConnection()
+            self._buffers[socket] = b""
+            socket.readyRead.connect(self._on_ready_read)
+            socket.disconnected.connect(self._on_disconnected)
+
+    def _on_ready_read(self):
+        socket = self.sender()
+        self._buffers[socket] = self._buffers.get(socket, b"") + bytes(socket.readAll().data())
+        if b"\n" not in self._buffers[socket]:
+            return
+
+        line = self._buffers[socket].split(b"\n", 1)[0]
+        self._buffers[socket] = b""
+        try:
+            request = json.loads(line.decode('utf-8'))
+        except (UnicodeDecodeError, ValueError):
+            socket.disconnectFromServer()
+            return
+        socket.write(ACKNOWLEDGEMENT)
+        socket.flush()
+        self.open_requested.emit(request.get("file") or "", request.get("tool") or "")
+
+    def _on_disconnected(self):
+        socket = self.sender()
+        self._buffers.pop(socket, None)
+        socket.deleteLater()
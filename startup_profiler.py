@@ -0,0 +1,102 @@
+# startup_profiler.py
+#
+# Records a phase-by-phase timeline of the application's startup. It only
+# uses the standard library, so main.py can import it before PySide6 and
+# time the heavy imports too. When profiling is disabled every call is a no-op.
+
+import os
+import sys
+import json
+import time
+import platform
+from contextlib import contextmanager
+
+# Version of the JSON timeline format written by StartupProfiler.write().
+TIMELINE_FORMAT_VERSION = 1
+
+
+class StartupProfiler:
+    """
+    Collects named phases (with a duration) and marks (instants), in
+    milliseconds since the profiler was created, i.e. right after the
+    interpreter started running main.py.
+    """
+    def __init__(self):
+        self.enabled = False
+        self.origin = time.perf_counter()
+        # Wall clock time of the origin, lets a benchmark runner measure the
+        # interpreter startup that happened before it.
+        self.origin_epoch = time.time()
+        self.events = []
+        self._depth = 0
+
+    def enable(self):
+        self.enabled = True
+
+    def _now_ms(self):
+        return (time.perf_counter() - self.origin) * 1000.0
+
+    @contextmanager
+    def phase(self, name):
+        """Times the enclosed block as one phase of the timeline."""
+        if not self.enabled:
+            yield
+            return
+        event = {"name": name, "start_ms": self._now_ms(), "duration_ms": None, "depth": self._depth}
+        self.events.append(event)
+        self._depth += 1
+        try:
+            yield
+        finally:
+            self._depth -= 1
+            event["duration_ms"] = self._now_ms() - event["start_ms"]
+
+    def mark(self, name):
+        """Records an instant, e.g. the first paint of the main window."""
+        if self.enabled:
+            self.events.append({"name": name, "start_ms": self._now_ms(), "duration_ms": 0.0, "depth": self._depth})
+
+    def timeline(self):
+        """Returns the recorded timeline as a JSON-serializable dict."""
+        return {
+            "format_version": TIMELINE_FORMAT_VERSION,
+            "python": sys.version.split()[0],
+            "platform": platform.platform(),
+            "origin_epoch": self.origin_epoch,
+            "total_ms": self._now_ms(),
+            "events": list(self.events),
+        }
+
+    def write(self, path):
+        """Writes the timeline to a JSON file."""
+        directory = os.path.dirname(os.path.abspath(path))
+        os.makedirs(directory, exist_ok=True)
+        with open(path, 'w', encoding='utf-8') as f:
+            json.dump(self.timeline(), f, indent=2)
+
+
+def parse_profile_arguments(argv):
+    """
+    Removes the profiling options from argv.
+    Returns (timeline_path or None, exit_after_first_paint, remaining_argv).
+
+    --profile-startup[=PATH]  Write the startup timeline (default: startup_profile.json)
+    --profile-exit            Quit as soon as the first paint was recorded
+    """
+    timeline_path = None
+    exit_after_paint = False
+    remaining = []
+    for argument in argv:
+        if argument == "--profile-startup":
+            timeline_path = "startup_profile.json"
+        elif argument.startswith("--profile-startup="):
+            timeline_path = argument.split("=", 1)[1]
+        elif argument == "--profile-exit":
+            exit_after_paint = True
+        else:
+            remaining.append(argument)
+    return timeline_path, exit_after_paint, remaining
+
+
+# Create a single instance of the StartupProfiler.
+startup_profiler = StartupProfiler()
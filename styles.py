@@ -1,6 +1,15 @@
 # styles.py
 
 import os
+import hashlib
+
+# Prefix of the compiled stylesheet files in the cache directory.
+CACHE_FILE_PREFIX = "stylesheet-"
+
+# Version of the main stylesheet in StyleManager._compile_stylesheet, part of
+# the registry hash. Bump it with every change to that stylesheet, or cached
+# copies of the old one keep being used.
+STYLESHEET_TEMPLATE_VERSION = 1
 
 class StyleManager:
     """
@@ -12,8 +21,12 @@ class StyleManager:
     - accent_primary, accent_hover, accent_subtle_hover: Interactive element colors.
     - accent_close: Specific color for the close button's hover state.
     - border_color: Color for borders and separators.
+
+    Compiled stylesheets are memoized per (theme, font_size, registry hash), in
+    memory and, once a cache directory is set, on disk. The registry hash
+    changes whenever a template or theme changes, so stale entries are never used.
     """
-    def __init__(self, initial_theme='dark', initial_font_size=14):
+    def __init__(self, initial_theme='dark', initial_font_size=14, cache_dir=None):
         self.themes = {
             'dark': {
                 "bg_primary": "#1b1b1b",
@@ -57,6 +70,13 @@ class StyleManager:
         }
         self.current_theme = initial_theme
         self.font_size = int(initial_font_size)
+        self.cache_dir = cache_dir
+        self._stylesheet_cache = {}
+        self._registry_hash = None
+
+    def set_cache_dir(self, cache_dir):
+        """Sets the directory compiled stylesheets are persisted in, None disables it."""
+        self.cache_dir = cache_dir
 
     def set_style_properties(self, theme=None, font_size=None):
         """Sets the current theme and/or font size."""
@@ -69,20 +89,23 @@ class StyleManager:
         """Returns a list of available theme names."""
         return list(self.themes.keys())
 
-    def _get_tool_stylesheets(self, colors):
-        """
-        Loads tool-specific stylesheet templates from the static registry
-        and formats them with the current theme's colors.
-        """
+    def _get_style_templates(self):
+        """Returns the tool-specific stylesheet templates from the static registry."""
         try:
             from tools.style_registry import REGISTERED_STYLE_TEMPLATES
         except ImportError:
             print("Warning: 'style_registry.py' not found. Run build_registries.py.")
-            return ""
+            return {}
+        return REGISTERED_STYLE_TEMPLATES
 
+    def _get_tool_stylesheets(self, colors):
+        """
+        Loads tool-specific stylesheet templates from the static registry
+        and formats them with the current theme's colors.
+        """
         tool_styles = []
-        # REGISTERED_STYLE_TEMPLATES is {'tool_id': 'template_string', ...}
-        for tool_id, template in REGISTERED_STYLE_TEMPLATES.items():
+        # The templates are {'tool_id': 'template_string', ...}
+        for tool_id, template in self._get_style_templates().items():
             try:
                 # Fill the placeholders in the template with actual color values
                 formatted_style = template.format(**colors)
@@ -92,16 +115,78 @@ class StyleManager:
                 
         return "\n".join(tool_styles)
 
+    def get_registry_hash(self):
+        """
+        Returns a fingerprint of everything a compiled stylesheet is built from:
+        the tool templates, the themes and the main stylesheet. Computed once per run.
+        """
+        if self._registry_hash is None:
+            digest = hashlib.sha1()
+            for tool_id, template in sorted(self._get_style_templates().items()):
+                digest.update(f"{tool_id}\0{template}\0".encode('utf-8'))
+            digest.update(repr(sorted((name, sorted(colors.items())) for name, colors in self.themes.items())).encode('utf-8'))
+            # The main stylesheet is code, not data: it is identified by its version.
+            digest.update(f"main\0{STYLESHEET_TEMPLATE_VERSION}\0".encode('utf-8'))
+            self._registry_hash = digest.hexdigest()[:16]
+        return self._registry_hash
+
+    def _cache_file_path(self, key):
+        theme, font_size, registry_hash = key
+        return os.path.join(self.cache_dir, f"{CACHE_FILE_PREFIX}{theme}-{font_size}-{registry_hash}.qss")
+
+    def _read_cached_stylesheet(self, key):
+        """Returns the stylesheet persisted for key, or None."""
+        if not self.cache_dir:
+            return None
+        try:
+            with open(self._cache_file_path(key), 'r', encoding='utf-8') as f:
+                return f.read()
+        except OSError:
+            return None
+
+    def _write_cached_stylesheet(self, key, stylesheet):
+        """Persists a compiled stylesheet and removes the ones of older registry hashes."""
+        if not self.cache_dir:
+            return
+        path = self._cache_file_path(key)
+        try:
+            os.makedirs(self.cache_dir, exist_ok=True)
+            with open(path + '.part', 'w', encoding='utf-8') as f:
+                f.write(stylesheet)
+            os.replace(path + '.part', path)
+
+            registry_hash = key[2]
+            for name in os.listdir(self.cache_dir):
+                if name.startswith(CACHE_FILE_PREFIX) and not name.endswith(f"-{registry_hash}.qss"):
+                    os.remove(os.path.join(self.cache_dir, name))
+        except OSError as e:
+            # The cache is only an optimization, the stylesheet is still applied.
+            print(f"Warning: Could not write the stylesheet cache: {e}")
+
     def get_stylesheet(self):
-        """Returns the full stylesheet for the application based on the current style."""
-        colors = self.themes.get(self.current_theme, self.themes['dark'])
-        font_size = self.font_size
-        
+        """
+        Returns the full stylesheet for the application based on the current style.
+        Templates are only formatted when no cached copy exists for the style.
+        """
+        theme = self.current_theme if self.current_theme in self.themes else 'dark'
+        key = (theme, self.font_size, self.get_registry_hash())
+        stylesheet = self._stylesheet_cache.get(key)
+        if stylesheet is None:
+            stylesheet = self._read_cached_stylesheet(key)
+            if stylesheet is None:
+                stylesheet = self._compile_stylesheet(self.themes[theme], self.font_size)
+                self._write_cached_stylesheet(key, stylesheet)
+            self._stylesheet_cache[key] = stylesheet
+        return stylesheet
+
+    def _compile_stylesheet(self, colors, font_size):
+        """Formats the main stylesheet and every tool template for the given style."""
         # Add font_size to the colors dictionary for formatting, if needed in templates.
         # This makes the templates even more powerful.
         format_dict = colors.copy()
         format_dict['font_size'] = f"{font_size}px"
         
+        # Bump STYLESHEET_TEMPLATE_VERSION when changing this stylesheet.
         main_stylesheet = f"""
             /* --- Main Application Styles --- */
             CustomTitleBar, CustomTitleBar QTabBar {{
@@ -0,0 +1,214 @@
+# subtl.py
+#
+# USAGE: Run from the project's root directory:
+# > python subtl.py --list
+# > python subtl.py min_length "deliveries/**/*.srt" --min-length 1200 -o out/ -j 8
+# > python subtl.py subtitle_converter deliveries/ -r --to vtt -o web/
+#
+# Headless command line front-end. It discovers tools through the same static
+# manifest as the GUI and runs their batch entry points over files,
+# directories or glob patterns, spread over a pool of worker processes.
+# Only the module of the tool being run is imported and no QApplication is
+# ever created.
+
+import os
+import sys
+import glob
+import time
+import argparse
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from tools.tool_manifest import TOOL_MANIFEST, import_tool_module
+
+# Inputs a tool reads unless its TOOL_DEFINITION lists 'batch_input_extensions'.
+SUBTITLE_EXTENSIONS = ('.srt',)
+
+# Maps the option types used in TOOL_DEFINITION['batch_options'] to parsers.
+OPTION_TYPES = {"int": int, "float": float, "str": str}
+
+
+def load_batch_tools():
+    """
+    Returns {tool_id: definition} for every tool in the manifest that declares
+    a 'batch_function_name' in its TOOL_DEFINITION. Nothing is imported yet.
+    """
+    return {tool_id: entry for tool_id, entry in TOOL_MANIFEST.items() if 'batch_function_name' in entry}
+
+
+def load_batch_function(tool_id, definition):
+    """Imports the tool's module and returns its batch entry point, or None if it is missing."""
+    module = import_tool_module(tool_id)
+    batch_function = getattr(module, definition['batch_function_name'], None)
+    if batch_function is None:
+        print(f"Error: Tool '{tool_id}' names a missing batch function "
+              f"'{definition['batch_function_name']}'.", file=sys.stderr)
+    return batch_function
+
+
+def build_parser(batch_tools):
+    """Builds the argument parser, with one sub-command per batch-capable tool."""
+    parser = argparse.ArgumentParser(prog="subtl", description="Run Subtl tools in batch, without the GUI.")
+    parser.add_argument("--list", action="store_true", help="List the tools that can run in batch and exit.")
+    subparsers = parser.add_subparsers(dest="tool_id", metavar="TOOL")
+
+    for tool_id, definition in sorted(batch_tools.items()):
+        tool_parser = subparsers.add_parser(tool_id, help=definition.get('description', ''))
+        tool_parser.add_argument("inputs", nargs="+", metavar="INPUT",
+                                 help="Subtitle files, directories or glob patterns.")
+        tool_parser.add_argument("-o", "--output-dir", default=None,
+                                 help="Directory for the results (default: next to each input).")
+        tool_parser.add_argument("-j", "--workers", type=int, default=os.cpu_count() or 1,
+                                 help="Number of worker processes (default: CPU count).")
+        tool_parser.add_argument("-r", "--recursive", action="store_true",
+                                 help="Also search sub-directories of directory inputs.")
+        tool_parser.add_argument("--suffix", default=definition.get('batch_output_suffix', '_Subtl'),
+                                 help="Suffix added to output file names.")
+
+        for name, option in definition.get('batch_options', {}).items():
+            kwargs = {"dest": name, "type": OPTION_TYPES[option.get('type', 'str')],
+                      "default": option.get('default'), "help": option.get('help', '')}
+            if option.get('choices'):
+                kwargs["choices"] = option['choices']
+            if option.get('multiple'):
+                kwargs["action"] = "append"
+                kwargs["default"] = None
+            tool_parser.add_argument("--" + name.replace('_', '-'), **kwargs)
+    return parser
+
+
+def expand_inputs(patterns, recursive=False, extensions=SUBTITLE_EXTENSIONS):
+    """Expands files, directories and glob patterns into a de-duplicated list of subtitle files."""
+    found = {}
+    for pattern in patterns:
+        if os.path.isdir(pattern):
+            walk_pattern = os.path.join(pattern, '**', '*') if recursive else os.path.join(pattern, '*')
+            candidates = glob.glob(walk_pattern, recursive=recursive)
+        elif os.path.isfile(pattern):
+            candidates = [pattern]
+        else:
+            candidates = glob.glob(pattern, recursive=True)
+
+        for path in sorted(candidates):
+            if os.path.isfile(path) and path.lower().endswith(extensions):
+                found.setdefault(os.path.abspath(path), None)
+    return list(found)
+
+
+def companion_path(input_path, template):
+    """
+    The file a companion option names next to input_path, as the tools
+    resolve it. Companion options (flagged 'companion' in 'batch_options')
+    name more files next to each input, '{stem}' being the input's name.
+    """
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    return os.path.normpath(os.path.join(os.path.dirname(input_path), template.format(stem=stem)))
+
+
+def drop_companion_inputs(inputs, templates):
+    """
+    Removes the inputs that are companions of another input. A directory
+    input holds the secondary files next to the main ones; run as inputs of
+    their own, they would look for companions of their own that do not exist.
+    """
+    companions = set()
+    for path in inputs:
+        for template in templates:
+            companion = companion_path(path, template)
+            if companion != path:
+                companions.add(companion)
+    return [path for path in inputs if path not in companions]
+
+
+def output_path_for(input_path, output_dir, input_root, suffix, extension=None):
+    """
+    Builds the output path of an input file. Inside output_dir the directory
+    layout below input_root is mirrored, so equally named files never collide.
+    The input's extension is kept unless another one is given.
+    """
+    directory = os.path.dirname(input_path)
+    if output_dir:
+        directory = os.path.join(output_dir, os.path.relpath(directory, input_root))
+    base_name, input_extension = os.path.splitext(os.path.basename(input_path))
+    extension = extension or input_extension
+    return os.path.join(directory, f"{base_name}{suffix}{extension}")
+
+
+def run_batch(batch_function, jobs, options, workers):
+    """
+    Runs batch_function(input_path, output_path, **options) for every job.
+    Yields (input_path, result, error) as the jobs complete.
+    """
+    if workers <= 1 or len(jobs) <= 1:
+        # Not worth spawning processes, run in this interpreter.
+        for input_path, output_path in jobs:
+            try:
+                yield input_path, batch_function(input_path, output_path, **options), None
+            except Exception as e:
+                yield input_path, None, e
+        return
+
+    with ProcessPoolExecutor(max_workers=workers) as executor:
+        futures = {executor.submit(batch_function, input_path, output_path, **options): input_path
+                   for input_path, output_path in jobs}
+        for future in as_completed(futures):
+            try:
+                yield futures[future], future.result(), None
+            except Exception as e:
+                yield futures[future], None, e
+
+
+def main(argv=None):
+    batch_tools = load_batch_tools()
+    parser = build_parser(batch_tools)
+    args = parser.parse_args(argv)
+
+    if args.list or not args.tool_id:
+        for tool_id, definition in sorted(batch_tools.items()):
+            print(f"{tool_id:<20} {definition.get('description', '')}")
+        return 0
+
+    definition = batch_tools[args.tool_id]
+    batch_function = load_batch_function(args.tool_id, definition)
+    if batch_function is None:
+        return 1
+    options = {name: getattr(args, name) for name in definition.get('batch_options', {})}
+    for name, option in definition.get('batch_options', {}).items():
+        if option.get('multiple') and options[name] is None:
+            options[name] = list(option.get('default') or [])
+
+    extensions = tuple(definition.get('batch_input_extensions', SUBTITLE_EXTENSIONS))
+    inputs = expand_inputs(args.inputs, args.recursive, extensions)
+    companion_templates = [template for name, option in definition.get('batch_options', {}).items()
+                           if option.get('companion') for template in options[name]]
+    inputs = drop_companion_inputs(inputs, companion_templates)
+    if not inputs:
+        print("No subtitle files matched the given inputs.", file=sys.stderr)
+        return 1
+
+    input_root = os.path.commonpath([os.path.dirname(path) for path in inputs])
+    # Tools that change the format name the option holding the output extension.
+    extension_option = definition.get('batch_output_extension_option')
+    extension = f".{options[extension_option]}" if extension_option else None
+    jobs = [(path, output_path_for(path, args.output_dir, input_root, args.suffix, extension)) for path in inputs]
+    for output_dir in {os.path.dirname(output_path) for _, output_path in jobs}:
+        os.makedirs(output_dir, exist_ok=True)
+
+    failures = 0
+    cue_count = 0
+    started = time.perf_counter()
+    for input_path, result, error in run_batch(batch_function, jobs, options, args.workers):
+        if error is None:
+            cue_count += result
+            print(f"OK    {input_path} ({result} cues)")
+        else:
+            failures += 1
+            print(f"FAIL  {input_path}: {error}", file=sys.stderr)
+
+    elapsed = max(time.perf_counter() - started, 1e-6)
+    print(f"\n{len(jobs) - failures} of {len(jobs)} files processed, "
+          f"{cue_count} cues in {elapsed:.2f} s ({cue_count / elapsed:,.0f} cues/s).")
+    return 1 if failures else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,69 @@
+# tests/test_cli.py
+#
+# Tests of the subtl command line: input expansion and a directory merge
+# whose secondary files sit next to the main ones.
+# Run from the project root with: python -m pytest tests
+
+import os
+
+import subtl
+from tools.tool_manifest import TOOL_MANIFEST
+
+
+def write_srt(path, text):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(f"1\n00:00:01,000 --> 00:00:02,000\n{text}\n")
+
+
+def make_episodes(directory):
+    for name in ("a", "b"):
+        write_srt(os.path.join(directory, f"{name}.srt"), f"Hello {name}")
+        write_srt(os.path.join(directory, f"{name}.fr.srt"), f"Bonjour {name}")
+
+
+def test_expand_inputs_deduplicates_and_filters_extensions(tmp_path):
+    make_episodes(tmp_path)
+    (tmp_path / "notes.txt").write_text("not a subtitle")
+    sub_directory = tmp_path / "season2"
+    sub_directory.mkdir()
+    write_srt(sub_directory / "c.srt", "Hello c")
+
+    inputs = subtl.expand_inputs([str(tmp_path), str(tmp_path / "a.srt"), str(tmp_path / "*.srt")])
+    assert [os.path.basename(path) for path in inputs] == ["a.fr.srt", "a.srt", "b.fr.srt", "b.srt"]
+
+    recursive = subtl.expand_inputs([str(tmp_path)], recursive=True)
+    assert str(sub_directory / "c.srt") in recursive
+
+
+def test_companion_files_are_dropped_from_the_inputs(tmp_path):
+    make_episodes(tmp_path)
+    inputs = subtl.expand_inputs([str(tmp_path)])
+    kept = subtl.drop_companion_inputs(inputs, ["{stem}.fr.srt"])
+    assert [os.path.basename(path) for path in kept] == ["a.srt", "b.srt"]
+    # A template naming the input itself never drops it.
+    assert subtl.drop_companion_inputs(inputs, ["{stem}.srt"]) == inputs
+
+
+def test_directory_merge_with_secondary_files(tmp_path, capsys):
+    make_episodes(tmp_path)
+    output_dir = tmp_path / "out"
+
+    exit_code = subtl.main(["merge", str(tmp_path), "--secondary", "{stem}.fr.srt",
+                            "-o", str(output_dir), "-j", "1"])
+
+    assert exit_code == 0, capsys.readouterr().err
+    suffix = TOOL_MANIFEST['merge']['batch_output_suffix']
+    assert sorted(os.listdir(output_dir)) == [f"a{suffix}.srt", f"b{suffix}.srt"]
+    merged = (output_dir / f"a{suffix}.srt").read_text(encoding='utf-8-sig')
+    assert "Hello a" in merged and "Bonjour a" in merged
+
+
+def test_directory_multilingual_merge_with_tracks(tmp_path, capsys):
+    make_episodes(tmp_path)
+    output_dir = tmp_path / "out"
+
+    exit_code = subtl.main(["multilingual_merge", str(tmp_path), "--track", "{stem}.fr.srt",
+                            "-o", str(output_dir), "-j", "1"])
+
+    assert exit_code == 0, capsys.readouterr().err
+    assert len(os.listdir(output_dir)) == 2
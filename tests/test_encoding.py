@@ -0,0 +1,40 @@
+# tests/test_encoding.py
+#
+# Regression tests for the legacy encoding detection in core/encoding.py.
+# Run from the project root with: python -m pytest tests
+
+import pytest
+
+from core.encoding import detect_encoding
+
+# Short Western European lines. Pairs of their accented cp1252 bytes are
+# valid GB18030 characters, which once made them detect as Chinese.
+LATIN_SAMPLES = [
+    "...Mädchen für Größe, schön",
+    "Straße",
+    "Über Äpfel und Öl, süß. Grüße!",
+    "Ça a été très agréable, où est le garçon ?",
+    "Nous étions là-bas, près de l'hôtel, à côté du théâtre.",
+    "Déjà vu",
+]
+
+CHINESE_SAMPLES = [
+    "你好，世界！今天天气很好。",
+    "我们走吧",
+    "<i>我在用Python写代码</i>",
+]
+
+
+def as_subtitle(line):
+    return f"1\n00:00:01,000 --> 00:00:02,500\n{line}\n"
+
+
+@pytest.mark.parametrize("text", LATIN_SAMPLES)
+def test_short_latin_text_is_cp1252(text):
+    assert detect_encoding(text.encode('cp1252')).encoding == 'cp1252'
+    assert detect_encoding(as_subtitle(text).encode('cp1252')).encoding == 'cp1252'
+
+
+@pytest.mark.parametrize("text", CHINESE_SAMPLES)
+def test_chinese_text_is_gb18030(text):
+    assert detect_encoding(as_subtitle(text).encode('gb18030')).encoding == 'gb18030'
@@ -0,0 +1,82 @@
+# tests/test_journal.py
+#
+# Tests of the crash journals: record framing and torn records in
+# core/journal.py, and reading a tab journal back in session_journal.py.
+# Run from the project root with: python -m pytest tests
+
+from core.journal import MAGIC, JournalWriter, frame_record, read_records
+from session_journal import encode_record, read_tab_journal
+
+
+def write_journal(path, payloads, tail=b''):
+    path.write_bytes(MAGIC + b''.join(frame_record(payload) for payload in payloads) + tail)
+
+
+def test_records_are_read_back_in_order(tmp_path):
+    path = tmp_path / "tab.journal"
+    write_journal(path, [b"first", b"", b"third"])
+    assert read_records(path) == [b"first", b"", b"third"]
+
+
+def test_reading_stops_at_a_torn_record(tmp_path):
+    path = tmp_path / "tab.journal"
+    # Cut off in the middle of the header, then in the middle of the payload.
+    for cut in (3, 10):
+        write_journal(path, [b"kept"], tail=frame_record(b"lost in the crash")[:cut])
+        assert read_records(path) == [b"kept"]
+
+
+def test_reading_stops_at_a_record_failing_its_checksum(tmp_path):
+    path = tmp_path / "tab.journal"
+    write_journal(path, [b"kept", b"corrupt", b"after"])
+    data = bytearray(path.read_bytes())
+    data[data.index(b"corrupt")] ^= 0xFF
+    path.write_bytes(bytes(data))
+    assert read_records(path) == [b"kept"]
+
+
+def test_file_without_magic_holds_no_records(tmp_path):
+    path = tmp_path / "tab.journal"
+    path.write_bytes(frame_record(b"payload"))
+    assert read_records(path) == []
+
+
+def test_writer_appends_rewrites_and_removes(tmp_path):
+    path = str(tmp_path / "tab.journal")
+    writer = JournalWriter(flush_interval=0)
+    try:
+        writer.append(path, b"one")
+        writer.append(path, b"two")
+        writer.flush(wait=True)
+        assert read_records(path) == [b"one", b"two"]
+
+        # A rewrite drops the records before it, appends go on after it.
+        writer.rewrite(path, lambda: b"snapshot")
+        writer.append(path, b"three")
+        writer.flush(wait=True)
+        assert read_records(path) == [b"snapshot", b"three"]
+
+        writer.remove(path)
+        writer.flush(wait=True)
+        assert not (tmp_path / "tab.journal").exists()
+    finally:
+        writer.close()
+
+
+def test_tab_journal_recovers_the_snapshot_and_its_edits(tmp_path):
+    path = tmp_path / "tab.journal"
+    state = {"text": "1\n00:00:01,000 --> 00:00:02,000\nHéllo\n"}
+    write_journal(path, [encode_record(["snapshot", "srt_editor", "a.srt", state]),
+                         encode_record(["edit", [0, 1, "x"]]),
+                         encode_record(["edit", [2, 0, "y"]])],
+                  tail=frame_record(encode_record(["edit", [5, 0, "z"]]))[:-1])
+    assert read_tab_journal(path) == ("srt_editor", "a.srt", state, [[0, 1, "x"], [2, 0, "y"]])
+
+
+def test_tab_journal_without_a_snapshot_is_not_recovered(tmp_path):
+    path = tmp_path / "tab.journal"
+    write_journal(path, [encode_record(["edit", [0, 1, "x"]])])
+    assert read_tab_journal(path) is None
+    # Torn inside the snapshot itself.
+    write_journal(path, [], tail=frame_record(encode_record(["snapshot", None, "Dashboard", {}]))[:-2])
+    assert read_tab_journal(path) is None
@@ -0,0 +1,118 @@
+# tests/test_piece_table.py
+#
+# Tests of the SRT Editor's text storage and undo: edits, undo and redo on
+# core/piece_table.py, and the steps kept by core/edit_history.py.
+# Run from the project root with: python -m pytest tests
+
+import random
+import re
+
+import pytest
+
+from core.edit_history import EditHistory
+from core.piece_table import Piece, PieceTable, merge_splices, redo_edits, undo_edits
+
+ORIGINAL = "1\n00:00:01,000 --> 00:00:02,000\nHello world\n\n2\n00:00:03,000 --> 00:00:04,000\nBye\n"
+
+
+def random_replace(rng, table):
+    position = rng.randrange(len(table) + 1)
+    length = rng.randrange(min(len(table) - position, 8) + 1)
+    text = rng.choice(["", "x", "new text", "é\n"])
+    return position, length, text
+
+
+@pytest.mark.parametrize("seed", range(5))
+def test_edits_match_a_string_and_undo_back_to_the_original(seed):
+    rng = random.Random(seed)
+    # A small block size makes the edits cross and rebalance blocks.
+    table = PieceTable(ORIGINAL)
+    table.BLOCK_SIZE = 4
+    expected = ORIGINAL
+    texts = [expected]
+    splices = []
+    for _ in range(300):
+        position, length, text = random_replace(rng, table)
+        splices.append(table.replace(position, length, text))
+        expected = expected[:position] + text + expected[position + length:]
+        texts.append(expected)
+        assert len(table) == len(expected)
+    assert table.text() == expected
+    middle = len(expected) // 2
+    assert table.substring(middle // 2, middle) == expected[middle // 2:middle // 2 + middle]
+
+    for splice, text in zip(reversed(splices), reversed(texts[:-1])):
+        table.apply_edits(undo_edits([splice]))
+        assert table.text() == text
+    for splice, text in zip(splices, texts[1:]):
+        table.apply_edits(redo_edits([splice]))
+        assert table.text() == text
+
+
+def test_simultaneous_edits_are_undone_and_redone_in_one_pass():
+    table = PieceTable(ORIGINAL)
+    # From the last position to the first, as a replace-all makes them.
+    positions = [match.start() for match in re.finditer("00", ORIGINAL)]
+    edits = [(position, 2, [Piece("XYZ", 0, 3)]) for position in reversed(positions)]
+    splices = table.apply_edits(edits)
+    replaced = ORIGINAL.replace("00", "XYZ")
+    assert table.text() == replaced
+
+    table.apply_edits(undo_edits(splices))
+    assert table.text() == ORIGINAL
+    table.apply_edits(redo_edits(splices))
+    assert table.text() == replaced
+
+
+def test_undo_leaves_no_split_pieces_behind():
+    table = PieceTable(ORIGINAL)
+    splice = table.replace(5, 3, "abc")
+    table.apply_edits(undo_edits([splice]))
+    assert table.pieces(0, len(table)) == [Piece(ORIGINAL, 0, len(ORIGINAL))]
+
+
+def test_typing_and_backspace_merge_into_one_splice():
+    table = PieceTable("ab")
+    first = table.replace(1, 0, "x")
+    second = table.replace(2, 0, "y")
+    typed = merge_splices(first, second)
+    assert table.text() == "axyb" and typed is not None
+
+    deleted = merge_splices(table.replace(2, 1, ""), table.replace(1, 1, ""))
+    assert table.text() == "ab" and deleted is not None
+    table.apply_edits(undo_edits([deleted]))
+    assert table.text() == "axyb"
+    # Not next to each other: two separate steps.
+    assert merge_splices(table.replace(0, 0, "1"), table.replace(3, 0, "2")) is None
+
+
+def test_history_groups_merges_and_drops_the_redo_stack():
+    history = EditHistory()
+    with history.group():
+        history.record("a", 1)
+        with history.group():
+            history.record("b", 1)
+    history.record("c", 1, merge=lambda last, edit: last + edit)
+    history.record("d", 1, merge=lambda last, edit: last + edit)
+    assert len(history) == 2
+
+    assert history.undo() == ["cd"]
+    assert history.undo() == ["a", "b"]
+    assert history.undo() is None
+    assert history.redo() == ["a", "b"]
+    assert history.can_redo()
+
+    history.record("e", 1, merge=lambda last, edit: last + edit)
+    assert not history.can_redo()
+    assert history.undo() == ["e"]
+    assert history.size == 3
+
+
+def test_history_forgets_the_oldest_steps_but_keeps_the_latest():
+    history = EditHistory(max_bytes=10)
+    for edit in "abc":
+        history.record(edit, 4)
+    assert len(history) == 2 and history.size == 8
+    history.record("huge", 100)
+    assert len(history) == 1
+    assert history.undo() == ["huge"]
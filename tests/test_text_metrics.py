@@ -0,0 +1,55 @@
+# tests/test_text_metrics.py
+#
+# Tests of the line breaking in core/text_metrics.py on CJK text, where
+# kinsoku rules decide which breaks between two characters are allowed.
+# Run from the project root with: python -m pytest tests
+
+import pytest
+
+from core.text_metrics import (
+    CELL_METRICS, NO_BREAK_AFTER, NO_BREAK_BEFORE, balanced_break, break_opportunities
+)
+
+CJK_LINES = [
+    "人々が集まった日々の暮らし",
+    "今日は〜楽しい一日でした",
+    "ｗｗ［注］ですね",
+    "「ありがとう」と彼は言った。",
+    "コンピューターを使う",
+    "我在用Python写代码，好吗？",
+]
+
+
+def widths(text, cut):
+    advances = CELL_METRICS.advances(text)
+    return sum(advances[:cut[0]]), sum(advances[cut[1]:])
+
+
+@pytest.mark.parametrize("text", CJK_LINES)
+def test_breaks_follow_kinsoku_rules(text):
+    for cut_start, cut_end in break_opportunities(text):
+        assert text[cut_end] not in NO_BREAK_BEFORE
+        assert text[cut_start - 1] not in NO_BREAK_AFTER
+
+
+@pytest.mark.parametrize("text", CJK_LINES)
+def test_balanced_break_is_the_most_balanced_allowed_break(text):
+    cut = balanced_break(text)
+    best = min(max(widths(text, other)) for other in break_opportunities(text))
+    assert max(widths(text, cut)) == best
+
+
+@pytest.mark.parametrize("text, parts", [
+    # The middle falls before a wave dash or inside brackets, the nearest
+    # allowed break is taken instead.
+    ("今日は〜楽しい", ("今日は〜", "楽しい")),
+    ("ｗｗ［注］です", ("ｗｗ", "［注］です")),
+])
+def test_balanced_break_falls_back_to_the_nearest_allowed_break(text, parts):
+    cut = balanced_break(text)
+    assert (text[:cut[0]], text[cut[1]:]) == parts
+
+
+@pytest.mark.parametrize("text", ["ーーー…", "山々"])
+def test_line_without_allowed_break_is_not_broken(text):
+    assert balanced_break(text) is None
@@ -0,0 +1,75 @@
+# tool_jobs.py
+#
+# The job plumbing shared by the tool widgets. A tool runs its action on the
+# job pool (see jobs.py) through ToolJobMixin, which disables the buttons
+# that start it until the job ends, reports the outcome in a message box and
+# keeps the tool from hibernating in the middle of it.
+
+import time
+
+from PySide6.QtWidgets import QMessageBox
+
+from jobs import job_manager
+
+
+class ToolJobMixin:
+    """
+    Runs a tool's action on the job pool, one at a time. Mixed into a tool
+    widget ahead of QWidget:
+
+        class MinLengthTool(ToolJobMixin, QWidget):
+            JOB_TITLE = "Minimum Length"
+            JOB_BUTTONS = ("apply_button",)
+
+    JOB_TITLE names the job in the jobs indicator, JOB_BUTTONS the widget
+    attributes disabled while it runs. Tools implement _tool_state() instead
+    of save_state(), the mixin saves no state while a job is running.
+    """
+    JOB_TITLE = "Tool"
+    JOB_BUTTONS = ("apply_button",)
+
+    _job = None
+    _job_output_path = None
+    _job_started_at = 0.0
+
+    def save_state(self):
+        """
+        Returns the tool's inputs (see _tool_state()) so the TabManager can
+        dispose of the widget and recreate it later, or None while a job is running.
+        """
+        if self._job is not None:
+            return None
+        return self._tool_state()
+
+    def _tool_state(self):
+        """The tool's inputs as plain data, accepted by restore_state()."""
+        return {}
+
+    def _start_job(self, output_path, func, *args):
+        """Runs func(*args) on the job pool, saving to output_path. Returns the job."""
+        self._set_job_buttons_enabled(False)
+        self._job_output_path = output_path
+        self._job_started_at = time.perf_counter()
+        self._job = job_manager.submit(self.JOB_TITLE, func, *args)
+        self._job.signals.finished.connect(self._on_job_finished)
+        self._job.signals.failed.connect(self._on_job_failed)
+        self._job.signals.done.connect(self._on_job_done)
+        return self._job
+
+    def _job_success_message(self, result):
+        """The message shown when a job finished with result, the processing function's return value."""
+        return f"File saved successfully to {self._job_output_path}"
+
+    def _on_job_finished(self, result):
+        QMessageBox.information(self, "Success", self._job_success_message(result))
+
+    def _on_job_failed(self, message):
+        QMessageBox.critical(self, "Error", f"An error occurred: {message}")
+
+    def _on_job_done(self):
+        self._job = None
+        self._set_job_buttons_enabled(True)
+
+    def _set_job_buttons_enabled(self, enabled):
+        for name in self.JOB_BUTTONS:
+            getattr(self, name).setEnabled(enabled)
@@ -1,22 +1,167 @@
 # tools/max_length/max_length_tool.py
 
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+import os
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QPushButton, QSpinBox,
+    QComboBox, QFileDialog, QMessageBox, QHBoxLayout, QFormLayout
+)
 from PySide6.QtCore import Qt
 
+from core.cue_store import CueStore
+from core.timing import retime, TIME_UNITS_MS
+from tool_jobs import ToolJobMixin
+
 # Self-definition for the Max Length tool
 TOOL_DEFINITION = {
     "display_name": "📏 Maximum Length",
     "description": "Adjust the maximum display time of subtitles.",
-    "widget_class_name": "MaxLengthTool"
+    "widget_class_name": "MaxLengthTool",
+    "can_open_file": True,
+    # Headless entry point used by the subtl command line (see subtl.py)
+    "batch_function_name": "apply_max_length_to_file",
+    "batch_output_suffix": "_Subtl_MaxLength",
+    "batch_options": {
+        "max_length": {"type": "int", "default": 7, "help": "Maximum display time of a subtitle."},
+        "unit": {"type": "str", "default": "s", "choices": ["ms", "s", "m"], "help": "Unit of --max-length."},
+        "min_gap": {"type": "int", "default": None, "help": "Also keep cues at least this many ms apart."},
+    },
 }
 
-class MaxLengthTool(QWidget):
-    """A generic placeholder widget for an unimplemented tool."""
+def apply_max_length_to_file(input_path, output_path, max_length=7, unit="s", min_gap=None, progress=None):
+    """
+    Shortens the cues of an SRT file to the maximum length and writes the
+    result to output_path; see core.timing.retime() for how min_gap is
+    resolved with it. Needs no Qt application, so it can run in batch
+    worker processes.
+    """
+    store = CueStore.from_file(input_path, progress=progress)
+    retime(store, max_duration_ms=max_length * TIME_UNITS_MS[unit], min_gap_ms=min_gap)
+    store.write(output_path, encoding='utf-8')
+    return len(store)
+
+class MaxLengthTool(ToolJobMixin, QWidget):
+    """
+    UI widget for the Maximum Length tool.
+    """
+    JOB_TITLE = "Maximum Length"
+
     def __init__(self):
         super().__init__()
+        self.input_file_path = None
+
+        # Add a property to identify this as a tool widget for styling
         self.setProperty("class", "tool-widget")
+
         layout = QVBoxLayout(self)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        label = QLabel(f"{TOOL_DEFINITION['display_name']} - Placeholder")
-        label.setObjectName("placeholder_label")
-        layout.addWidget(label)
\ No newline at end of file
+        layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+
+        # File selection
+        file_select_button = QPushButton("Select SRT File")
+        file_select_button.clicked.connect(self.select_file)
+        self.file_path_label = QLabel("No file selected.")
+        self.file_path_label.setWordWrap(True)
+        # Set an object name for specific styling
+        self.file_path_label.setObjectName("file_path_label")
+        description_label = QLabel(TOOL_DEFINITION["description"])
+        max_length_layout = QHBoxLayout()
+        self.max_length_input = QSpinBox()
+        self.max_length_input.setRange(1, 10000)
+        self.max_length_input.setValue(7)
+
+        self.time_unit_combo = QComboBox()
+        self.time_unit_combo.addItems(["Milliseconds", "Seconds", "Minutes"])
+        self.time_unit_combo.setCurrentIndex(1)
+
+        max_length_layout.addWidget(self.max_length_input)
+        max_length_layout.addWidget(self.time_unit_combo)
+
+        # Optional rule resolved together with the maximum length
+        rules_layout = QFormLayout()
+        self.min_gap_input = QSpinBox()
+        self.min_gap_input.setRange(-1, 5000)
+        self.min_gap_input.setSuffix(" ms")
+        self.min_gap_input.setSpecialValueText("Off")  # Shown for -1
+        self.min_gap_input.setValue(-1)
+        rules_layout.addRow("Minimum gap:", self.min_gap_input)
+
+        # Apply button
+        self.apply_button = QPushButton("Apply and Save As...")
+        self.apply_button.clicked.connect(self.apply_max_length)
+
+        # Add widgets to layout
+        layout.addWidget(file_select_button)
+        layout.addWidget(self.file_path_label)
+        layout.addSpacing(20)
+        layout.addWidget(description_label)
+        layout.addLayout(max_length_layout)
+        layout.addLayout(rules_layout)
+        layout.addSpacing(20)
+        layout.addWidget(self.apply_button)
+
+    def select_file(self):
+        """
+        Open a file dialog to select an SRT file.
+        """
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open SRT File", "", "SubRip Files (*.srt)")
+        if file_path:
+            self.load_file(file_path)
+
+    def load_file_on_startup(self, file_path: str):
+        """
+        Loads a file when the tool is opened directly with a file.
+        This method is called by the TabManager.
+        """
+        if os.path.exists(file_path) and file_path.endswith('.srt'):
+            self.load_file(file_path)
+        else:
+            self.file_path_label.setText(f"Error: Invalid or non-existent file provided.")
+
+    def load_file(self, file_path):
+        """
+        A central method to handle the logic of loading a file into the tool.
+        """
+        self.input_file_path = file_path
+        self.file_path_label.setText(f"Selected: {file_path}")
+
+    def apply_max_length(self):
+        """
+        Apply the maximum length to the selected SRT file and save it.
+        The suggested save name is based on the original name and the applied settings.
+        """
+        if not self.input_file_path:
+            QMessageBox.warning(self, "Warning", "Please select an SRT file first.")
+            return
+
+        max_length_val = self.max_length_input.value()
+        unit_abbr = list(TIME_UNITS_MS)[self.time_unit_combo.currentIndex()]
+        min_gap = self.min_gap_input.value() if self.min_gap_input.value() >= 0 else None
+
+        try:
+            directory = os.path.dirname(self.input_file_path)
+            file_name, file_ext = os.path.splitext(os.path.basename(self.input_file_path))
+            default_save_path = os.path.join(directory, f"{file_name}_max{max_length_val}{unit_abbr}{file_ext}")
+
+            output_file_path, _ = QFileDialog.getSaveFileName(self, "Save SRT File As...", default_save_path, "SubRip Files (*.srt)")
+
+            if output_file_path:
+                self._start_job(output_file_path, apply_max_length_to_file, self.input_file_path, output_file_path,
+                                max_length_val, unit_abbr, min_gap)
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"An error occurred: {e}")
+
+    def _tool_state(self):
+        return {
+            "input_file_path": self.input_file_path,
+            "max_length": self.max_length_input.value(),
+            "unit_index": self.time_unit_combo.currentIndex(),
+            "min_gap": self.min_gap_input.value(),
+        }
+
+    def restore_state(self, state):
+        """Restores the inputs returned by save_state() on a freshly created widget."""
+        if state.get("input_file_path"):
+            self.load_file(state["input_file_path"])
+        self.max_length_input.setValue(state.get("max_length", 7))
+        self.time_unit_combo.setCurrentIndex(state.get("unit_index", 1))
+        self.min_gap_input.setValue(state.get("min_gap", -1))
@@ -1,16 +1,22 @@
 # tools/max_length/styles.py
 
-# A theme-agnostic template for the Merge tool's stylesheet.
+# A theme-agnostic template for the Max Length tool's stylesheet.
 # The placeholders like {bg_primary}, {text_primary}, etc., will be
 # filled in by the StyleManager at runtime with the current theme's colors.
 
 STYLE_TEMPLATE = """
-    /* --- Styles for MaxLengthTool Placeholder --- */
+    /* --- Styles for MaxLengthTool --- */
 
-    MaxLengthTool #placeholder_label {{
-        font-size: 18px;
-        qproperty-alignment: 'AlignCenter';
-        font-weight: bold;
+    /* Style the file path label to be smaller and italic */
+    MaxLengthTool #file_path_label {{
+        font-size: 13px;
+        font-style: italic;
         color: {colors["text_primary"]};
+        padding: 5px 10px;
+    }}
+
+    /* Make the buttons in the tool have a bold font */
+    MaxLengthTool QPushButton {{
+        font-weight: bold;
     }}
-"""
\ No newline at end of file
+"""
@@ -1,6 +1,7 @@
 import os
 import re
-from datetime import timedelta
+from array import array
+from bisect import bisect_right
 
 from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushButton,
                                QFileDialog, QMessageBox, QLineEdit, QStackedWidget, QFrame,
@@ -8,19 +9,143 @@ from PySide6.QtWidgets import (QWidget, QVBoxLayout, QLabel, QHBoxLayout, QPushB
 from PySide6.QtGui import QColor, QPixmap, QIcon
 from PySide6.QtCore import Qt, Signal
 
+from core.overlap import IntervalIndex
+from core.cue_store import CueStore
+from core.srt_stream import Cue, iter_file_cues, write_srt
+from core.progress import step_progress
+from tool_jobs import ToolJobMixin
+
 # Self-definition for the Merge Lines tool
 TOOL_DEFINITION = {
     "display_name": "🔗 Merge Lines",
     "description": "Combine multiple subtitle lines into one.",
-    "widget_class_name": "MergeTool"
+    "widget_class_name": "MergeTool",
+    # Headless entry point used by the subtl command line (see subtl.py)
+    "batch_function_name": "merge_subtitle_files",
+    "batch_output_suffix": "_Subtl_Merged",
+    "batch_options": {
+        "mode": {"type": "str", "default": "stacked", "choices": ["glue", "stacked"], "help": "Merge mode."},
+        "secondary": {"type": "str", "multiple": True, "default": [], "companion": True,
+                      "help": "Secondary file next to each input, '{stem}' is replaced by the input's name "
+                              "(e.g. '{stem}.fr.srt'). Repeat for several files."},
+        "color": {"type": "str", "default": None, "help": "Hex color for stacked secondary lines."},
+        "base_length": {"type": "str", "multiple": True, "default": [],
+                        "help": "Video length of a glued part as hh:mm:ss, repeat for the parts in order. "
+                                "Parts without one use their last end time."},
+    },
 }
 
-class MergeTool(QWidget):
+# --- Merge Backend ---
+# These functions need no Qt application, so they also run in batch workers.
+
+def parse_base_length(base_length_str):
+    """Parses an 'hh:mm:ss' length into milliseconds, or returns None if malformed."""
+    if not re.match(r'^\d{2}:\d{2}:\d{2}$', base_length_str):
+        return None
+    h, m, s = map(int, base_length_str.split(':'))
+    return ((h * 60 + m) * 60 + s) * 1000
+
+def glue_subtitles(paths, part_lengths_ms=(), progress=None):
+    """
+    Yields the cues of every file in paths, one part after the other, in a
+    single streaming pass that reads each file once.
+
+    Each part is offset by the running sum of the lengths of the parts
+    before it. part_lengths_ms gives those lengths in order; parts past
+    its end, or given None, use their last end time instead.
+    """
+    offset_ms = 0
+    for step, path in enumerate(paths):
+        part_end = None
+        for start_ms, end_ms, text in iter_file_cues(path, progress=step_progress(progress, step, len(paths))):
+            yield Cue(start_ms + offset_ms, end_ms + offset_ms, text)
+            part_end = end_ms if part_end is None else max(part_end, end_ms)
+
+        length_ms = part_lengths_ms[step] if step < len(part_lengths_ms) else None
+        if length_ms is None:
+            if part_end is None and step < len(paths) - 1:
+                raise ValueError(f"Could not find any subtitles in '{os.path.basename(path)}' "
+                                 f"to auto-decide the time.")
+            length_ms = part_end or 0
+        offset_ms += length_ms
+
+def merge_subtitles_stacked(main_path, secondary_paths, color_hex=None, progress=None):
+    """
+    Merges secondary subtitles into the main one based on time overlap.
+    Yields the merged cues while the main file is being read.
+    """
+    step_count = len(secondary_paths) + 1
+    # Each secondary file stays mapped, only the times of all of them are
+    # gathered; texts are read from their file when a main cue needs them.
+    secondary_stores = []
+    store_offsets = []
+    secondary_starts = array('q')
+    secondary_ends = array('q')
+    for step, path in enumerate(secondary_paths):
+        store = CueStore.from_file(path, progress=step_progress(progress, step, step_count))
+        store_offsets.append(len(secondary_starts))
+        secondary_starts.extend(store.starts)
+        secondary_ends.extend(store.ends)
+        secondary_stores.append(store)
+
+    def secondary_text(position):
+        number = bisect_right(store_offsets, position) - 1
+        return secondary_stores[number].text(position - store_offsets[number])
+
+    # Index the secondary cues once so each main cue only visits the cues it
+    # overlaps, instead of scanning every secondary cue of every file.
+    overlap_index = IntervalIndex(secondary_starts, secondary_ends)
+
+    main_progress = step_progress(progress, step_count - 1, step_count)
+    for main_cue in iter_file_cues(main_path, progress=main_progress):
+        # Positions come back in file order, matching the old nested loop.
+        positions = overlap_index.overlapping(main_cue.start, main_cue.end)
+        if not positions:
+            yield main_cue
+            continue
+        lines = [main_cue.text]
+        for position in positions:
+            sec_text = secondary_text(position)
+            if color_hex:
+                sec_text = f'<font color="{color_hex}">{sec_text}</font>'
+            lines.append(sec_text)
+        yield Cue(main_cue.start, main_cue.end, '\n'.join(lines))
+
+def glue_subtitle_files(paths, output_path, part_lengths_ms=(), progress=None):
+    """Glues the files in paths end to end, renumbering while streaming into output_path."""
+    return write_srt(output_path, glue_subtitles(paths, part_lengths_ms, progress), encoding='utf-8-sig')
+
+def stack_subtitle_files(main_path, secondary_paths, output_path, color_hex=None, progress=None):
+    """Stacks the secondary files onto main_path and writes the result to output_path."""
+    return write_srt(output_path, merge_subtitles_stacked(main_path, secondary_paths, color_hex, progress), encoding='utf-8-sig')
+
+def merge_subtitle_files(input_path, output_path, mode="stacked", secondary=(), color=None, base_length=(), progress=None):
+    """
+    Batch entry point: merges the secondary files found next to input_path
+    into it and writes the result to output_path.
+    """
+    directory = os.path.dirname(input_path)
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    secondary_paths = [os.path.join(directory, template.format(stem=stem)) for template in secondary]
+    if not secondary_paths:
+        raise ValueError("At least one secondary file is required.")
+
+    if mode == "glue":
+        part_lengths_ms = [parse_base_length(length) for length in base_length or ()]
+        if None in part_lengths_ms:
+            raise ValueError("Invalid base length, please use hh:mm:ss.")
+        return glue_subtitle_files([input_path] + secondary_paths, output_path, part_lengths_ms, progress)
+    return stack_subtitle_files(input_path, secondary_paths, output_path, color, progress)
+
+class MergeTool(ToolJobMixin, QWidget):
     """
     A tool to merge multiple SRT subtitle files in two different modes:
-    1. Glue End to End: Appends a subtitle file to another, offsetting the timestamps.
+    1. Glue End to End: Appends subtitle files one after another, offsetting the timestamps.
     2. Stacked Merge: Combines subtitles that overlap in time into single entries.
     """
+    JOB_TITLE = "Merge Lines"
+    JOB_BUTTONS = ("glue_export_button", "stack_export_button")
+
     def __init__(self):
         super().__init__()
         self.setProperty("class", "tool-widget")
@@ -97,33 +222,36 @@ class MergeTool(QWidget):
         main_file_layout.addStretch()
         layout.addLayout(main_file_layout)
 
-        # Secondary subtitle file
-        layout.addWidget(QLabel("2. Select the subtitle file to append:"))
+        # Subtitle files to append, glued in the order they are listed
+        layout.addWidget(QLabel("2. Select the subtitle files to append, in order:"))
         secondary_file_layout = QHBoxLayout()
-        self.glue_secondary_button = QPushButton("Select Secondary Subtitle")
-        self.glue_secondary_button.clicked.connect(self._select_secondary_subtitle_glue)
-        self.glue_secondary_file_preview = QLabel("No file selected.")
-        self.glue_secondary_file_preview.setObjectName("file_preview")
+        self.glue_secondary_button = QPushButton("Select Subtitles To Append")
+        self.glue_secondary_button.clicked.connect(self._select_multiple_secondary_subtitles)
         secondary_file_layout.addWidget(self.glue_secondary_button)
-        secondary_file_layout.addWidget(self.glue_secondary_file_preview)
         secondary_file_layout.addStretch()
         layout.addLayout(secondary_file_layout)
 
+        self.glue_secondary_file_list = QListWidget()
+        self.glue_secondary_file_list.setObjectName("file_list")
+        self.glue_secondary_file_list.setFixedHeight(100)
+        layout.addWidget(self.glue_secondary_file_list)
+
         # Auto-decide option
         auto_decide_layout = QHBoxLayout()
-        self.auto_decide_checkbox = QCheckBox("Auto-decide end time from main subtitle's last line")
+        self.auto_decide_checkbox = QCheckBox("Auto-decide each part's length from its last line")
         self.auto_decide_checkbox.stateChanged.connect(self._toggle_base_length_input)
         auto_decide_layout.addWidget(self.auto_decide_checkbox)
         auto_decide_layout.addStretch()
         layout.addLayout(auto_decide_layout)
 
         # Base length input
-        self.base_length_label = QLabel("3. Or, enter the length of the first subtitle's video (hh:mm:ss):")
+        self.base_length_label = QLabel("3. Or, enter the video length of every part but the last "
+                                        "(hh:mm:ss, separated by commas):")
         layout.addWidget(self.base_length_label)
         base_length_layout = QHBoxLayout()
         self.base_length_input = QLineEdit("00:00:00")
         self.base_length_input.setObjectName("time_input")
-        self.base_length_input.setFixedWidth(100)
+        self.base_length_input.setMinimumWidth(100)
         base_length_layout.addWidget(self.base_length_input)
         base_length_layout.addStretch()
         layout.addLayout(base_length_layout)
@@ -269,22 +397,19 @@ class MergeTool(QWidget):
             self.glue_main_file_preview.setText(base_name)
             self.stack_main_file_preview.setText(base_name)
 
-    def _select_secondary_subtitle_glue(self):
-        """Opens a file dialog for the single secondary subtitle in glue mode."""
-        file_path, _ = QFileDialog.getOpenFileName(self, "Select Secondary Subtitle File", "", "Subtitle Files (*.srt)")
-        if file_path:
-            # Use a list for consistency, even though it's just one file
-            self.secondary_subtitle_paths = [file_path]
-            self.glue_secondary_file_preview.setText(os.path.basename(file_path))
-
     def _select_multiple_secondary_subtitles(self):
         """Opens a file dialog to select multiple secondary .srt files."""
         file_paths, _ = QFileDialog.getOpenFileNames(self, "Select Secondary Subtitle Files", "", "Subtitle Files (*.srt)")
         if file_paths:
-            self.secondary_subtitle_paths = file_paths
-            self.secondary_file_list.clear()
-            for path in file_paths:
-                self.secondary_file_list.addItem(os.path.basename(path))
+            self._set_secondary_subtitle_paths(file_paths)
+
+    def _set_secondary_subtitle_paths(self, paths):
+        """Both modes share the secondary files, shows them in both lists."""
+        self.secondary_subtitle_paths = list(paths)
+        for file_list in (self.glue_secondary_file_list, self.secondary_file_list):
+            file_list.clear()
+            for path in self.secondary_subtitle_paths:
+                file_list.addItem(os.path.basename(path))
 
     def _glue_end_to_end_merge(self):
         """Performs the 'Glue End to End' merge operation."""
@@ -292,43 +417,21 @@ class MergeTool(QWidget):
             self._show_error("Please select both main and secondary subtitle files.")
             return
 
-        try:
-            offset_delta = None
-            if self.auto_decide_checkbox.isChecked():
-                main_content = self._read_file(self.main_subtitle_path)
-                main_subs = self._parse_srt(main_content)
-                if not main_subs:
-                    self._show_error("Could not find any subtitles in the main file to auto-decide the time.")
-                    return
-                offset_delta = max(sub['end'] for sub in main_subs)
-            else:
-                base_length_str = self.base_length_input.text()
-                if not re.match(r'^\d{2}:\d{2}:\d{2}$', base_length_str):
-                    self._show_error("Invalid time format for manual input. Please use hh:mm:ss.")
-                    return
-                h, m, s = map(int, base_length_str.split(':'))
-                offset_delta = timedelta(hours=h, minutes=m, seconds=s)
-            
-            main_content = self._read_file(self.main_subtitle_path)
-            secondary_content = self._read_file(self.secondary_subtitle_paths[0])
-
-            offset_content = self._offset_subtitle_times(secondary_content, offset_delta)
-            
-            # Renumber the second subtitle part before merging
-            last_main_index = len(self._parse_srt(main_content))
-            renumbered_offset_content = self._renumber_srt(offset_content, last_main_index + 1)
-            
-            merged_content = main_content.strip() + '\n\n' + renumbered_offset_content.strip()
-
-            default_save_name = self._generate_output_filename()
-            export_dir = os.path.dirname(self.main_subtitle_path) #. [1, 2, 3, 5, 6]
-            save_path, _ = QFileDialog.getSaveFileName(self, "Save Merged File", os.path.join(export_dir, default_save_name), "Subtitle Files (*.srt)") #. [4, 11, 12, 13]
-            if save_path:
-                self._write_file(save_path, merged_content)
-                self._show_success("Merged file saved successfully!")
-        except Exception as e:
-            self._show_error(f"An error occurred while merging:\n\n{e}")
-
+        part_lengths_ms = []
+        if not self.auto_decide_checkbox.isChecked():
+            part_lengths_ms = [parse_base_length(length.strip()) for length in self.base_length_input.text().split(',')]
+            if None in part_lengths_ms:
+                self._show_error("Invalid time format for manual input. Please use hh:mm:ss.")
+                return
+
+        default_save_name = self._generate_output_filename()
+        export_dir = os.path.dirname(self.main_subtitle_path) #. [1, 2, 3, 5, 6]
+        save_path, _ = QFileDialog.getSaveFileName(self, "Save Merged File", os.path.join(export_dir, default_save_name), "Subtitle Files (*.srt)") #. [4, 11, 12, 13]
+        if save_path:
+            # Runs on the job pool so the window stays responsive.
+            # Every part is read once, straight into the output.
+            self._start_job(save_path, glue_subtitle_files, [self.main_subtitle_path] + self.secondary_subtitle_paths,
+                            save_path, part_lengths_ms)
 
     def _stacked_merge(self):
         """Performs the 'Stacked Merge' operation."""
@@ -343,16 +446,53 @@ class MergeTool(QWidget):
                 # If hex is invalid, use the palette selection
                 color_hex = self.color_palette.currentData()
 
-        try:
-            merged_content = self._merge_subtitles_stacked(self.main_subtitle_path, self.secondary_subtitle_paths, color_hex)
-            default_save_name = self._generate_output_filename()
-            export_dir = os.path.dirname(self.main_subtitle_path) #. [1, 2, 3, 5, 6]
-            save_path, _ = QFileDialog.getSaveFileName(self, "Save Merged File", os.path.join(export_dir, default_save_name), "Subtitle Files (*.srt)") #. [4, 11, 12, 13]
-            if save_path:
-                self._write_file(save_path, merged_content)
-                self._show_success("Merged file saved successfully!")
-        except Exception as e:
-            self._show_error(f"An error occurred while merging:\n\n{e}")
+        default_save_name = self._generate_output_filename()
+        export_dir = os.path.dirname(self.main_subtitle_path) #. [1, 2, 3, 5, 6]
+        save_path, _ = QFileDialog.getSaveFileName(self, "Save Merged File", os.path.join(export_dir, default_save_name), "Subtitle Files (*.srt)") #. [4, 11, 12, 13]
+        if save_path:
+            # The main file is streamed straight into the output on the job pool.
+            self._start_job(save_path, stack_subtitle_files, self.main_subtitle_path, list(self.secondary_subtitle_paths), save_path, color_hex)
+
+    def _job_success_message(self, _cue_count):
+        return "Merged file saved successfully!"
+
+    def _on_job_failed(self, message):
+        self._show_error(f"An error occurred while merging:\n\n{message}")
+
+    # --- Hibernation State ---
+
+    def _tool_state(self):
+        return {
+            "mode": "stacked" if self.stacked_widget.currentWidget() is self.stacked_merge_widget else "glue",
+            "main_subtitle_path": self.main_subtitle_path,
+            "secondary_subtitle_paths": list(self.secondary_subtitle_paths),
+            "auto_decide": self.auto_decide_checkbox.isChecked(),
+            "base_length": self.base_length_input.text(),
+            "color_enabled": self.color_checkbox.isChecked(),
+            "color_index": self.color_palette.currentIndex(),
+            "hex": self.hex_input.text(),
+        }
+
+    def restore_state(self, state):
+        """Restores the inputs returned by save_state() on a freshly created widget."""
+        self.main_subtitle_path = state.get("main_subtitle_path", "")
+        if self.main_subtitle_path:
+            base_name = os.path.basename(self.main_subtitle_path)
+            self.glue_main_file_preview.setText(base_name)
+            self.stack_main_file_preview.setText(base_name)
+        self._set_secondary_subtitle_paths(state.get("secondary_subtitle_paths", []))
+
+        self.auto_decide_checkbox.setChecked(state.get("auto_decide", False))
+        if not self.auto_decide_checkbox.isChecked():
+            self.base_length_input.setText(state.get("base_length", "00:00:00"))
+        self.color_checkbox.setChecked(state.get("color_enabled", False))
+        self.color_palette.setCurrentIndex(state.get("color_index", 0))
+        self.hex_input.setText(state.get("hex", ""))
+
+        if state.get("mode") == "stacked":
+            self.show_stacked_merge()
+        else:
+            self.show_glue_end_to_end()
 
     def _generate_output_filename(self):
         """Generates a default output filename based on the main subtitle file."""
@@ -371,100 +511,5 @@ class MergeTool(QWidget):
 
     # --- Backend and Utility Methods ---
 
-    def _read_file(self, path):
-        with open(path, 'r', encoding='utf-8-sig') as f:
-            return f.read()
-
-    def _write_file(self, path, content):
-        with open(path, 'w', encoding='utf-8-sig') as f:
-            f.write(content)
-
-    def _srt_time_to_timedelta(self, srt_time):
-        h, m, s, ms = map(int, re.split('[:,]', srt_time))
-        return timedelta(hours=h, minutes=m, seconds=s, milliseconds=ms)
-
-    def _timedelta_to_srt_time(self, td):
-        total_seconds = td.total_seconds()
-        h, rem = divmod(total_seconds, 3600)
-        m, s = divmod(rem, 60)
-        ms = td.microseconds / 1000
-        return f"{int(h):02d}:{int(m):02d}:{int(s):02d},{int(ms):03d}"
-
-    def _offset_subtitle_times(self, content, offset_delta):
-        """Offsets all timestamps in an SRT content string by a given timedelta."""
-        new_content = []
-        for line in content.splitlines():
-            if '-->' in line:
-                start_str, end_str = line.split(' --> ')
-                start_time = self._srt_time_to_timedelta(start_str) + offset_delta
-                end_time = self._srt_time_to_timedelta(end_str) + offset_delta
-                new_content.append(f"{self._timedelta_to_srt_time(start_time)} --> {self._timedelta_to_srt_time(end_time)}")
-            else:
-                new_content.append(line)
-        return '\n'.join(new_content)
-    
-    def _renumber_srt(self, content, start_index):
-        """Renumbers all entries in an SRT content string starting from a given index."""
-        lines = content.splitlines()
-        new_lines = []
-        is_subtitle_entry = False
-        for line in lines:
-            if line.strip().isdigit() and not is_subtitle_entry:
-                new_lines.append(str(start_index))
-                start_index += 1
-                is_subtitle_entry = True
-            elif '-->' in line:
-                new_lines.append(line)
-            elif not line.strip():
-                is_subtitle_entry = False
-                new_lines.append(line)
-            else:
-                new_lines.append(line)
-        return '\n'.join(new_lines)
-
-
-    def _parse_srt(self, content):
-        """Parses SRT content into a list of subtitle objects."""
-        pattern = re.compile(r'(\d+)\n(\d{2}:\d{2}:\d{2},\d{3}) --> (\d{2}:\d{2}:\d{2},\d{3})\n(.*?)\n\n', re.DOTALL)
-        subs = []
-        for match in pattern.finditer(content + "\n\n"):
-            subs.append({
-                'index': int(match.group(1)),
-                'start': self._srt_time_to_timedelta(match.group(2)),
-                'end': self._srt_time_to_timedelta(match.group(3)),
-                'text': match.group(4).strip()
-            })
-        return subs
-    
-    def _merge_subtitles_stacked(self, main_path, secondary_paths, color_hex):
-        """Merges secondary subtitles into the main one based on time overlap."""
-        main_subs = self._parse_srt(self._read_file(main_path))
-        
-        all_secondary_subs = []
-        for path in secondary_paths:
-            all_secondary_subs.extend(self._parse_srt(self._read_file(path)))
-            
-        for main_sub in main_subs:
-            for sec_sub in all_secondary_subs:
-                # Check for time overlap
-                if main_sub['start'] < sec_sub['end'] and main_sub['end'] > sec_sub['start']:
-                    sec_text = sec_sub['text']
-                    if color_hex:
-                        sec_text = f'<font color="{color_hex}">{sec_text}</font>'
-                    main_sub['text'] += '\n' + sec_text
-        
-        # Reconstruct the SRT content
-        new_content = []
-        for i, sub in enumerate(main_subs, 1):
-            new_content.append(str(i))
-            new_content.append(f"{self._timedelta_to_srt_time(sub['start'])} --> {self._timedelta_to_srt_time(sub['end'])}")
-            new_content.append(sub['text'])
-            new_content.append('')
-            
-        return '\n'.join(new_content)
-
     def _show_error(self, message):
-        QMessageBox.critical(self, "Error", message)
-
-    def _show_success(self, message):
-        QMessageBox.information(self, "Success", message)
\ No newline at end of file
+        QMessageBox.critical(self, "Error", message)
\ No newline at end of file
@@ -30,7 +30,7 @@ STYLE_TEMPLATE = """
         font-size: 15px;
     }}
 
-    MergeTool #file_preview, MergeTool #glue_secondary_file_preview {{
+    MergeTool #file_preview {{
         color: {colors["text_primary"]};
         font-style: italic;
         margin-left: 10px;
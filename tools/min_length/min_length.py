@@ -1,26 +1,51 @@
 # tools/min_length/min_length_tool.py
 
-import srt
 import os
-from datetime import timedelta
 from PySide6.QtWidgets import (
-    QWidget, QVBoxLayout, QLabel, QPushButton, QSpinBox, 
-    QComboBox, QFileDialog, QMessageBox, QHBoxLayout
+    QWidget, QVBoxLayout, QLabel, QPushButton, QSpinBox, QDoubleSpinBox,
+    QComboBox, QFileDialog, QMessageBox, QHBoxLayout, QFormLayout
 )
 from PySide6.QtCore import Qt
 
+from core.cue_store import CueStore
+from core.timing import retime, TIME_UNITS_MS
+from tool_jobs import ToolJobMixin
+
 # Each tool now defines its own properties, which the tool_manager will read.
 TOOL_DEFINITION = {
     "display_name": "📏 Minimum Length",
     "description": "Adjust the minimum display time of subtitles.",
     "widget_class_name": "MinLengthTool",  # The name of the main class in this file
-    "can_open_file": True # This tool can open .srt files
+    "can_open_file": True, # This tool can open .srt files
+    # Headless entry point used by the subtl command line (see subtl.py)
+    "batch_function_name": "apply_min_length_to_file",
+    "batch_output_suffix": "_Subtl_MinLength",
+    "batch_options": {
+        "min_length": {"type": "int", "default": 1000, "help": "Minimum display time of a subtitle."},
+        "unit": {"type": "str", "default": "ms", "choices": ["ms", "s", "m"], "help": "Unit of --min-length."},
+        "min_gap": {"type": "int", "default": None, "help": "Keep cues at least this many ms apart. By default extended cues only stop at the next one."},
+        "max_cps": {"type": "float", "default": None, "help": "Also extend cues to be readable at this many characters per second."},
+    },
 }
 
-class MinLengthTool(QWidget):
+def apply_min_length_to_file(input_path, output_path, min_length=1000, unit="ms", min_gap=None, max_cps=None, progress=None):
+    """
+    Extends the cues of an SRT file to the minimum length and writes the
+    result to output_path. Extended cues never run into the next cue; see
+    core.timing.retime() for how min_gap and max_cps are resolved with it.
+    Needs no Qt application, so it can run in batch worker processes.
+    """
+    store = CueStore.from_file(input_path, progress=progress)
+    retime(store, min_duration_ms=min_length * TIME_UNITS_MS[unit], min_gap_ms=min_gap, max_cps=max_cps)
+    store.write(output_path, encoding='utf-8')
+    return len(store)
+
+class MinLengthTool(ToolJobMixin, QWidget):
     """
     UI widget for the Minimum Length tool.
     """
+    JOB_TITLE = "Minimum Length"
+
     def __init__(self):
         super().__init__()
         self.input_file_path = None
@@ -50,9 +75,24 @@ class MinLengthTool(QWidget):
         min_length_layout.addWidget(self.min_length_input)
         min_length_layout.addWidget(self.time_unit_combo)
 
+        # Optional rules resolved together with the minimum length
+        rules_layout = QFormLayout()
+        self.min_gap_input = QSpinBox()
+        self.min_gap_input.setRange(-1, 5000)
+        self.min_gap_input.setSuffix(" ms")
+        self.min_gap_input.setSpecialValueText("Off")  # Shown for -1
+        self.min_gap_input.setValue(-1)
+        self.max_cps_input = QDoubleSpinBox()
+        self.max_cps_input.setRange(0, 100)
+        self.max_cps_input.setDecimals(1)
+        self.max_cps_input.setSuffix(" chars/s")
+        self.max_cps_input.setSpecialValueText("Off")  # Shown for 0
+        rules_layout.addRow("Minimum gap:", self.min_gap_input)
+        rules_layout.addRow("Max reading speed:", self.max_cps_input)
+
         # Apply button
-        apply_button = QPushButton("Apply and Save As...")
-        apply_button.clicked.connect(self.apply_min_length)
+        self.apply_button = QPushButton("Apply and Save As...")
+        self.apply_button.clicked.connect(self.apply_min_length)
 
         # Add widgets to layout
         layout.addWidget(file_select_button)
@@ -60,8 +100,9 @@ class MinLengthTool(QWidget):
         layout.addSpacing(20)
         layout.addWidget(description_label)
         layout.addLayout(min_length_layout)
+        layout.addLayout(rules_layout)
         layout.addSpacing(20)
-        layout.addWidget(apply_button)
+        layout.addWidget(self.apply_button)
 
     def select_file(self):
         """
@@ -100,27 +141,10 @@ class MinLengthTool(QWidget):
             return
 
         min_length_val = self.min_length_input.value()
-        time_unit = self.time_unit_combo.currentText()
-        
-        # Determine time delta and unit abbreviation for filename
-        if time_unit == "Milliseconds":
-            min_duration = timedelta(milliseconds=min_length_val)
-            unit_abbr = "ms"
-        elif time_unit == "Seconds":
-            min_duration = timedelta(seconds=min_length_val)
-            unit_abbr = "s"
-        else:  # Minutes
-            min_duration = timedelta(minutes=min_length_val)
-            unit_abbr = "m"
+        # Unit abbreviation for the duration and the filename
+        unit_abbr = list(TIME_UNITS_MS)[self.time_unit_combo.currentIndex()]
 
         try:
-            with open(self.input_file_path, 'r', encoding='utf-8-sig') as f:
-                subtitles = list(srt.parse(f.read()))
-            for sub in subtitles:
-                duration = sub.end - sub.start
-                if duration < min_duration:
-                    sub.end = sub.start + min_duration
-            
             # --- Create the new default filename ---
             directory = os.path.dirname(self.input_file_path)
             base_name = os.path.basename(self.input_file_path)
@@ -133,9 +157,28 @@ class MinLengthTool(QWidget):
             output_file_path, _ = QFileDialog.getSaveFileName(self, "Save SRT File As...", default_save_path, "SubRip Files (*.srt)")
 
             if output_file_path:
-                with open(output_file_path, 'w', encoding='utf-8') as f:
-                    f.write(srt.compose(subtitles))
-                QMessageBox.information(self, "Success", f"File saved successfully to {output_file_path}")
+                min_gap = self.min_gap_input.value() if self.min_gap_input.value() >= 0 else None
+                max_cps = self.max_cps_input.value() or None
+                self._start_job(output_file_path, apply_min_length_to_file, self.input_file_path, output_file_path,
+                                min_length_val, unit_abbr, min_gap, max_cps)
 
         except Exception as e:
-            QMessageBox.critical(self, "Error", f"An error occurred: {e}")
\ No newline at end of file
+            QMessageBox.critical(self, "Error", f"An error occurred: {e}")
+
+    def _tool_state(self):
+        return {
+            "input_file_path": self.input_file_path,
+            "min_length": self.min_length_input.value(),
+            "unit_index": self.time_unit_combo.currentIndex(),
+            "min_gap": self.min_gap_input.value(),
+            "max_cps": self.max_cps_input.value(),
+        }
+
+    def restore_state(self, state):
+        """Restores the inputs returned by save_state() on a freshly created widget."""
+        if state.get("input_file_path"):
+            self.load_file(state["input_file_path"])
+        self.min_length_input.setValue(state.get("min_length", 1000))
+        self.time_unit_combo.setCurrentIndex(state.get("unit_index", 0))
+        self.min_gap_input.setValue(state.get("min_gap", -1))
+        self.max_cps_input.setValue(state.get("max_cps", 0))
@@ -1,25 +1,257 @@
 # tools/multilingual_merge/multilingual_merge_tool.py
 
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+import os
+import heapq
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSpinBox,
+    QListWidget, QFileDialog, QMessageBox, QFormLayout
+)
 from PySide6.QtCore import Qt
 
+from core.srt_stream import Cue, iter_file_cues, write_srt
+from core.progress import weighted_progress
+from tool_jobs import ToolJobMixin
+
 # Self-definition for the Multilingual Merge tool
 TOOL_DEFINITION = {
     "display_name": "🌍 Multilingual Merge",
     "description": "Merge subtitles from different languages.",
-    "widget_class_name": "MultilingualMergeTool"
+    "widget_class_name": "MultilingualMergeTool",
+    "can_open_file": True,
+    # Headless entry point used by the subtl command line (see subtl.py)
+    "batch_function_name": "multilingual_merge_file",
+    "batch_output_suffix": "_Subtl_Multilingual",
+    "batch_options": {
+        "track": {"type": "str", "multiple": True, "default": [], "companion": True,
+                  "help": "Language track next to each input, '{stem}' is replaced by the input's name "
+                          "(e.g. '{stem}.fr.srt'). Repeat for every track, the input is the first one."},
+        "min_overlap": {"type": "int", "default": 250,
+                        "help": "Milliseconds two cues must overlap to be merged into one."},
+    },
 }
 
-class MultilingualMergeTool(QWidget):
-    """Placeholder widget for the Multilingual Merge tool."""
+# Cues overlapping a group by less than this many milliseconds stay apart,
+# so small timing differences between tracks do not pull the neighbouring
+# line of a track into a group.
+DEFAULT_MIN_OVERLAP_MS = 250
+
+# --- Multilingual Merge Backend ---
+# These functions need no Qt application, so they also run in batch workers.
+
+def _track_stream(track, cues):
+    # Heap entries sort by start time, ties keep the track order; texts are
+    # never compared since no two streams share a track number.
+    for start, end, text in cues:
+        yield start, track, end, text
+
+def _group_cue(group_start, group_end, members, next_start):
+    """Builds the merged cue of a group, one line per track in track order."""
+    texts_by_track = {}
+    for track, text in sorted(members, key=lambda member: member[0]):
+        texts_by_track.setdefault(track, []).append(' '.join(text.splitlines()))
+    lines = [' '.join(texts) for texts in texts_by_track.values()]
+    # The next group may start inside this one; end there so no two merged
+    # cues are on screen at the same time.
+    if next_start is not None and group_start < next_start < group_end:
+        group_end = next_start
+    return Cue(group_start, group_end, '\n'.join(lines))
+
+def merge_tracks(track_paths, min_overlap_ms=DEFAULT_MIN_OVERLAP_MS, progress=None):
+    """
+    Merges several language tracks of the same programme, yielding one cue
+    per group of overlapping cues in time order. Each track contributes one
+    line to a group, in the order of track_paths.
+
+    The tracks are read side by side and k-way merged on a heap, so merging
+    n cues from k tracks costs O(n log k). Besides the heap's one cue per
+    track, only the group being built and the one before it are held in
+    memory. A group's time window is the span of the cue that opened it; a
+    later cue joins when it overlaps that window by at least min_overlap_ms,
+    or over its whole length if it is shorter than that. The window is not
+    widened by the cues that join, so tracks with slightly different timings
+    cannot chain all their cues together. Tracks are expected in time order,
+    as SRT files are.
+
+    Every cue joins exactly one group. A long cue of one track spanning two
+    shorter cues of another is attached to the first group only, so the
+    second group shows no line for its track (and the first is cut where the
+    second starts). Tracks split into lines differently are best retimed to
+    each other before merging.
+    """
+    sizes = [os.path.getsize(path) for path in track_paths]
+    reporters = weighted_progress(progress, sizes)
+    streams = [_track_stream(track, iter_file_cues(path, progress=report))
+               for track, (path, report) in enumerate(zip(track_paths, reporters))]
+
+    # A finished group is held back until the next one starts, to end it there.
+    pending = None
+    members = []
+    group_start = group_end = window_end = 0
+    for start, track, end, text in heapq.merge(*streams):
+        if members:
+            overlap = min(end, window_end) - start
+            if overlap > 0 and overlap >= min(min_overlap_ms, end - start):
+                members.append((track, text))
+                group_end = max(group_end, end)
+                continue
+            if pending:
+                yield _group_cue(*pending, next_start=group_start)
+            pending = (group_start, group_end, members)
+        group_start, group_end, window_end, members = start, end, end, [(track, text)]
+
+    if pending:
+        yield _group_cue(*pending, next_start=group_start)
+    if members:
+        yield _group_cue(group_start, group_end, members, next_start=None)
+
+def merge_track_files(track_paths, output_path, min_overlap_ms=DEFAULT_MIN_OVERLAP_MS, progress=None):
+    """Merges the language tracks and streams the result into output_path."""
+    if len(track_paths) < 2:
+        raise ValueError("At least two language tracks are required.")
+    return write_srt(output_path, merge_tracks(track_paths, min_overlap_ms, progress), encoding='utf-8-sig')
+
+def multilingual_merge_file(input_path, output_path, track=(), min_overlap=DEFAULT_MIN_OVERLAP_MS, progress=None):
+    """
+    Batch entry point: merges the language tracks found next to input_path
+    with it and writes the result to output_path.
+    """
+    directory = os.path.dirname(input_path)
+    stem = os.path.splitext(os.path.basename(input_path))[0]
+    track_paths = [input_path] + [os.path.join(directory, template.format(stem=stem)) for template in track]
+    return merge_track_files(track_paths, output_path, min_overlap, progress)
+
+
+class MultilingualMergeTool(ToolJobMixin, QWidget):
+    """
+    UI widget for the Multilingual Merge tool. The tracks are listed in the
+    order their lines appear in every merged cue.
+    """
+    JOB_TITLE = "Multilingual Merge"
+    JOB_BUTTONS = ("merge_button",)
+
     def __init__(self):
         super().__init__()
+        self.track_paths = []
+
+        # Add a property to identify this as a tool widget for styling
         self.setProperty("class", "tool-widget")
-        
+
         layout = QVBoxLayout(self)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        label = QLabel(f"{TOOL_DEFINITION['display_name']} - Placeholder")
-        label.setObjectName("placeholder_label")
-        
-        layout.addWidget(label)
\ No newline at end of file
+        layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+
+        description_label = QLabel(TOOL_DEFINITION["description"])
+
+        # Track list with the buttons to edit it
+        self.track_list = QListWidget()
+        self.track_list.setObjectName("file_list")
+        buttons_layout = QHBoxLayout()
+        add_button = QPushButton("Add Tracks...")
+        add_button.clicked.connect(self.select_files)
+        remove_button = QPushButton("Remove")
+        remove_button.clicked.connect(self.remove_selected_track)
+        up_button = QPushButton("Move Up")
+        up_button.clicked.connect(lambda: self.move_selected_track(-1))
+        down_button = QPushButton("Move Down")
+        down_button.clicked.connect(lambda: self.move_selected_track(1))
+        for button in (add_button, remove_button, up_button, down_button):
+            buttons_layout.addWidget(button)
+
+        options_layout = QFormLayout()
+        self.min_overlap_input = QSpinBox()
+        self.min_overlap_input.setRange(0, 10000)
+        self.min_overlap_input.setSuffix(" ms")
+        self.min_overlap_input.setValue(DEFAULT_MIN_OVERLAP_MS)
+        options_layout.addRow("Minimum overlap:", self.min_overlap_input)
+
+        # Merge button
+        self.merge_button = QPushButton("Merge and Save As...")
+        self.merge_button.clicked.connect(self.merge)
+
+        # Add widgets to layout
+        layout.addWidget(description_label)
+        layout.addWidget(self.track_list)
+        layout.addLayout(buttons_layout)
+        layout.addSpacing(20)
+        layout.addLayout(options_layout)
+        layout.addSpacing(20)
+        layout.addWidget(self.merge_button)
+
+    def select_files(self):
+        """
+        Open a file dialog to add one or more language tracks.
+        """
+        file_paths, _ = QFileDialog.getOpenFileNames(self, "Add Language Tracks", "", "SubRip Files (*.srt)")
+        for file_path in file_paths:
+            self.add_track(file_path)
+
+    def load_file_on_startup(self, file_path: str):
+        """
+        Loads a file when the tool is opened directly with a file.
+        This method is called by the TabManager.
+        """
+        if os.path.exists(file_path) and file_path.endswith('.srt'):
+            self.add_track(file_path)
+        else:
+            QMessageBox.warning(self, "Warning", "Error: Invalid or non-existent file provided.")
+
+    def add_track(self, file_path):
+        """Appends a language track, files already listed are ignored."""
+        if file_path in self.track_paths:
+            return
+        self.track_paths.append(file_path)
+        self.track_list.addItem(os.path.basename(file_path))
+
+    def remove_selected_track(self):
+        row = self.track_list.currentRow()
+        if row >= 0:
+            del self.track_paths[row]
+            self.track_list.takeItem(row)
+
+    def move_selected_track(self, step):
+        """Moves the selected track up (-1) or down (1) in the line order."""
+        row = self.track_list.currentRow()
+        target = row + step
+        if row < 0 or not 0 <= target < len(self.track_paths):
+            return
+        self.track_paths.insert(target, self.track_paths.pop(row))
+        self.track_list.insertItem(target, self.track_list.takeItem(row))
+        self.track_list.setCurrentRow(target)
+
+    def merge(self):
+        """
+        Merge the listed tracks and save the result. The suggested save name
+        is based on the first track's name.
+        """
+        if len(self.track_paths) < 2:
+            QMessageBox.warning(self, "Warning", "Please add at least two language tracks.")
+            return
+
+        try:
+            directory = os.path.dirname(self.track_paths[0])
+            file_name, file_ext = os.path.splitext(os.path.basename(self.track_paths[0]))
+            default_save_path = os.path.join(directory, f"{file_name}_Subtl_Multilingual{file_ext}")
+
+            output_file_path, _ = QFileDialog.getSaveFileName(self, "Save SRT File As...", default_save_path, "SubRip Files (*.srt)")
+
+            if output_file_path:
+                self._start_job(output_file_path, merge_track_files, list(self.track_paths), output_file_path,
+                                self.min_overlap_input.value())
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"An error occurred: {e}")
+
+    def _tool_state(self):
+        return {
+            "track_paths": list(self.track_paths),
+            "min_overlap": self.min_overlap_input.value(),
+        }
+
+    def restore_state(self, state):
+        """Restores the inputs returned by save_state() on a freshly created widget."""
+        for path in state.get("track_paths", []):
+            self.add_track(path)
+        self.min_overlap_input.setValue(state.get("min_overlap", DEFAULT_MIN_OVERLAP_MS))
+
+    def _job_success_message(self, cue_count):
+        return f"Merged {cue_count} cues, saved to {self._job_output_path}"
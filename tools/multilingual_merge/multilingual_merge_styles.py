@@ -1,16 +1,21 @@
 # tools/multilingual_merge/styles.py
 
-# A theme-agnostic template for the Merge tool's stylesheet.
+# A theme-agnostic template for the Multilingual Merge tool's stylesheet.
 # The placeholders like {bg_primary}, {text_primary}, etc., will be
 # filled in by the StyleManager at runtime with the current theme's colors.
 
 STYLE_TEMPLATE = """
-    /* --- Styles for MultilingualMergeTool Placeholder --- */
+    /* --- Styles for MultilingualMergeTool --- */
 
-    MultilingualMergeTool #placeholder_label {{
-        font-size: 18px;
-        qproperty-alignment: 'AlignCenter';
-        font-weight: bold;
+    /* Give the track list a visible frame */
+    MultilingualMergeTool #file_list {{
+        border: 1px solid {colors["border_color"]};
+        border-radius: 4px;
         color: {colors["text_primary"]};
     }}
-"""
\ No newline at end of file
+
+    /* Make the buttons in the tool have a bold font */
+    MultilingualMergeTool QPushButton {{
+        font-weight: bold;
+    }}
+"""
@@ -1,25 +1,300 @@
 # tools/split/split_tool.py
 
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+import os
+
+import numpy as np
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QSpinBox,
+    QComboBox, QCheckBox, QFontComboBox, QFileDialog, QMessageBox, QFormLayout
+)
+from PySide6.QtGui import QFont, QFontMetricsF
 from PySide6.QtCore import Qt
 
+from core.cue_store import CueStore
+from core.srt_stream import Cue, write_srt
+from core.subtitle_formats import SRT_TAG_PATTERN
+from core.text_metrics import CELL_METRICS, AdvanceCache, balanced_break, join_lines, visible_length
+from core.progress import step_progress
+from tool_jobs import ToolJobMixin
+
 # Self-definition for the Split Lines tool
 TOOL_DEFINITION = {
     "display_name": "✂️ Split Lines",
     "description": "Split long subtitle lines into two.",
-    "widget_class_name": "SplitTool"
+    "widget_class_name": "SplitTool",
+    "can_open_file": True,
+    # Headless entry point used by the subtl command line (see subtl.py)
+    "batch_function_name": "split_lines_in_file",
+    "batch_output_suffix": "_Subtl_Split",
+    "batch_options": {
+        "max_width": {"type": "int", "default": 42,
+                      "help": "Maximum line width in characters, CJK characters count twice."},
+        "mode": {"type": "str", "default": "lines", "choices": ["lines", "cues"],
+                 "help": "'lines' wraps long cues onto two lines and only splits them into two cues "
+                         "when two lines are not enough, 'cues' always splits them into two cues."},
+    },
 }
 
-class SplitTool(QWidget):
-    """Placeholder widget for the Split Lines tool."""
+# Split modes, in the order of the UI's mode combo box
+SPLIT_MODES = ["lines", "cues"]
+
+# Progress is reported every this many cues while splitting.
+PROGRESS_INTERVAL_CUES = 10_000
+
+# Glyph advances per font, keyed by QFont.key(). Every character is
+# measured once per font, shared by all jobs of the session.
+FONT_ADVANCE_CACHES = {}
+
+
+def font_metrics(family, pixel_size):
+    """Returns the AdvanceCache of a font, measuring with QFontMetricsF. Needs a Qt application."""
+    font = QFont(family)
+    font.setPixelSize(pixel_size)
+    cache = FONT_ADVANCE_CACHES.get(font.key())
+    if cache is None:
+        cache = AdvanceCache(QFontMetricsF(font).horizontalAdvance)
+        FONT_ADVANCE_CACHES[font.key()] = cache
+    return cache
+
+# --- Split Backend ---
+# Everything but font_metrics() runs without a Qt application, so it also
+# runs in batch workers, where widths are counted in character cells.
+
+def carry_open_tags(upper, lower):
+    """
+    Closes the SRT tags still open at the end of upper and reopens them at
+    the start of lower, so both halves of a split cue are well-formed.
+    """
+    open_tags = []
+    for match in SRT_TAG_PATTERN.finditer(upper):
+        name = match.group(2).lower()
+        if not match.group(1):
+            open_tags.append((name, match.group(0)))
+            continue
+        for index in range(len(open_tags) - 1, -1, -1):
+            if open_tags[index][0] == name:
+                del open_tags[index]
+                break
+    upper += ''.join(f"</{name}>" for name, _ in reversed(open_tags))
+    lower = ''.join(tag for _, tag in open_tags) + lower
+    return upper, lower
+
+
+def split_text(text, metrics):
+    """Breaks a single line of text into two balanced parts, or returns None if it cannot be broken."""
+    cut = balanced_break(text, metrics)
+    if cut is None:
+        return None
+    return text[:cut[0]].rstrip(), text[cut[1]:].lstrip()
+
+
+def wrap_two_lines(text, metrics, max_width):
+    """Returns text rewrapped onto two balanced lines, or None if it does not fit on two lines."""
+    if max(metrics.line_widths(text)) <= max_width:
+        return text
+    parts = split_text(join_lines(text), metrics)
+    if parts is None:
+        return None
+    wrapped = '\n'.join(parts)
+    return wrapped if max(metrics.line_widths(wrapped)) <= max_width else None
+
+
+def split_cue(cue, metrics, max_width, mode="lines"):
+    """
+    Returns the cues an over-long cue becomes: the cue wrapped onto two lines
+    (mode 'lines', when they fit) or two cues, each on one or two lines. The
+    duration is shared in proportion to the characters of each half. A cue
+    that cannot be broken anywhere is returned unchanged.
+    """
+    if mode == "lines":
+        wrapped = wrap_two_lines(cue.text, metrics, max_width)
+        if wrapped is not None:
+            return [Cue(cue.start, cue.end, wrapped)]
+
+    parts = split_text(join_lines(cue.text), metrics)
+    if parts is None:
+        return [cue]
+    upper, lower = carry_open_tags(*parts)
+    upper_length, lower_length = visible_length(upper), visible_length(lower)
+    middle = cue.start + round((cue.end - cue.start) * upper_length / ((upper_length + lower_length) or 2))
+    return [
+        Cue(cue.start, middle, wrap_two_lines(upper, metrics, max_width) or upper),
+        Cue(middle, cue.end, wrap_two_lines(lower, metrics, max_width) or lower),
+    ]
+
+
+def split_long_cues(store, max_width, mode="lines", metrics=CELL_METRICS, progress=None):
+    """
+    Yields the cues of a CueStore with every cue wider than max_width split.
+
+    The widest line of every cue is measured first, in one pass over the
+    whole store; the layout work then only visits the cues that need it.
+    """
+    texts = store.texts()
+    widths = np.fromiter((max(metrics.line_widths(text)) for text in texts), dtype=np.float64, count=len(texts))
+    over_long = widths > max_width
+
+    for i, text in enumerate(texts):
+        if progress and i % PROGRESS_INTERVAL_CUES == 0:
+            progress(i, len(texts))
+        cue = Cue(store.starts[i], store.ends[i], text)
+        if over_long[i]:
+            yield from split_cue(cue, metrics, max_width, mode)
+        else:
+            yield cue
+
+
+def split_lines_in_file(input_path, output_path, max_width=42, mode="lines", metrics=CELL_METRICS, progress=None):
+    """
+    Splits the over-long cues of an SRT file and writes the result to
+    output_path. Returns the number of cues written.
+    """
+    store = CueStore.from_file(input_path, progress=step_progress(progress, 0, 2))
+    cues = split_long_cues(store, max_width, mode, metrics, step_progress(progress, 1, 2))
+    return write_srt(output_path, cues, encoding='utf-8')
+
+
+class SplitTool(ToolJobMixin, QWidget):
+    """
+    UI widget for the Split Lines tool.
+    """
+    JOB_TITLE = "Split Lines"
+
     def __init__(self):
         super().__init__()
+        self.input_file_path = None
+
+        # Add a property to identify this as a tool widget for styling
         self.setProperty("class", "tool-widget")
-        
+
         layout = QVBoxLayout(self)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        label = QLabel(f"{TOOL_DEFINITION['display_name']} - Placeholder")
-        label.setObjectName("placeholder_label")
-        
-        layout.addWidget(label)
\ No newline at end of file
+        layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+
+        # File selection
+        file_select_button = QPushButton("Select SRT File")
+        file_select_button.clicked.connect(self.select_file)
+        self.file_path_label = QLabel("No file selected.")
+        self.file_path_label.setWordWrap(True)
+        # Set an object name for specific styling
+        self.file_path_label.setObjectName("file_path_label")
+        description_label = QLabel(TOOL_DEFINITION["description"])
+
+        options_layout = QFormLayout()
+        self.max_width_input = QSpinBox()
+        self.max_width_input.setRange(1, 5000)
+        self.max_width_input.setValue(42)
+        self.max_width_input.setSuffix(" characters")
+        options_layout.addRow("Maximum line width:", self.max_width_input)
+
+        self.mode_combo = QComboBox()
+        self.mode_combo.addItems(["Two lines, two cues if needed", "Two cues"])
+        options_layout.addRow("Split into:", self.mode_combo)
+
+        # Optional measurement with a real font, the width is then in pixels
+        self.use_font_checkbox = QCheckBox("Measure with font")
+        self.use_font_checkbox.toggled.connect(self._toggle_font_options)
+        font_layout = QHBoxLayout()
+        self.font_combo = QFontComboBox()
+        self.font_size_input = QSpinBox()
+        self.font_size_input.setRange(6, 200)
+        self.font_size_input.setValue(48)
+        self.font_size_input.setSuffix(" px")
+        font_layout.addWidget(self.font_combo, 1)
+        font_layout.addWidget(self.font_size_input)
+        options_layout.addRow(self.use_font_checkbox, font_layout)
+        self._toggle_font_options(False)
+
+        # Apply button
+        self.apply_button = QPushButton("Apply and Save As...")
+        self.apply_button.clicked.connect(self.apply_split)
+
+        # Add widgets to layout
+        layout.addWidget(file_select_button)
+        layout.addWidget(self.file_path_label)
+        layout.addSpacing(20)
+        layout.addWidget(description_label)
+        layout.addLayout(options_layout)
+        layout.addSpacing(20)
+        layout.addWidget(self.apply_button)
+
+    def _toggle_font_options(self, checked):
+        """Enables the font inputs and switches the width unit between characters and pixels."""
+        self.font_combo.setEnabled(checked)
+        self.font_size_input.setEnabled(checked)
+        self.max_width_input.setSuffix(" px" if checked else " characters")
+
+    def select_file(self):
+        """
+        Open a file dialog to select an SRT file.
+        """
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open SRT File", "", "SubRip Files (*.srt)")
+        if file_path:
+            self.load_file(file_path)
+
+    def load_file_on_startup(self, file_path: str):
+        """
+        Loads a file when the tool is opened directly with a file.
+        This method is called by the TabManager.
+        """
+        if os.path.exists(file_path) and file_path.endswith('.srt'):
+            self.load_file(file_path)
+        else:
+            self.file_path_label.setText(f"Error: Invalid or non-existent file provided.")
+
+    def load_file(self, file_path):
+        """
+        A central method to handle the logic of loading a file into the tool.
+        """
+        self.input_file_path = file_path
+        self.file_path_label.setText(f"Selected: {file_path}")
+
+    def apply_split(self):
+        """
+        Split the over-long cues of the selected SRT file and save it.
+        The suggested save name is based on the original name.
+        """
+        if not self.input_file_path:
+            QMessageBox.warning(self, "Warning", "Please select an SRT file first.")
+            return
+
+        max_width = self.max_width_input.value()
+        mode = SPLIT_MODES[self.mode_combo.currentIndex()]
+        metrics = CELL_METRICS
+        if self.use_font_checkbox.isChecked():
+            # QFontMetricsF is reentrant, the job measures new characters on its own thread.
+            metrics = font_metrics(self.font_combo.currentFont().family(), self.font_size_input.value())
+
+        try:
+            directory = os.path.dirname(self.input_file_path)
+            file_name, file_ext = os.path.splitext(os.path.basename(self.input_file_path))
+            default_save_path = os.path.join(directory, f"{file_name}_Subtl_Split{file_ext}")
+
+            output_file_path, _ = QFileDialog.getSaveFileName(self, "Save SRT File As...", default_save_path, "SubRip Files (*.srt)")
+
+            if output_file_path:
+                self._start_job(output_file_path, split_lines_in_file, self.input_file_path, output_file_path,
+                                max_width, mode, metrics)
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"An error occurred: {e}")
+
+    def _tool_state(self):
+        return {
+            "input_file_path": self.input_file_path,
+            "max_width": self.max_width_input.value(),
+            "mode_index": self.mode_combo.currentIndex(),
+            "use_font": self.use_font_checkbox.isChecked(),
+            "font_family": self.font_combo.currentFont().family(),
+            "font_size": self.font_size_input.value(),
+        }
+
+    def restore_state(self, state):
+        """Restores the inputs returned by save_state() on a freshly created widget."""
+        if state.get("input_file_path"):
+            self.load_file(state["input_file_path"])
+        self.use_font_checkbox.setChecked(state.get("use_font", False))
+        if state.get("font_family"):
+            self.font_combo.setCurrentFont(QFont(state["font_family"]))
+        self.font_size_input.setValue(state.get("font_size", 48))
+        self.max_width_input.setValue(state.get("max_width", 42))
+        self.mode_combo.setCurrentIndex(state.get("mode_index", 0))
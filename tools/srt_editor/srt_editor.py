@@ -1,13 +1,27 @@
 # tools/srt_editor/srt_editor.py
 
+import os
 import re
+from collections import namedtuple
+import numpy as np
 import qtawesome as qta
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QPlainTextEdit, QLineEdit, QLabel
-from PySide6.QtCore import Qt, QRegularExpression
-from PySide6.QtGui import QSyntaxHighlighter, QTextCharFormat, QColor, QFont, QTextDocument, QTextCursor
+from PySide6.QtWidgets import (QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QFileDialog, QPlainTextEdit,
+                               QLineEdit, QLabel, QStackedWidget, QTableView, QAbstractItemView, QHeaderView,
+                               QTextEdit, QSpinBox)
+from PySide6.QtCore import Qt, QObject, QAbstractTableModel, QModelIndex, Signal, QTimer, QPoint, QEvent, QSettings
+from PySide6.QtGui import (QSyntaxHighlighter, QTextCharFormat, QColor, QFont, QTextCursor,
+                           QTextLayout, QPalette, QKeySequence)
 
 # Import the global style manager to get the current theme
 from styles import style_manager
+from core.cue_store import CueStore
+from core.timecode import parse_timestamp, format_timestamp
+from core.srt_stream import TIMING_PATTERN, read_text
+from core.text_search import compile_query, build_occurrence_index
+from core.piece_table import PieceTable, Piece, join_pieces, merge_splices, undo_edits, redo_edits
+from core.edit_history import EditHistory
+from jobs import job_manager
+from settings_dialog import ORGANIZATION_NAME, APPLICATION_NAME
 # Import this tool's specific style definitions
 from . import srt_editor_styles
 
@@ -18,40 +32,772 @@ TOOL_DEFINITION = {
     "can_open_file": True
 }
 
+# Files larger than this open in the table view, without building a text document.
+TABLE_VIEW_THRESHOLD_BYTES = 2 * 1024 * 1024
+
+# Documents with more lines than this are only highlighted where they are visible.
+VIEWPORT_HIGHLIGHT_THRESHOLD_LINES = 20_000
+
+# Edits changing more characters than this rebuild the search index instead of updating it.
+INCREMENTAL_SEARCH_MAX_CHARS = 64 * 1024
+# Upper bound on the matches highlighted at once, only the visible ones are.
+MAX_MATCH_SELECTIONS = 1000
+# Delay between typing in the find input and searching, in milliseconds.
+SEARCH_DELAY_MS = 150
+
+# Memory each view's undo history may use, unless changed in the settings.
+DEFAULT_UNDO_HISTORY_MB = 64
+
+# --- Line Classification ---
+LINE_BLANK, LINE_INDEX, LINE_TIMING, LINE_TEXT = range(4)
+
+# SRT inline tags: <i>, <b>, <u> and <font ...>, opening or closing.
+TAG_PATTERN = re.compile(r'<(/?)(i|b|u|font)(\s[^>]*)?>', re.IGNORECASE)
+FONT_COLOR_PATTERN = re.compile(r'color\s*=\s*["\']?(#?\w+)', re.IGNORECASE)
+
+# Style tags left open at the end of a line carry over to the next one. They
+# are kept in the block state, one bit per tag.
+TAG_BITS = {"i": 1, "b": 2, "u": 4}
+
+def classify_line(text):
+    """
+    Classifies one SRT line with plain string checks. The timing regex only
+    runs on lines that contain '-->'.
+    """
+    stripped = text.strip()
+    if not stripped:
+        return LINE_BLANK
+    if stripped.isdigit():
+        return LINE_INDEX
+    if '-->' in stripped and TIMING_PATTERN.match(stripped):
+        return LINE_TIMING
+    return LINE_TEXT
+
+
+class SrtLineFormatter:
+    """
+    Computes the formats of one line, shared by both highlighters.
+    Plain text lines get no format at all, the editor's palette colors them.
+    """
+    def __init__(self, formats):
+        self.formats = formats
+        self._style_formats = {}
+
+    def format_line(self, text, tag_state=0):
+        """
+        Returns (ranges, tag_state) for a line, ranges being a list of
+        (start, length, QTextCharFormat) and tag_state the open style tags
+        passed on to the next line.
+        """
+        line_class = classify_line(text)
+        if line_class == LINE_INDEX:
+            return [(0, len(text), self.formats['index'])], 0
+        if line_class == LINE_TIMING:
+            return [(0, len(text), self.formats['time'])], 0
+        if line_class == LINE_BLANK:
+            return [], 0
+        if '<' not in text:
+            if not tag_state:
+                return [], 0
+            return [(0, len(text), self._style_format(tag_state, None))], tag_state
+        return self._format_tags(text, tag_state)
+
+    def _format_tags(self, text, tag_state):
+        """Colors the tags themselves and styles the text between them."""
+        ranges = []
+        color = None
+        position = 0
+        for match in TAG_PATTERN.finditer(text):
+            if match.start() > position and (tag_state or color):
+                ranges.append((position, match.start() - position, self._style_format(tag_state, color)))
+            ranges.append((match.start(), match.end() - match.start(), self.formats['tag']))
+
+            closing, name = match.group(1), match.group(2).lower()
+            if name == "font":
+                color_match = FONT_COLOR_PATTERN.search(match.group(3) or "")
+                color = None if closing or not color_match else color_match.group(1)
+            elif closing:
+                tag_state &= ~TAG_BITS[name]
+            else:
+                tag_state |= TAG_BITS[name]
+            position = match.end()
+
+        if position < len(text) and (tag_state or color):
+            ranges.append((position, len(text) - position, self._style_format(tag_state, color)))
+        return ranges, tag_state
+
+    def _style_format(self, tag_state, color):
+        """Returns the (cached) format for a combination of style tags and font color."""
+        key = (tag_state, color)
+        text_format = self._style_formats.get(key)
+        if text_format is None:
+            text_format = QTextCharFormat(self.formats['text'])
+            text_format.setFontItalic(bool(tag_state & TAG_BITS["i"]))
+            if tag_state & TAG_BITS["b"]:
+                text_format.setFontWeight(QFont.Weight.Bold)
+            text_format.setFontUnderline(bool(tag_state & TAG_BITS["u"]))
+            if color and QColor.isValidColorName(color):
+                text_format.setForeground(QColor(color))
+            self._style_formats[key] = text_format
+        return text_format
+
+
 # --- Syntax Highlighter ---
 class SrtHighlighter(QSyntaxHighlighter):
     """A syntax highlighter for the SRT subtitle format."""
     def __init__(self, parent, formats):
         super().__init__(parent)
-        self.formats = formats
-        
-        # Regex for SRT parts
-        self.rules = [
-            # Rule for the timestamp line
-            (QRegularExpression(r"^\d{2}:\d{2}:\d{2},\d{3}\s-->\s\d{2}:\d{2}:\d{2},\d{3}$"), "time"),
-            # Rule for the sequence number line (must be a line containing only digits)
-            (QRegularExpression(r"^\d+$"), "index"),
-        ]
+        self.formatter = SrtLineFormatter(formats)
 
     def highlightBlock(self, text):
         """Highlights a block of text (a line in this case)."""
-        # Default to the text format
-        self.setFormat(0, len(text), self.formats["text"])
+        previous_state = self.previousBlockState()
+        ranges, tag_state = self.formatter.format_line(text, max(previous_state, 0))
+        for start, length, text_format in ranges:
+            self.setFormat(start, length, text_format)
+        self.setCurrentBlockState(tag_state)
+
+
+class ViewportHighlighter(QObject):
+    """
+    Highlights only the blocks of a QPlainTextEdit that are scrolled into view,
+    for documents too large to highlight up front. Formats are set on the
+    blocks' layouts, as QSyntaxHighlighter does, and recomputed after edits.
+
+    Block user states: -1 never highlighted, >= 0 highlighted (the tag state
+    after the line), <= -2 edited since it was highlighted (-2 - old state).
+    """
+    # Lines walked back at most to find the tag state a line starts with.
+    MAX_LOOKBEHIND_LINES = 100
+
+    def __init__(self, editor, formats):
+        super().__init__(editor)
+        self.editor = editor
+        self.formatter = SrtLineFormatter(formats)
+        self.enabled = False
+        self._applying = False
+        editor.updateRequest.connect(self.highlight_visible_blocks)
+        editor.document().contentsChange.connect(self._on_contents_change)
+
+    def set_enabled(self, enabled):
+        self.enabled = enabled
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        if not self.enabled or self._applying or (chars_removed == 0 and chars_added == 0):
+            return
+        # Blocks created by the edit start at -1, only the edited block needs marking.
+        self._mark_edited(self.editor.document().findBlock(position))
+
+    def _mark_edited(self, block):
+        state = block.userState()
+        if block.isValid() and state >= 0:
+            block.setUserState(-2 - state)
+
+    def _state_before(self, block):
+        """Returns the tag state block starts with, replaying the lines above it if needed."""
+        lines = []
+        previous = block.previous()
+        while previous.isValid() and previous.userState() < 0 and previous.text().strip():
+            if len(lines) >= self.MAX_LOOKBEHIND_LINES:
+                break
+            lines.append(previous.text())
+            previous = previous.previous()
+        tag_state = previous.userState() if previous.isValid() and previous.userState() >= 0 else 0
+        for text in reversed(lines):
+            _, tag_state = self.formatter.format_line(text, tag_state)
+        return tag_state
+
+    def highlight_visible_blocks(self, *args):
+        """Highlights the visible blocks that are not highlighted yet or were edited."""
+        if not self.enabled or self._applying:
+            return
+        document = self.editor.document()
+        offset = self.editor.contentOffset()
+        bottom = self.editor.viewport().rect().bottom()
+        block = self.editor.firstVisibleBlock()
+        tag_state = None
+
+        self._applying = True
+        try:
+            while block.isValid():
+                if self.editor.blockBoundingGeometry(block).translated(offset).top() > bottom:
+                    break
+                stored_state = block.userState()
+                if stored_state >= 0:
+                    tag_state = stored_state
+                else:
+                    if tag_state is None:
+                        tag_state = self._state_before(block)
+                    ranges, tag_state = self.formatter.format_line(block.text(), tag_state)
+                    self._apply_ranges(document, block, ranges)
+                    block.setUserState(tag_state)
+                    # The next line starts from this state, it is stale if the state changed.
+                    if stored_state == -1 or -2 - stored_state != tag_state:
+                        self._mark_edited(block.next())
+                block = block.next()
+        finally:
+            self._applying = False
+
+    def _apply_ranges(self, document, block, ranges):
+        format_ranges = []
+        for start, length, text_format in ranges:
+            format_range = QTextLayout.FormatRange()
+            format_range.start = start
+            format_range.length = length
+            format_range.format = text_format
+            format_ranges.append(format_range)
+        block.layout().setFormats(format_ranges)
+        document.markContentsDirty(block.position(), block.length())
+
+
+# --- Search ---
+class DocumentSearch(QObject):
+    """
+    Finds all matches of a pattern in a QPlainTextEdit's document. The index
+    is built on the job pool, then kept up to date on every edit by searching
+    the edited lines again. Only the matches in the viewport are highlighted.
+    """
+    # Emitted when the match count or the current match changed.
+    matches_changed = Signal()
+
+    def __init__(self, editor, match_format, current_match_format):
+        super().__init__(editor)
+        self.editor = editor
+        self.match_format = match_format
+        self.current_match_format = current_match_format
+        self.pattern = None
+        # The OccurrenceIndex, None while it is being built.
+        self.index = None
+        # Number of the selected match, -1 if the cursor is not on one.
+        self.current = -1
+        self._job = None
+        # Edits made while the index was being built, replayed on it afterwards.
+        self._pending_edits = []
+        # Find requested while the index was being built: 1 next, -1 previous.
+        self._pending_step = 0
+        # What the extra selections were built for, they are only rebuilt when it changes.
+        self._selections_key = None
+        self._version = 0
+
+        editor.document().contentsChange.connect(self._on_contents_change)
+        editor.updateRequest.connect(self.update_selections)
+
+    def is_searching(self):
+        return self.pattern is not None and self.index is None
+
+    def set_pattern(self, pattern):
+        """Searches for a compiled pattern (see compile_query), or clears the search for None."""
+        self.pattern = pattern
+        if pattern is None:
+            self._cancel_job()
+            self.index = None
+            self._changed()
+            return
+        self.rebuild()
+
+    def rebuild(self):
+        """Searches the whole document again, on the job pool."""
+        self._cancel_job()
+        self.index = None
+        self._pending_edits = []
+        # Kept out of the jobs indicator, a new search starts on every keystroke.
+        self._job = job_manager.submit_background(build_occurrence_index, self.editor.toPlainText(), self.pattern)
+        self._job.signals.finished.connect(self._on_index_built)
+        self._changed()
+
+    def _cancel_job(self):
+        if self._job:
+            self._job.cancel()
+            self._job = None
+        self._pending_step = 0
+
+    def _on_index_built(self, index):
+        if self._job is None or self.sender() is not self._job.signals:
+            return  # A search that was replaced in the meantime
+        self._job = None
+        for begin, old_end, new_text in self._pending_edits:
+            index.replace_lines(begin, old_end, new_text)
+        self._pending_edits = []
+        self.index = index
+        self._changed()
+        if self._pending_step:
+            step, self._pending_step = self._pending_step, 0
+            self.find(step)
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        if self.pattern is None or (chars_removed == 0 and chars_added == 0):
+            return
+        if chars_removed + chars_added > INCREMENTAL_SEARCH_MAX_CHARS:
+            self.rebuild()
+            return
+
+        # The edited lines, as they are now.
+        document = self.editor.document()
+        block = document.findBlock(position)
+        last_block = document.findBlock(position + chars_added)
+        if not last_block.isValid():
+            last_block = document.lastBlock()
+        begin = block.position()
+        lines = [block.text()]
+        while block != last_block and block.isValid():
+            block = block.next()
+            lines.append(block.text())
+        new_text = "\n".join(lines)
+        old_end = begin + len(new_text) - chars_added + chars_removed
+
+        if self.index is None:
+            self._pending_edits.append((begin, old_end, new_text))
+        elif self.index.replace_lines(begin, old_end, new_text):
+            self._changed()
+
+    def _changed(self):
+        self.current = -1
+        self._version += 1
+        self.update_selections()
+        self.matches_changed.emit()
+
+    def find(self, step=1):
+        """Selects the next (step 1) or previous (step -1) match, wrapping around."""
+        if self.pattern is None:
+            return
+        if self.index is None:
+            self._pending_step = step
+            return
+        if not len(self.index):
+            return
+
+        cursor = self.editor.textCursor()
+        if self.current >= 0 and self.index.span(self.current) == (cursor.selectionStart(), cursor.selectionEnd()):
+            # Still on the current match, the next one is just the next number.
+            number = (self.current + step) % len(self.index)
+        elif step > 0:
+            number = self.index.next_from(cursor.selectionEnd())
+        else:
+            number = self.index.previous_before(cursor.selectionStart())
+
+        start, end = self.index.span(number)
+        cursor.setPosition(start)
+        cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+        self.editor.setTextCursor(cursor)
+        self.current = number
+        self._version += 1
+        self.update_selections()
+        self.matches_changed.emit()
+
+    def update_selections(self, *args):
+        """Highlights the matches in the viewport."""
+        if self.index is None:
+            key = None
+        else:
+            viewport = self.editor.viewport()
+            first = self.editor.firstVisibleBlock().position()
+            last_block = self.editor.cursorForPosition(QPoint(viewport.width(), viewport.height())).block()
+            key = (first, last_block.position() + last_block.length(), self._version)
+        if key == self._selections_key:
+            return
+        self._selections_key = key
+
+        selections = []
+        if key is not None:
+            first_number = self.index.first_at_or_after(key[0])
+            last_number = min(self.index.first_at_or_after(key[1]), first_number + MAX_MATCH_SELECTIONS)
+            for number in range(first_number, last_number):
+                start, end = self.index.span(number)
+                selection = QTextEdit.ExtraSelection()
+                selection.cursor = QTextCursor(self.editor.document())
+                selection.cursor.setPosition(start)
+                selection.cursor.setPosition(end, QTextCursor.MoveMode.KeepAnchor)
+                selection.format = self.current_match_format if number == self.current else self.match_format
+                selections.append(selection)
+        self.editor.setExtraSelections(selections)
+
+
+# --- Undo History ---
+class TextHistory(QObject):
+    """
+    Undo and redo for a QPlainTextEdit, in place of the document's own undo
+    stack, which keeps a full copy of whatever a bulk edit replaced.
+
+    A PieceTable mirrors the document. Every edit is recorded as the pieces
+    it removed from the mirror and the text it inserted, read back from the
+    document, so recording and undoing an edit cost O(edit size) whatever
+    the size of the document.
+    """
+    # Emitted when an edit was recorded, undone or redone.
+    changed = Signal()
+    # Emitted with the (position, length, text) edits of every change of the
+    # text but set_text(), in the order they were made.
+    edited = Signal(object)
+
+    def __init__(self, editor, max_bytes):
+        super().__init__(editor)
+        self.editor = editor
+        self.document = editor.document()
+        self.document.setUndoRedoEnabled(False)
+        self.pieces = PieceTable()
+        self.history = EditHistory(max_bytes)
+        # Set while the document is changed from here, those edits are recorded already.
+        self._applying = False
+        self.document.contentsChange.connect(self._on_contents_change)
+
+    def set_text(self, text):
+        """Replaces the whole text, which starts a new history."""
+        self._applying = True
+        try:
+            self.editor.setPlainText(text)
+        finally:
+            self._applying = False
+        self.pieces = PieceTable(text)
+        self.history.clear()
+        self.changed.emit()
+
+    def restore(self, pieces, history):
+        """Takes over the mirror and history of an editor showing the same text."""
+        self.pieces = pieces
+        self.history = history
+        self.changed.emit()
+
+    def _on_contents_change(self, position, chars_removed, chars_added):
+        if self._applying:
+            return
+        # Edits reaching the end of the document also count its final
+        # paragraph separator, which is not part of the text.
+        old_length = len(self.pieces)
+        new_length = self.document.characterCount() - 1
+        chars_removed = min(chars_removed, old_length - position)
+        chars_added = chars_removed + new_length - old_length
+        if not chars_removed and not chars_added:
+            return
+
+        cursor = QTextCursor(self.document)
+        cursor.setPosition(position)
+        cursor.setPosition(position + chars_added, QTextCursor.MoveMode.KeepAnchor)
+        # Block separators come back as U+2029.
+        text = cursor.selectedText().replace('\u2029', '\n')
+        if chars_removed == chars_added and self.pieces.substring(position, chars_removed) == text:
+            return  # Only formats changed
+        splice = self.pieces.replace(position, chars_removed, text)
+        self.history.record(splice, self.pieces.splice_bytes(splice), merge=self._merge_typing)
+        self.edited.emit([(position, chars_removed, text)])
+        self.changed.emit()
+
+    @staticmethod
+    def _merge_typing(last, splice):
+        # Typing or deleting on a line is undone at once, a line break is a step of its own.
+        if '\n' in join_pieces(last.inserted) or '\n' in join_pieces(splice.inserted):
+            return None
+        return merge_splices(last, splice)
+
+    def replace_ranges(self, ranges):
+        """
+        Replaces (position, length, text) ranges of the document, given in
+        ascending order and not overlapping, as a single undo step.
+        """
+        # Applied from the last one, so the positions of the others stay valid.
+        edits = [(position, length, [Piece(text, 0, len(text))] if text else [])
+                 for position, length, text in reversed(ranges)]
+        splices = self._apply(edits, move_cursor=False)
+        with self.history.group():
+            for splice in splices:
+                self.history.record(splice, self.pieces.splice_bytes(splice))
+        self.changed.emit()
+
+    def replay(self, ranges):
+        """Makes (position, length, text) edits again in order, e.g. from a journal, without recording them."""
+        self._apply([(position, length, [Piece(text, 0, len(text))] if text else [])
+                     for position, length, text in ranges], move_cursor=False)
+        self.changed.emit()
+
+    def undo(self):
+        splices = self.history.undo()
+        if splices is not None:
+            self._apply(undo_edits(splices))
+            self.changed.emit()
+
+    def redo(self):
+        splices = self.history.redo()
+        if splices is not None:
+            self._apply(redo_edits(splices))
+            self.changed.emit()
+
+    def _apply(self, edits, move_cursor=True):
+        """
+        Applies (position, length, pieces) edits in order, to the document in
+        one edit block and to the mirror. Returns the Splices they made.
+        """
+        cursor = QTextCursor(self.document)
+        ranges = []
+        self._applying = True
+        cursor.beginEditBlock()
+        try:
+            for position, length, pieces in edits:
+                cursor.setPosition(position)
+                cursor.setPosition(position + length, QTextCursor.MoveMode.KeepAnchor)
+                text = join_pieces(pieces)
+                ranges.append((position, length, text))
+                if text:
+                    cursor.insertText(text)
+                else:
+                    cursor.removeSelectedText()
+        finally:
+            cursor.endEditBlock()
+            self._applying = False
+        if move_cursor and edits:
+            self.editor.setTextCursor(cursor)
+        splices = self.pieces.apply_edits(edits)
+        self.edited.emit(ranges)
+        return splices
+
+
+# Cue table edits, undone by writing the old values back.
+CueTimesEdit = namedtuple('CueTimesEdit', ['first_row', 'old_starts', 'old_ends', 'new_starts', 'new_ends'])
+CueTextEdit = namedtuple('CueTextEdit', ['row', 'old_text', 'new_text'])
+
+
+# --- Cue Table Model ---
+class CueTableModel(QAbstractTableModel):
+    """
+    A table model over a CueStore with index, start, end and text columns.
+
+    Rows are exposed in batches through canFetchMore()/fetchMore(), and cell
+    values are only formatted when the view asks for a visible cell. Edits
+    are written straight back into the store and recorded in an EditHistory
+    as the values they replaced.
+    """
+    COLUMNS = ("#", "Start", "End", "Text")
+    INDEX_COLUMN, START_COLUMN, END_COLUMN, TEXT_COLUMN = range(4)
+    FETCH_BATCH_SIZE = 500
+    # Line breaks are shown and edited as ASS-style markers, a cell holds one line.
+    LINE_BREAK_MARKER = "\\N"
+
+    # Emitted after an edit changed the store.
+    cues_edited = Signal()
+    # Emitted with every edit written into the store, and whether its old values were.
+    edit_written = Signal(object, bool)
+
+    def __init__(self, cue_store=None, parent=None, max_history_bytes=DEFAULT_UNDO_HISTORY_MB * 1024 * 1024):
+        super().__init__(parent)
+        self.cue_store = cue_store if cue_store is not None else CueStore()
+        self.history = EditHistory(max_history_bytes)
+        self._fetched_rows = 0
+
+    def set_cue_store(self, cue_store):
+        """Replaces the store the model shows, which starts a new history."""
+        self.beginResetModel()
+        self.cue_store = cue_store
+        self.history.clear()
+        self._fetched_rows = 0
+        self.endResetModel()
+        # The first batch right away, the view fetches the rest as it scrolls.
+        self.fetchMore()
+
+    # --- Lazy Row Fetching ---
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._fetched_rows < len(self.cue_store)
+
+    def fetchMore(self, parent=QModelIndex()):
+        if parent.isValid():
+            return
+        self.fetch_up_to(self._fetched_rows + self.FETCH_BATCH_SIZE - 1)
+
+    def fetch_up_to(self, row):
+        """Makes every row up to and including row available to the view."""
+        last_row = min(row, len(self.cue_store) - 1)
+        if last_row < self._fetched_rows:
+            return
+        self.beginInsertRows(QModelIndex(), self._fetched_rows, last_row)
+        self._fetched_rows = last_row + 1
+        self.endInsertRows()
+
+    # --- Model Interface ---
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else self._fetched_rows
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.COLUMNS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if role == Qt.ItemDataRole.DisplayRole and orientation == Qt.Orientation.Horizontal:
+            return self.COLUMNS[section]
+        return None
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        flags = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        if index.column() != self.INDEX_COLUMN:
+            flags |= Qt.ItemFlag.ItemIsEditable
+        return flags
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role in (Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole):
+            if column == self.INDEX_COLUMN:
+                return row + 1
+            if column == self.START_COLUMN:
+                return format_timestamp(self.cue_store.starts[row])
+            if column == self.END_COLUMN:
+                return format_timestamp(self.cue_store.ends[row])
+            return self.cue_store.text(row).replace("\n", self.LINE_BREAK_MARKER)
+        if role == Qt.ItemDataRole.ToolTipRole and column == self.TEXT_COLUMN:
+            return self.cue_store.text(row)
+        if role == Qt.ItemDataRole.TextAlignmentRole and column != self.TEXT_COLUMN:
+            return Qt.AlignmentFlag.AlignCenter
+        return None
 
-        for pattern, format_name in self.rules:
-            it = pattern.globalMatch(text)
-            while it.hasNext():
-                match = it.next()
-                self.setFormat(match.capturedStart(), match.capturedLength(), self.formats[format_name])
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        """Writes an edited cell back into the store. Invalid timestamps are rejected."""
+        if not index.isValid() or role != Qt.ItemDataRole.EditRole:
+            return False
+        row, column = index.row(), index.column()
+
+        if column in (self.START_COLUMN, self.END_COLUMN):
+            try:
+                milliseconds = parse_timestamp(str(value).strip())
+            except ValueError:
+                return False
+            start_ms, end_ms = self.cue_store.starts[row], self.cue_store.ends[row]
+            if column == self.START_COLUMN:
+                start_ms = milliseconds
+            else:
+                end_ms = milliseconds
+            if start_ms < 0 or end_ms < start_ms:
+                return False
+            edit = CueTimesEdit(row, np.array([self.cue_store.starts[row]]), np.array([self.cue_store.ends[row]]),
+                                np.array([start_ms]), np.array([end_ms]))
+            self.history.record(edit, 4 * 8)
+        elif column == self.TEXT_COLUMN:
+            text = str(value).replace(self.LINE_BREAK_MARKER, "\n")
+            edit = CueTextEdit(row, self.cue_store.text(row), text)
+            self.history.record(edit, len(edit.old_text) + len(edit.new_text))
+        else:
+            return False
+
+        self._write_edit(edit, undo=False)
+        self.cues_edited.emit()
+        return True
+
+    # --- Bulk Edits and History ---
+
+    def shift_times(self, rows, shift_ms):
+        """
+        Shifts the cues in rows (or all of them for None) by shift_ms,
+        stopping at zero, as a single undo step. Each run of consecutive rows
+        is shifted as one NumPy slice.
+        """
+        if rows is None:
+            runs = [(0, len(self.cue_store))] if len(self.cue_store) else []
+        else:
+            runs = []
+            for row in sorted(set(rows)):
+                if runs and runs[-1][1] == row:
+                    runs[-1] = (runs[-1][0], row + 1)
+                else:
+                    runs.append((row, row + 1))
+        with self.history.group():
+            for first_row, end_row in runs:
+                # Views over the array('q') buffers, released before anything may resize them.
+                starts = np.frombuffer(self.cue_store.starts, dtype=np.int64)[first_row:end_row]
+                ends = np.frombuffer(self.cue_store.ends, dtype=np.int64)[first_row:end_row]
+                edit = CueTimesEdit(first_row, starts.copy(), ends.copy(),
+                                    np.maximum(starts + shift_ms, 0), np.maximum(ends + shift_ms, 0))
+                del starts, ends
+                self.history.record(edit, 4 * edit.old_starts.nbytes)
+                self._write_edit(edit, undo=False)
+        self.cues_edited.emit()
+
+    def apply_edit(self, edit):
+        """Writes the new values of an edit without recording it, e.g. one replayed from a journal."""
+        self._write_edit(edit, undo=False)
+        self.cues_edited.emit()
+
+    def undo(self):
+        """Undoes the last edit step. Returns the first row it changed, or None."""
+        edits = self.history.undo()
+        if edits is None:
+            return None
+        for edit in reversed(edits):
+            self._write_edit(edit, undo=True)
+        self.cues_edited.emit()
+        return edits[0][0]
+
+    def redo(self):
+        """Redoes the last undone step. Returns the first row it changed, or None."""
+        edits = self.history.redo()
+        if edits is None:
+            return None
+        for edit in edits:
+            self._write_edit(edit, undo=False)
+        self.cues_edited.emit()
+        return edits[0][0]
+
+    def _write_edit(self, edit, undo):
+        """Writes the old (undo) or new values of an edit into the store."""
+        if isinstance(edit, CueTextEdit):
+            self.cue_store.set_text(edit.row, edit.old_text if undo else edit.new_text)
+            first_row = last_row = edit.row
+            first_column = last_column = self.TEXT_COLUMN
+        else:
+            first_row, last_row = edit.first_row, edit.first_row + len(edit.new_starts) - 1
+            for column, values in ((self.cue_store.starts, edit.old_starts if undo else edit.new_starts),
+                                   (self.cue_store.ends, edit.old_ends if undo else edit.new_ends)):
+                times = np.frombuffer(column, dtype=np.int64)
+                times[first_row:last_row + 1] = values
+                del times
+            first_column, last_column = self.START_COLUMN, self.END_COLUMN
+        self.edit_written.emit(edit, undo)
+
+        # Only the fetched rows are known to the view.
+        last_row = min(last_row, self._fetched_rows - 1)
+        if first_row <= last_row:
+            self.dataChanged.emit(self.index(first_row, first_column), self.index(last_row, last_column),
+                                  [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.EditRole])
+
+
+def cue_columns(cue_store):
+    """The cues of a store as plain lists, the way journaled and saved states hold them."""
+    return {"starts": cue_store.starts.tolist(), "ends": cue_store.ends.tolist(), "texts": cue_store.texts()}
+
+
+def file_source(loaded_file):
+    """A (path, size, mtime_ns) loaded file as the "source" of a journaled or saved state."""
+    path, size, mtime_ns = loaded_file
+    return {"path": path, "size": size, "mtime_ns": mtime_ns}
 
 
 # --- Main Tool Widget ---
 class SrtEditorTool(QWidget):
-    """A tool for editing SRT files with syntax highlighting."""
+    """
+    A tool for editing SRT files with syntax highlighting.
+
+    The file can be shown as text or as a cue table. Both views edit the same
+    content; the other view is only rebuilt when it is switched to. Each view
+    has its own undo history, which is reset when the view is rebuilt.
+    """
     def __init__(self):
         super().__init__()
         self.setProperty("class", "tool-widget")
 
+        settings = QSettings(ORGANIZATION_NAME, APPLICATION_NAME)
+        history_bytes = settings.value("undo_history_mb", DEFAULT_UNDO_HISTORY_MB, type=int) * 1024 * 1024
+
+        # Parsed cues of the last loaded file, shared with the other tools' format.
+        self.cue_store = CueStore()
+        self.file_path = None
+        # Set when one view was edited and the other has not been rebuilt yet.
+        self._store_stale = False
+        self._text_stale = False
+        # The tab's crash journal, while one is attached (see attach_journal()).
+        self._journal = None
+        # (path, size, mtime_ns) of the loaded file while the content is still what loading it gave.
+        self._loaded_file = None
+        # Set when restore_state() found the journaled file changed, its edits would land in the wrong places.
+        self._journal_base_changed = False
+
         # --- Main Layout ---
         main_layout = QHBoxLayout(self)
         main_layout.setContentsMargins(15, 15, 15, 15)
@@ -60,6 +806,29 @@ class SrtEditorTool(QWidget):
         # --- Editor Widget ---
         self.editor = QPlainTextEdit()
         self.editor.setPlaceholderText("Open an .srt file or paste its content here...")
+        self.text_history = TextHistory(self.editor, history_bytes)
+
+        # --- Cue Table Widget ---
+        # Only the visible rows are formatted, so huge files stay responsive.
+        self.table_model = CueTableModel(self.cue_store, self, max_history_bytes=history_bytes)
+        self.table_view = QTableView()
+        self.table_view.setModel(self.table_model)
+        self.table_view.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.table_view.setWordWrap(False)
+        self.table_view.verticalHeader().setVisible(False)
+        # Fixed row heights and column widths, measuring contents would visit every row.
+        self.table_view.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        header = self.table_view.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+        time_width = self.table_view.fontMetrics().horizontalAdvance("00:00:00,000") + 24
+        self.table_view.setColumnWidth(CueTableModel.INDEX_COLUMN, self.table_view.fontMetrics().horizontalAdvance("000000") + 24)
+        self.table_view.setColumnWidth(CueTableModel.START_COLUMN, time_width)
+        self.table_view.setColumnWidth(CueTableModel.END_COLUMN, time_width)
+
+        self.view_stack = QStackedWidget()
+        self.view_stack.addWidget(self.editor)
+        self.view_stack.addWidget(self.table_view)
 
         # --- Button Layout ---
         button_container = QWidget()
@@ -72,6 +841,25 @@ class SrtEditorTool(QWidget):
         save_button = QPushButton(qta.icon('fa5s.save'), " Save File")
         top_button = QPushButton(qta.icon('fa5s.arrow-up'), " Move to Top")
         bottom_button = QPushButton(qta.icon('fa5s.arrow-down'), " Move to Bottom")
+        self.table_view_button = QPushButton(qta.icon('fa5s.table'), " Table View")
+        self.table_view_button.setCheckable(True)
+
+        history_layout = QHBoxLayout()
+        self.undo_button = QPushButton(qta.icon('fa5s.undo'), " Undo")
+        self.redo_button = QPushButton(qta.icon('fa5s.redo'), " Redo")
+        history_layout.addWidget(self.undo_button)
+        history_layout.addWidget(self.redo_button)
+
+        # --- Shift Layout ---
+        # Shifts the selected cues, or all of them, in one undoable step.
+        shift_layout = QHBoxLayout()
+        self.shift_input = QSpinBox()
+        self.shift_input.setRange(-24 * 3600 * 1000, 24 * 3600 * 1000)
+        self.shift_input.setSingleStep(100)
+        self.shift_input.setSuffix(" ms")
+        shift_button = QPushButton(qta.icon('fa5s.clock'), " Shift Times")
+        shift_layout.addWidget(self.shift_input, 1)
+        shift_layout.addWidget(shift_button)
         
         # --- Find Layout ---
         find_layout = QHBoxLayout()
@@ -80,17 +868,38 @@ class SrtEditorTool(QWidget):
         find_button = QPushButton(qta.icon('fa5s.search'), " Find Next")
         find_layout.addWidget(self.find_input)
         find_layout.addWidget(find_button)
+
+        find_options_layout = QHBoxLayout()
+        find_previous_button = QPushButton(qta.icon('fa5s.chevron-up'), " Previous")
+        self.match_case_button = QPushButton(qta.icon('fa5s.font'), " Match Case")
+        self.match_case_button.setCheckable(True)
+        self.regex_button = QPushButton(qta.icon('fa5s.asterisk'), " Regex")
+        self.regex_button.setCheckable(True)
+        find_options_layout.addWidget(find_previous_button)
+        find_options_layout.addWidget(self.match_case_button)
+        find_options_layout.addWidget(self.regex_button)
+        self.match_label = QLabel()
+
+        # Searching starts once typing paused for a moment.
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
         
         button_layout.addWidget(open_button)
         button_layout.addWidget(save_button)
+        button_layout.addWidget(self.table_view_button)
+        button_layout.addLayout(history_layout)
         button_layout.addSpacing(20)
         button_layout.addWidget(top_button)
         button_layout.addWidget(bottom_button)
+        button_layout.addLayout(shift_layout)
         button_layout.addSpacing(20)
         button_layout.addLayout(find_layout)
+        button_layout.addLayout(find_options_layout)
+        button_layout.addWidget(self.match_label)
 
 
-        main_layout.addWidget(self.editor, 1) # The '1' makes the editor take up available space
+        main_layout.addWidget(self.view_stack, 1) # The '1' makes the editor take up available space
         main_layout.addWidget(button_container)
 
         # --- Connections ---
@@ -99,10 +908,29 @@ class SrtEditorTool(QWidget):
         top_button.clicked.connect(self.move_to_top)
         bottom_button.clicked.connect(self.move_to_bottom)
         find_button.clicked.connect(self.find_next)
+        find_previous_button.clicked.connect(self.find_previous)
         self.find_input.returnPressed.connect(self.find_next)
+        self.find_input.textChanged.connect(self.search_timer.start)
+        self.search_timer.timeout.connect(self._update_search_pattern)
+        self.match_case_button.toggled.connect(self._update_search_pattern)
+        self.regex_button.toggled.connect(self._update_search_pattern)
+        self.table_view_button.toggled.connect(self._on_table_view_toggled)
+        self.editor.textChanged.connect(self._on_text_edited)
+        self.table_model.cues_edited.connect(self._on_table_edited)
+        self.undo_button.clicked.connect(self.undo)
+        self.redo_button.clicked.connect(self.redo)
+        shift_button.clicked.connect(self.shift_times)
+        self.text_history.changed.connect(self._update_history_buttons)
+        self.text_history.edited.connect(self._on_text_history_edited)
+        self.table_model.edit_written.connect(self._on_cue_edit_written)
+        # The documents' own undo is off, the standard shortcuts use the histories instead.
+        self.editor.installEventFilter(self)
+        self.table_view.installEventFilter(self)
+        self._update_history_buttons()
 
         # --- Highlighter Setup ---
         self.setup_highlighter()
+        self.search.matches_changed.connect(self._update_match_label)
 
     def setup_highlighter(self):
         """Initializes the syntax highlighter with colors from the tool's style file."""
@@ -133,18 +961,70 @@ class SrtEditorTool(QWidget):
         text_format = QTextCharFormat()
         text_format.setForeground(QColor(color_palette['text']))
         formats['text'] = text_format
-        
-        # Create and apply the highlighter
+
+        # Inline tag format (<i>, <font color=...>, ...)
+        tag_format = QTextCharFormat()
+        tag_format.setForeground(QColor(color_palette['tag']))
+        formats['tag'] = tag_format
+
+        # Search match formats
+        match_format = QTextCharFormat()
+        match_format.setBackground(QColor(color_palette['match']))
+        current_match_format = QTextCharFormat()
+        current_match_format.setBackground(QColor(color_palette['current_match']))
+        self.search = DocumentSearch(self.editor, match_format, current_match_format)
+
+        # Plain text lines are not formatted at all, the palette gives them their color.
+        palette = self.editor.palette()
+        palette.setColor(QPalette.ColorRole.Text, QColor(color_palette['text']))
+        self.editor.setPalette(palette)
+
+        # Create and apply the highlighters, only one of them is active at a time.
         self.highlighter = SrtHighlighter(self.editor.document(), formats)
+        self.viewport_highlighter = ViewportHighlighter(self.editor, formats)
+
+    def _configure_highlighting(self, line_count):
+        """
+        Highlights small documents whole, and large ones only where they are
+        visible. Called before the document's text is replaced.
+        """
+        viewport_only = line_count > VIEWPORT_HIGHLIGHT_THRESHOLD_LINES
+        if viewport_only == self.viewport_highlighter.enabled:
+            return
+        self.viewport_highlighter.set_enabled(viewport_only)
+        self.highlighter.setDocument(None if viewport_only else self.editor.document())
 
     # NEW: This method allows the TabManager to open a file when the tool is created.
     def load_file_on_startup(self, file_path):
         """
         Loads a file's content directly into the editor. Used for 'Open With...'.
+        Large files are streamed into the cue table instead of a text document.
         The TabManager that calls this method is responsible for handling exceptions.
         """
-        with open(file_path, 'r', encoding='utf-8') as f:
-            self.editor.setPlainText(f.read())
+        file_stat = os.stat(file_path)
+        if file_stat.st_size > TABLE_VIEW_THRESHOLD_BYTES:
+            self.cue_store = CueStore.from_file(file_path)
+            self.table_model.set_cue_store(self.cue_store)
+            # The text is only composed if the text view is opened.
+            self._set_editor_text("")
+            self._text_stale = True
+            self.file_path = file_path
+            self._show_view(table=True)
+        else:
+            content = read_text(file_path)
+            self.cue_store = CueStore.from_srt(content)
+            self.table_model.set_cue_store(self.cue_store)
+            # The text is shown as the file has it: the parsed cues are for the
+            # table only, saving a file that was just opened must not rewrite it.
+            self._set_editor_text(content)
+            self._text_stale = False
+            self.file_path = file_path
+            self._show_view(table=False)
+
+        # Until the first edit, the journal only needs to know which file to load again.
+        self._loaded_file = (file_path, file_stat.st_size, file_stat.st_mtime_ns)
+        if self._journal is not None:
+            self._journal.snapshot()
 
     def open_file(self):
         """Opens a file dialog to load an SRT file."""
@@ -164,25 +1044,392 @@ class SrtEditorTool(QWidget):
             if not file_path.lower().endswith('.srt'):
                 file_path += '.srt'
             try:
-                with open(file_path, 'w', encoding='utf-8') as f:
-                    f.write(self.editor.toPlainText())
+                if self._is_table_view():
+                    # Written cue by cue, no text document is needed.
+                    self.cue_store.write(file_path, encoding='utf-8')
+                else:
+                    # The table's cues may still be read from this file, keep them before it is overwritten.
+                    self.cue_store.release_source(file_path)
+                    with open(file_path, 'w', encoding='utf-8') as f:
+                        f.write(self.editor.toPlainText())
             except Exception as e:
                 print(f"Error saving file: {e}")
 
+    # --- Text and Table Views ---
+
+    def _is_table_view(self):
+        return self.view_stack.currentWidget() is self.table_view
+
+    def _set_editor_text(self, text):
+        """Replaces the editor text without marking the cue store as stale."""
+        self._configure_highlighting(text.count('\n'))
+        self.text_history.set_text(text)
+        self._store_stale = False
+
+    def _on_text_edited(self):
+        self._store_stale = True
+
+    def _on_table_edited(self):
+        self._text_stale = True
+        self._loaded_file = None
+        self._update_history_buttons()
+
+    def _on_table_view_toggled(self, checked):
+        self._show_view(table=checked)
+        # Rebuilding the view is repeatable, the journal only needs to know it happened.
+        if self._journal is not None:
+            self._journal.record(["view", "table" if checked else "text"])
+
+    def _show_view(self, table):
+        """Switches between the text and the table view, rebuilding the one that is shown if needed."""
+        if table and self._store_stale:
+            self.cue_store = CueStore.from_srt(self.editor.toPlainText())
+            self.table_model.set_cue_store(self.cue_store)
+            self._store_stale = False
+        elif not table and self._text_stale:
+            self._set_editor_text(self.cue_store.to_srt())
+            self._text_stale = False
+
+        self.view_stack.setCurrentWidget(self.table_view if table else self.editor)
+        self.table_view_button.blockSignals(True)
+        self.table_view_button.setChecked(table)
+        self.table_view_button.blockSignals(False)
+        self._update_match_label()
+        self._update_history_buttons()
+
+    def _select_table_row(self, row):
+        """Fetches the table up to row, then selects and scrolls to it."""
+        self.table_model.fetch_up_to(row)
+        index = self.table_model.index(row, CueTableModel.TEXT_COLUMN)
+        self.table_view.setCurrentIndex(index)
+        self.table_view.scrollTo(index)
+
     def move_to_top(self):
         """Moves the cursor to the beginning of the document."""
+        if self._is_table_view():
+            if len(self.cue_store):
+                self._select_table_row(0)
+            return
         cursor = self.editor.textCursor()
         cursor.movePosition(QTextCursor.MoveOperation.Start)
         self.editor.setTextCursor(cursor)
 
     def move_to_bottom(self):
         """Moves the cursor to the end of the document."""
+        if self._is_table_view():
+            if len(self.cue_store):
+                self._select_table_row(len(self.cue_store) - 1)
+            return
         cursor = self.editor.textCursor()
         cursor.movePosition(QTextCursor.MoveOperation.End)
         self.editor.setTextCursor(cursor)
 
+    # --- Undo History and Bulk Edits ---
+
+    def eventFilter(self, watched, event):
+        if event.type() == QEvent.Type.KeyPress:
+            if event.matches(QKeySequence.StandardKey.Undo):
+                self.undo()
+                return True
+            if event.matches(QKeySequence.StandardKey.Redo):
+                self.redo()
+                return True
+        return super().eventFilter(watched, event)
+
+    def _current_history(self):
+        return self.table_model.history if self._is_table_view() else self.text_history.history
+
+    def _update_history_buttons(self):
+        history = self._current_history()
+        self.undo_button.setEnabled(history.can_undo())
+        self.redo_button.setEnabled(history.can_redo())
+
+    def undo(self):
+        """Undoes the last edit of the current view."""
+        if self._is_table_view():
+            row = self.table_model.undo()
+            if row is not None:
+                self._select_table_row(row)
+        else:
+            self.text_history.undo()
+
+    def redo(self):
+        """Redoes the last undone edit of the current view."""
+        if self._is_table_view():
+            row = self.table_model.redo()
+            if row is not None:
+                self._select_table_row(row)
+        else:
+            self.text_history.redo()
+
+    def shift_times(self):
+        """
+        Shifts the selected cues, or every cue when nothing is selected, by the
+        shift input's milliseconds. However many cues change, the shift is
+        undone as one step, and the history only keeps the changed times.
+        """
+        shift_ms = self.shift_input.value()
+        if not shift_ms:
+            return
+        if self._is_table_view():
+            rows = [index.row() for index in self.table_view.selectionModel().selectedRows()]
+            self.table_model.shift_times(rows or None, shift_ms)
+            return
+        ranges = list(self._timing_shift_ranges(shift_ms))
+        if ranges:
+            self.text_history.replace_ranges(ranges)
+
+    def _timing_shift_ranges(self, shift_ms):
+        """
+        Yields a (position, length, text) replacement for the two timestamps of
+        every timing line in the selection, or in the whole document.
+        """
+        document = self.editor.document()
+        cursor = self.editor.textCursor()
+        if cursor.hasSelection():
+            block = document.findBlock(cursor.selectionStart())
+            last_block = document.findBlock(cursor.selectionEnd())
+        else:
+            block, last_block = document.begin(), document.lastBlock()
+
+        while block.isValid():
+            text = block.text()
+            match = TIMING_PATTERN.match(text) if '-->' in text else None
+            if match:
+                start_ms = max(parse_timestamp(match.group(1)) + shift_ms, 0)
+                end_ms = max(parse_timestamp(match.group(2)) + shift_ms, 0)
+                shifted = format_timestamp(start_ms) + text[match.end(1):match.start(2)] + format_timestamp(end_ms)
+                yield block.position() + match.start(1), match.end(2) - match.start(1), shifted
+            if block == last_block:
+                break
+            block = block.next()
+
+    # --- Search ---
+
+    def _search_pattern(self):
+        """Returns the compiled find query, or None if it is empty. Raises re.error for an invalid regex."""
+        query = self.find_input.text()
+        if not query:
+            return None
+        return compile_query(query, regex=self.regex_button.isChecked(),
+                             case_sensitive=self.match_case_button.isChecked())
+
+    def _update_search_pattern(self):
+        self.search_timer.stop()
+        try:
+            pattern = self._search_pattern()
+        except re.error as e:
+            self.search.set_pattern(None)
+            self.match_label.setText(f"Invalid regex: {e}")
+            return
+        self.search.set_pattern(pattern)
+
+    def _update_match_label(self):
+        """Shows the match count of the text view, with the number of the current match."""
+        search = self.search
+        if self._is_table_view() or search.pattern is None:
+            self.match_label.clear()
+        elif search.is_searching():
+            self.match_label.setText("Searching...")
+        elif not len(search.index):
+            self.match_label.setText("No matches")
+        elif search.current >= 0:
+            self.match_label.setText(f"{search.current + 1} of {len(search.index)}")
+        else:
+            count = len(search.index)
+            self.match_label.setText(f"{count} match" if count == 1 else f"{count} matches")
+
     def find_next(self):
         """Finds the next occurrence of the text in the find input."""
-        query = self.find_input.text()
-        if query:
-            self.editor.find(query)
\ No newline at end of file
+        self._find(1)
+
+    def find_previous(self):
+        """Finds the previous occurrence of the text in the find input."""
+        self._find(-1)
+
+    def _find(self, step):
+        if self.search_timer.isActive():
+            self._update_search_pattern()
+        if not self._is_table_view():
+            self.search.find(step)
+            return
+
+        # The table is searched cue by cue, starting next to the selected row.
+        try:
+            pattern = self._search_pattern()
+        except re.error:
+            return
+        cue_count = len(self.cue_store)
+        if pattern is None or not cue_count:
+            return
+        current = self.table_view.currentIndex()
+        row = current.row() if current.isValid() else (-1 if step > 0 else cue_count)
+        for _ in range(cue_count):
+            row = (row + step) % cue_count
+            if pattern.search(self.cue_store.text(row)):
+                self._select_table_row(row)
+                return
+
+    def save_state(self):
+        """
+        Returns the editor's content and position so the TabManager can dispose
+        of the widget, and with it the laid out document, and recreate it later.
+        """
+        state = {
+            "file_path": self.file_path,
+            "loaded_file": self._loaded_file,
+            "find_text": self.find_input.text(),
+            "find_match_case": self.match_case_button.isChecked(),
+            "find_regex": self.regex_button.isChecked(),
+        }
+        if self._is_table_view():
+            current = self.table_view.currentIndex()
+            state.update({
+                "view": "table",
+                # Kept as is, composing and re-parsing a huge file would defeat the table view.
+                "cue_store": self.cue_store,
+                "history": self.table_model.history,
+                "current_row": current.row() if current.isValid() else -1,
+            })
+        else:
+            state.update({
+                "view": "text",
+                # The mirror holds the text already, with the history that refers to it.
+                "text": self.text_history.pieces.text(),
+                "piece_table": self.text_history.pieces,
+                "history": self.text_history.history,
+                "cursor_position": self.editor.textCursor().position(),
+                "scroll_position": self.editor.verticalScrollBar().value(),
+            })
+        return state
+
+    def restore_state(self, state):
+        """Restores the content returned by save_state() or journal_state() on a freshly created widget."""
+        self.file_path = state.get("file_path")
+        self.match_case_button.setChecked(state.get("find_match_case", False))
+        self.regex_button.setChecked(state.get("find_regex", False))
+        self.find_input.setText(state.get("find_text", ""))
+
+        source = state.get("source")
+        if source:
+            self.load_file_on_startup(source["path"])
+            self._journal_base_changed = self._loaded_file != (source["path"], source["size"], source["mtime_ns"])
+            self._show_view(table=state.get("view") == "table")
+            return
+
+        # Hibernated unedited, the content is still what loading the file gave.
+        self._loaded_file = state.get("loaded_file")
+
+        if state.get("view") == "table":
+            if "cue_store" in state:
+                self.cue_store = state["cue_store"]
+            else:
+                cues = state["cues"]
+                self.cue_store = CueStore.from_cues(zip(cues["starts"], cues["ends"], cues["texts"]))
+            self.table_model.set_cue_store(self.cue_store)
+            if state.get("history") is not None:
+                self.table_model.history = state["history"]
+            self._text_stale = True
+            self._show_view(table=True)
+            if state.get("current_row", -1) >= 0:
+                self._select_table_row(state["current_row"])
+            return
+
+        text = state.get("text", "")
+        self._set_editor_text(text)
+        if state.get("piece_table") is not None:
+            self.text_history.restore(state["piece_table"], state["history"])
+        self.cue_store = CueStore.from_srt(text)
+        self.table_model.set_cue_store(self.cue_store)
+        cursor = self.editor.textCursor()
+        cursor.setPosition(min(state.get("cursor_position", 0), len(text)))
+        self.editor.setTextCursor(cursor)
+        self.editor.verticalScrollBar().setValue(state.get("scroll_position", 0))
+
+    # --- Crash Journal ---
+
+    def attach_journal(self, journal):
+        """Records every later edit into journal (see session_journal.py), or stops recording for None."""
+        self._journal = journal
+
+    def journal_state(self):
+        """
+        Returns the content for the crash journal: the loaded file's identity
+        while it is unedited, otherwise a function composing the content
+        from copies, to run on the journal's thread.
+        """
+        state = {
+            "file_path": self.file_path,
+            "view": "table" if self._is_table_view() else "text",
+            "find_text": self.find_input.text(),
+            "find_match_case": self.match_case_button.isChecked(),
+            "find_regex": self.regex_button.isChecked(),
+        }
+        if self._loaded_file is not None:
+            state["source"] = file_source(self._loaded_file)
+            return state
+
+        if self._is_table_view():
+            cue_store = self.cue_store.copy()
+
+            def compose():
+                state["cues"] = cue_columns(cue_store)
+                return state
+            return compose
+
+        # The pieces are immutable, only their list needs to be taken now.
+        pieces = self.text_history.pieces.pieces(0, len(self.text_history.pieces))
+        state["cursor_position"] = self.editor.textCursor().position()
+
+        def compose():
+            state["text"] = join_pieces(pieces)
+            return state
+        return compose
+
+    @staticmethod
+    def plain_state(state):
+        """Returns a save_state() result as plain data, the way journal_state() gives it."""
+        state = dict(state)
+        # The histories are not kept, a restored editor starts new ones.
+        state.pop("piece_table", None)
+        state.pop("history", None)
+        cue_store = state.pop("cue_store", None)
+        loaded_file = state.pop("loaded_file", None)
+        if loaded_file is not None:
+            # Unedited, the file is enough to load the content again.
+            state.pop("text", None)
+            state["source"] = file_source(loaded_file)
+        elif cue_store is not None:
+            state["cues"] = cue_columns(cue_store)
+        return state
+
+    def replay_journal_record(self, data):
+        """Makes an edit recorded through attach_journal() again, after restore_state()."""
+        if self._journal_base_changed:
+            raise ValueError(f"'{self.file_path}' changed since it was journaled, its edits cannot be made again.")
+        kind = data[0]
+        if kind == "text":
+            self.text_history.replay(data[1])
+        elif kind == "cue_text":
+            self.table_model.apply_edit(CueTextEdit(data[1], None, data[2]))
+        elif kind == "cue_times":
+            self.table_model.apply_edit(CueTimesEdit(data[1], None, None, np.array(data[2], dtype=np.int64),
+                                                     np.array(data[3], dtype=np.int64)))
+        elif kind == "view":
+            self._show_view(table=data[1] == "table")
+
+    def _on_text_history_edited(self, ranges):
+        self._loaded_file = None
+        if self._journal is not None:
+            self._journal.record(["text", ranges])
+
+    def _on_cue_edit_written(self, edit, undo):
+        self._loaded_file = None
+        if self._journal is None:
+            return
+        if isinstance(edit, CueTextEdit):
+            self._journal.record(["cue_text", edit.row, edit.old_text if undo else edit.new_text])
+        else:
+            self._journal.record(["cue_times", edit.first_row,
+                                  (edit.old_starts if undo else edit.new_starts).tolist(),
+                                  (edit.old_ends if undo else edit.new_ends).tolist()])
@@ -6,17 +6,26 @@ HIGHLIGHTING_COLORS = {
     'dark': {
         'index': '#e67e22',       # A shade of orange
         'time': '#5dade2',        # A soft blue
-        'text': '#ecf0f1'         # Primary text color from dark theme
+        'text': '#ecf0f1',        # Primary text color from dark theme
+        'tag': '#95a5a6',         # Muted grey for inline tags
+        'match': '#6e5c1e',       # Dim amber behind search matches
+        'current_match': '#b9770e'
     },
     'light': {
         'index': '#d35400',       # A stronger orange
         'time': '#2980b9',        # A stronger blue
-        'text': '#2c3e50'         # Primary text color from light theme
+        'text': '#2c3e50',        # Primary text color from light theme
+        'tag': '#7f8c8d',         # Muted grey for inline tags
+        'match': '#f9e79f',       # Pale yellow behind search matches
+        'current_match': '#f5b041'
     },
     'contrast': {
         'index': 'blue',
         'time': 'red',
-        'text': 'black'
+        'text': 'black',
+        'tag': 'green',
+        'match': 'yellow',
+        'current_match': 'cyan'
     }
 }
 
@@ -27,7 +36,7 @@ HIGHLIGHTING_COLORS = {
 STYLE_TEMPLATE = """
     /* --- Styles for SrtEditorTool --- */
 
-    SrtEditorTool > QPlainTextEdit {{
+    SrtEditorTool QPlainTextEdit, SrtEditorTool QTableView {{
         background-color: {colors["bg_tertiary"]};
         color: {colors["text_primary"]}; /* This is the default text color */
         border: 1px solid {colors["border_color"]};
@@ -36,6 +45,20 @@ STYLE_TEMPLATE = """
         font-family: Consolas, "Courier New", monospace;
     }}
 
+    SrtEditorTool QTableView {{
+        gridline-color: {colors["border_color"]};
+        selection-background-color: {colors["accent_subtle_hover"]};
+        selection-color: {colors["text_primary"]};
+    }}
+
+    SrtEditorTool QHeaderView::section {{
+        background-color: {colors["bg_secondary"]};
+        color: {colors["text_primary"]};
+        border: none;
+        border-right: 1px solid {colors["border_color"]};
+        padding: 4px;
+    }}
+
     SrtEditorTool > QWidget > QPushButton {{
         margin-bottom: 5px; /* Add some space between buttons */
     }}
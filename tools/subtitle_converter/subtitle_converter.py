@@ -1,25 +1,293 @@
 # tools/subtitle_converter/subtitle_converter_tool.py
 
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+import os
+import glob
+import time
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor, as_completed
+
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QHBoxLayout, QLabel, QPushButton, QComboBox,
+    QCheckBox, QFileDialog, QMessageBox
+)
 from PySide6.QtCore import Qt
 
+from core.srt_stream import read_chunks
+from core.subtitle_formats import FORMATS, format_for_path, write_cues
+from tool_jobs import ToolJobMixin
+
 # Self-definition for the Subtitle Converter tool
 TOOL_DEFINITION = {
     "display_name": "🔄 Subtitle Converter",
     "description": "Convert subtitles to various formats.",
-    "widget_class_name": "SubtitleConverterTool"
+    "widget_class_name": "SubtitleConverterTool",
+    "can_open_file": True,
+    # Headless entry point used by the subtl command line (see subtl.py)
+    "batch_function_name": "convert_subtitle_file",
+    "batch_output_suffix": "_Subtl_Converted",
+    # Read by subtl instead of its .srt default, and the value of the 'to'
+    # option becomes the extension of the output files.
+    "batch_input_extensions": [".srt", ".vtt", ".ass", ".ssa", ".sbv"],
+    "batch_output_extension_option": "to",
+    "batch_options": {
+        "to": {"type": "str", "default": "srt", "choices": ["srt", "vtt", "ass", "sbv"], "help": "Format to convert to."},
+    },
 }
 
-class SubtitleConverterTool(QWidget):
-    """Placeholder widget for the Subtitle Converter tool."""
+# Added to the output name when it would otherwise be the input file itself.
+SAME_NAME_SUFFIX = "_Subtl_Converted"
+
+
+def convert_subtitle_file(input_path, output_path, to="srt", progress=None):
+    """
+    Converts a subtitle file to the format named by 'to'; the input format is
+    taken from its extension. Cues stream from the reader straight into the
+    writer, so memory use does not grow with the file. Needs no Qt
+    application, so it can run in batch worker processes.
+    """
+    source_format = format_for_path(input_path)
+    if os.path.abspath(output_path) == os.path.abspath(input_path):
+        raise ValueError("The output file would overwrite the input file.")
+    cues = source_format.read(read_chunks(input_path, progress=progress))
+    return write_cues(output_path, cues, to)
+
+
+def converted_path(input_path, to, output_dir=None):
+    """Returns the output path of input_path converted to 'to', in output_dir or next to the input."""
+    directory = output_dir or os.path.dirname(input_path)
+    base_name = os.path.splitext(os.path.basename(input_path))[0]
+    output_path = os.path.join(directory, f"{base_name}.{to}")
+    if os.path.abspath(output_path) == os.path.abspath(input_path):
+        output_path = os.path.join(directory, f"{base_name}{SAME_NAME_SUFFIX}.{to}")
+    return output_path
+
+
+def find_subtitle_files(directory, recursive=False):
+    """Returns the files in directory that one of the readers in FORMATS can read."""
+    extensions = tuple(extension for subtitle_format in FORMATS.values() for extension in subtitle_format.extensions)
+    pattern = os.path.join(directory, '**', '*') if recursive else os.path.join(directory, '*')
+    return sorted(path for path in glob.glob(pattern, recursive=recursive)
+                  if os.path.isfile(path) and path.lower().endswith(extensions))
+
+
+def convert_files(jobs, to, workers=None, progress=None):
+    """
+    Converts every (input_path, output_path) pair in jobs, spread over a pool
+    of worker processes. A failing file does not stop the others.
+    Returns (cue_count, failures), failures being (input_path, message) pairs.
+    """
+    cue_count = 0
+    failures = []
+    if len(jobs) <= 1 or workers == 1:
+        for done, (input_path, output_path) in enumerate(jobs, 1):
+            try:
+                cue_count += convert_subtitle_file(input_path, output_path, to)
+            except Exception as e:
+                failures.append((input_path, str(e)))
+            if progress:
+                progress(done, len(jobs))
+        return cue_count, failures
+
+    # Spawned rather than forked, the GUI process runs Qt threads.
+    executor = ProcessPoolExecutor(max_workers=workers, mp_context=multiprocessing.get_context('spawn'))
+    try:
+        futures = {executor.submit(convert_subtitle_file, input_path, output_path, to): input_path
+                   for input_path, output_path in jobs}
+        for done, future in enumerate(as_completed(futures), 1):
+            try:
+                cue_count += future.result()
+            except Exception as e:
+                failures.append((futures[future], str(e)))
+            if progress:
+                progress(done, len(jobs))
+    finally:
+        # On cancellation the files not started yet are dropped.
+        executor.shutdown(cancel_futures=True)
+    return cue_count, failures
+
+
+class SubtitleConverterTool(ToolJobMixin, QWidget):
+    """
+    UI widget for the Subtitle Converter tool. Converts a single file, or
+    every subtitle file of a folder across worker processes.
+    """
+    JOB_TITLE = "Subtitle Converter"
+    JOB_BUTTONS = ("convert_button",)
+
     def __init__(self):
         super().__init__()
+        self.input_file_path = None
+        self.input_folder_path = None
+
+        # Add a property to identify this as a tool widget for styling
         self.setProperty("class", "tool-widget")
-        
+
         layout = QVBoxLayout(self)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        label = QLabel(f"{TOOL_DEFINITION['display_name']} - Placeholder")
-        label.setObjectName("placeholder_label")
-        
-        layout.addWidget(label)
\ No newline at end of file
+        layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+
+        # Input selection, a single file or a whole folder
+        select_layout = QHBoxLayout()
+        file_select_button = QPushButton("Select Subtitle File")
+        file_select_button.clicked.connect(self.select_file)
+        folder_select_button = QPushButton("Select Folder")
+        folder_select_button.clicked.connect(self.select_folder)
+        select_layout.addWidget(file_select_button)
+        select_layout.addWidget(folder_select_button)
+
+        self.file_path_label = QLabel("No file selected.")
+        self.file_path_label.setWordWrap(True)
+        # Set an object name for specific styling
+        self.file_path_label.setObjectName("file_path_label")
+
+        self.recursive_checkbox = QCheckBox("Include sub-folders")
+        self.recursive_checkbox.setEnabled(False)
+
+        description_label = QLabel(TOOL_DEFINITION["description"])
+        format_layout = QHBoxLayout()
+        format_layout.addWidget(QLabel("Convert to:"))
+        self.format_combo = QComboBox()
+        for name, subtitle_format in FORMATS.items():
+            self.format_combo.addItem(f"{subtitle_format.description} (.{name})", name)
+        format_layout.addWidget(self.format_combo, 1)
+
+        # Convert button
+        self.convert_button = QPushButton("Convert and Save As...")
+        self.convert_button.clicked.connect(self.convert)
+
+        # Add widgets to layout
+        layout.addLayout(select_layout)
+        layout.addWidget(self.file_path_label)
+        layout.addWidget(self.recursive_checkbox)
+        layout.addSpacing(20)
+        layout.addWidget(description_label)
+        layout.addLayout(format_layout)
+        layout.addSpacing(20)
+        layout.addWidget(self.convert_button)
+
+    def _file_filter(self):
+        patterns = " ".join(f"*{extension}" for subtitle_format in FORMATS.values()
+                            for extension in subtitle_format.extensions)
+        return f"Subtitle Files ({patterns})"
+
+    def select_file(self):
+        """
+        Open a file dialog to select a subtitle file.
+        """
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open Subtitle File", "", self._file_filter())
+        if file_path:
+            self.load_file(file_path)
+
+    def select_folder(self):
+        """
+        Open a dialog to select a folder whose subtitle files are all converted.
+        """
+        folder_path = QFileDialog.getExistingDirectory(self, "Select Folder")
+        if folder_path:
+            self.load_folder(folder_path)
+
+    def load_file_on_startup(self, file_path: str):
+        """
+        Loads a file when the tool is opened directly with a file.
+        This method is called by the TabManager.
+        """
+        if os.path.exists(file_path):
+            try:
+                format_for_path(file_path)
+            except ValueError:
+                pass
+            else:
+                self.load_file(file_path)
+                return
+        self.file_path_label.setText(f"Error: Invalid or non-existent file provided.")
+
+    def load_file(self, file_path):
+        """
+        A central method to handle the logic of loading a file into the tool.
+        """
+        self.input_file_path = file_path
+        self.input_folder_path = None
+        self.file_path_label.setText(f"Selected: {file_path}")
+        self.recursive_checkbox.setEnabled(False)
+        self.convert_button.setText("Convert and Save As...")
+
+    def load_folder(self, folder_path):
+        """Selects every subtitle file of a folder for conversion."""
+        self.input_folder_path = folder_path
+        self.input_file_path = None
+        self.file_path_label.setText(f"Selected folder: {folder_path}")
+        self.recursive_checkbox.setEnabled(True)
+        self.convert_button.setText("Convert Folder To...")
+
+    def convert(self):
+        """
+        Convert the selected file, or every file of the selected folder, to the
+        chosen format. A file is saved where the user picks, a folder's files
+        are saved into an output folder under their original names.
+        """
+        to = self.format_combo.currentData()
+        if self.input_folder_path:
+            self._convert_folder(to)
+            return
+        if not self.input_file_path:
+            QMessageBox.warning(self, "Warning", "Please select a subtitle file or folder first.")
+            return
+
+        try:
+            default_save_path = converted_path(self.input_file_path, to)
+            description = FORMATS[to].description
+            output_file_path, _ = QFileDialog.getSaveFileName(self, "Save Subtitle File As...", default_save_path,
+                                                              f"{description} Files (*.{to})")
+            if output_file_path:
+                self._start_job(output_file_path, convert_subtitle_file, self.input_file_path, output_file_path, to)
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"An error occurred: {e}")
+
+    def _convert_folder(self, to):
+        input_paths = find_subtitle_files(self.input_folder_path, self.recursive_checkbox.isChecked())
+        if not input_paths:
+            QMessageBox.warning(self, "Warning", "The selected folder contains no subtitle files.")
+            return
+        output_dir = QFileDialog.getExistingDirectory(self, "Save Converted Files To", self.input_folder_path)
+        if not output_dir:
+            return
+
+        # Sub-folders are mirrored, so equally named files never collide.
+        jobs = []
+        for input_path in input_paths:
+            relative_dir = os.path.relpath(os.path.dirname(input_path), self.input_folder_path)
+            target_dir = os.path.normpath(os.path.join(output_dir, relative_dir))
+            os.makedirs(target_dir, exist_ok=True)
+            jobs.append((input_path, converted_path(input_path, to, target_dir)))
+        self._start_job(output_dir, convert_files, jobs, to)
+
+    def _tool_state(self):
+        return {
+            "input_file_path": self.input_file_path,
+            "input_folder_path": self.input_folder_path,
+            "recursive": self.recursive_checkbox.isChecked(),
+            "format": self.format_combo.currentData(),
+        }
+
+    def restore_state(self, state):
+        """Restores the inputs returned by save_state() on a freshly created widget."""
+        if state.get("input_file_path"):
+            self.load_file(state["input_file_path"])
+        elif state.get("input_folder_path"):
+            self.load_folder(state["input_folder_path"])
+        self.recursive_checkbox.setChecked(state.get("recursive", False))
+        index = self.format_combo.findData(state.get("format", "srt"))
+        if index >= 0:
+            self.format_combo.setCurrentIndex(index)
+
+    def _on_job_finished(self, result):
+        # A folder conversion reports the files it could not convert.
+        elapsed = max(time.perf_counter() - self._job_started_at, 1e-6)
+        cue_count, failures = result if isinstance(result, tuple) else (result, [])
+        message = (f"Converted {cue_count} cues in {elapsed:.2f} s ({cue_count / elapsed:,.0f} cues/s).\n"
+                   f"Saved to {self._job_output_path}")
+        if failures:
+            details = "\n".join(f"{os.path.basename(path)}: {error}" for path, error in failures)
+            QMessageBox.warning(self, "Finished With Errors", f"{message}\n\n{len(failures)} files failed:\n{details}")
+        else:
+            QMessageBox.information(self, "Success", message)
@@ -1,25 +1,201 @@
 # tools/subtitle_shifter/subtitle_shifter_tool.py
 
-from PySide6.QtWidgets import QWidget, QVBoxLayout, QLabel
+import os
+from PySide6.QtWidgets import (
+    QWidget, QVBoxLayout, QLabel, QPushButton, QSpinBox, QComboBox,
+    QCheckBox, QFileDialog, QMessageBox, QHBoxLayout
+)
 from PySide6.QtCore import Qt
 
+from core.cue_store import CueStore
+from core.timing import transform_times, frame_rate_factor
+from tool_jobs import ToolJobMixin
+
 # Self-definition for the Subtitle Shifter tool
 TOOL_DEFINITION = {
     "display_name": "⏰ Subtitle Shifter",
     "description": "Shift subtitle timings forwards or backwards.",
-    "widget_class_name": "SubtitleShifterTool"
+    "widget_class_name": "SubtitleShifterTool",
+    "can_open_file": True,
+    # Headless entry point used by the subtl command line (see subtl.py)
+    "batch_function_name": "shift_subtitle_file",
+    "batch_output_suffix": "_Subtl_Shifted",
+    "batch_options": {
+        "shift_ms": {"type": "int", "default": 0, "help": "Milliseconds to shift by, negative moves subtitles earlier."},
+        "source_fps": {"type": "float", "default": None, "help": "Frame rate the subtitles are timed for."},
+        "target_fps": {"type": "float", "default": None, "help": "Frame rate to convert the timings to."},
+    },
 }
 
-class SubtitleShifterTool(QWidget):
-    """Placeholder widget for the Subtitle Shifter tool."""
+# Frame rates offered for frame rate conversion.
+FRAME_RATES = ["23.976", "24", "25", "29.97", "30", "50", "59.94", "60"]
+
+
+def shift_subtitle_file(input_path, output_path, shift_ms=0, source_fps=None, target_fps=None, progress=None):
+    """
+    Retimes a whole SRT file in one vectorized pass and writes the result.
+    When both frame rates are given, times are scaled before being shifted.
+    """
+    subtitles = CueStore.from_file(input_path, progress=progress)
+    scale = frame_rate_factor(source_fps, target_fps) if source_fps and target_fps else 1.0
+    transform_times(subtitles, shift_ms=shift_ms, scale=scale, min_ms=0)
+    subtitles.write(output_path, encoding='utf-8')
+    return len(subtitles)
+
+class SubtitleShifterTool(ToolJobMixin, QWidget):
+    """
+    UI widget for the Subtitle Shifter tool.
+    """
+    JOB_TITLE = "Subtitle Shifter"
+
     def __init__(self):
         super().__init__()
+        self.input_file_path = None
         self.setProperty("class", "tool-widget")
-        
+
         layout = QVBoxLayout(self)
-        layout.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        label = QLabel(f"{TOOL_DEFINITION['display_name']} - Placeholder")
-        label.setObjectName("placeholder_label")
-        
-        layout.addWidget(label)
\ No newline at end of file
+        layout.setAlignment(Qt.AlignmentFlag.AlignTop)
+
+        # File selection
+        file_select_button = QPushButton("Select SRT File")
+        file_select_button.clicked.connect(self.select_file)
+        self.file_path_label = QLabel("No file selected.")
+        self.file_path_label.setWordWrap(True)
+        self.file_path_label.setObjectName("file_path_label")
+        description_label = QLabel(TOOL_DEFINITION["description"])
+
+        # Shift amount, negative values move subtitles earlier
+        shift_layout = QHBoxLayout()
+        self.shift_input = QSpinBox()
+        self.shift_input.setRange(-100000, 100000)
+        self.shift_input.setValue(0)
+        self.time_unit_combo = QComboBox()
+        self.time_unit_combo.addItems(["Milliseconds", "Seconds", "Minutes"])
+        shift_layout.addWidget(self.shift_input)
+        shift_layout.addWidget(self.time_unit_combo)
+
+        # Optional frame rate conversion
+        self.frame_rate_checkbox = QCheckBox("Convert frame rate")
+        self.frame_rate_checkbox.stateChanged.connect(self._toggle_frame_rate_options)
+        frame_rate_layout = QHBoxLayout()
+        self.source_fps_combo = QComboBox()
+        self.source_fps_combo.setEditable(True)
+        self.source_fps_combo.addItems(FRAME_RATES)
+        self.source_fps_combo.setCurrentText("23.976")
+        self.target_fps_combo = QComboBox()
+        self.target_fps_combo.setEditable(True)
+        self.target_fps_combo.addItems(FRAME_RATES)
+        self.target_fps_combo.setCurrentText("25")
+        frame_rate_layout.addWidget(QLabel("From:"))
+        frame_rate_layout.addWidget(self.source_fps_combo)
+        frame_rate_layout.addWidget(QLabel("To:"))
+        frame_rate_layout.addWidget(self.target_fps_combo)
+        self.frame_rate_options = QWidget()
+        self.frame_rate_options.setLayout(frame_rate_layout)
+        self.frame_rate_options.setEnabled(False)
+
+        # Apply button
+        self.apply_button = QPushButton("Apply and Save As...")
+        self.apply_button.clicked.connect(self.apply_shift)
+
+        # Add widgets to layout
+        layout.addWidget(file_select_button)
+        layout.addWidget(self.file_path_label)
+        layout.addSpacing(20)
+        layout.addWidget(description_label)
+        layout.addLayout(shift_layout)
+        layout.addWidget(self.frame_rate_checkbox)
+        layout.addWidget(self.frame_rate_options)
+        layout.addSpacing(20)
+        layout.addWidget(self.apply_button)
+
+    def _toggle_frame_rate_options(self, state):
+        """Enables the frame rate inputs only when conversion is checked."""
+        self.frame_rate_options.setEnabled(state == Qt.CheckState.Checked.value)
+
+    def select_file(self):
+        """
+        Open a file dialog to select an SRT file.
+        """
+        file_path, _ = QFileDialog.getOpenFileName(self, "Open SRT File", "", "SubRip Files (*.srt)")
+        if file_path:
+            self.load_file(file_path)
+
+    def load_file_on_startup(self, file_path: str):
+        """
+        Loads a file when the tool is opened directly with a file.
+        This method is called by the TabManager.
+        """
+        if os.path.exists(file_path) and file_path.endswith('.srt'):
+            self.load_file(file_path)
+        else:
+            self.file_path_label.setText(f"Error: Invalid or non-existent file provided.")
+
+    def load_file(self, file_path):
+        """
+        A central method to handle the logic of loading a file into the tool.
+        """
+        self.input_file_path = file_path
+        self.file_path_label.setText(f"Selected: {file_path}")
+
+    def apply_shift(self):
+        """
+        Shift (and optionally rescale) the selected SRT file and save it.
+        """
+        if not self.input_file_path:
+            QMessageBox.warning(self, "Warning", "Please select an SRT file first.")
+            return
+
+        shift_val = self.shift_input.value()
+        time_unit = self.time_unit_combo.currentText()
+        if time_unit == "Milliseconds":
+            shift_ms = shift_val
+        elif time_unit == "Seconds":
+            shift_ms = shift_val * 1000
+        else:  # Minutes
+            shift_ms = shift_val * 60_000
+
+        source_fps = target_fps = None
+        if self.frame_rate_checkbox.isChecked():
+            try:
+                source_fps = float(self.source_fps_combo.currentText())
+                target_fps = float(self.target_fps_combo.currentText())
+            except ValueError:
+                QMessageBox.warning(self, "Warning", "Please enter valid frame rates.")
+                return
+            if source_fps <= 0 or target_fps <= 0:
+                QMessageBox.warning(self, "Warning", "Frame rates must be greater than zero.")
+                return
+
+        try:
+            directory = os.path.dirname(self.input_file_path)
+            file_name, file_ext = os.path.splitext(os.path.basename(self.input_file_path))
+            default_save_path = os.path.join(directory, f"{file_name}_Subtl_Shifted{file_ext}")
+
+            output_file_path, _ = QFileDialog.getSaveFileName(self, "Save SRT File As...", default_save_path, "SubRip Files (*.srt)")
+
+            if output_file_path:
+                self._start_job(output_file_path, shift_subtitle_file, self.input_file_path, output_file_path, shift_ms, source_fps, target_fps)
+
+        except Exception as e:
+            QMessageBox.critical(self, "Error", f"An error occurred: {e}")
+
+    def _tool_state(self):
+        return {
+            "input_file_path": self.input_file_path,
+            "shift": self.shift_input.value(),
+            "unit_index": self.time_unit_combo.currentIndex(),
+            "convert_frame_rate": self.frame_rate_checkbox.isChecked(),
+            "source_fps": self.source_fps_combo.currentText(),
+            "target_fps": self.target_fps_combo.currentText(),
+        }
+
+    def restore_state(self, state):
+        """Restores the inputs returned by save_state() on a freshly created widget."""
+        if state.get("input_file_path"):
+            self.load_file(state["input_file_path"])
+        self.shift_input.setValue(state.get("shift", 0))
+        self.time_unit_combo.setCurrentIndex(state.get("unit_index", 0))
+        self.frame_rate_checkbox.setChecked(state.get("convert_frame_rate", False))
+        self.source_fps_combo.setCurrentText(state.get("source_fps", "23.976"))
+        self.target_fps_combo.setCurrentText(state.get("target_fps", "25"))
@@ -1,49 +1,65 @@
 # tool_loader.py
 
-import sys
 import traceback
 
-# Import the list of registered tools from the auto-generated registry.
-# This is the Nuitka-friendly way.
-from .tool_registry import REGISTERED_TOOL_MODULES
+# Import the tool metadata from the auto-generated manifest. Listing the tools
+# needs no tool module, each one is imported the first time it is opened.
+# The manifest's importer keeps one explicit import per tool, the Nuitka-friendly way.
+from .tool_manifest import TOOL_MANIFEST, import_tool_module
 
 def load_tools():
     """
-    Loads all available tools that have been explicitly registered in tool_registry.py.
+    Builds the list of available tools from the static manifest in tool_manifest.py.
 
-    This approach is compatible with compilers like Nuitka because it relies on
-    explicit imports, allowing the compiler to trace and include all necessary files.
+    No tool module is imported here, which keeps startup fast. Use
+    get_widget_class() to load a tool's widget when it is actually opened.
     """
     loaded_tools = {}
 
-    # Iterate through the explicitly imported modules, not the filesystem.
-    for module in REGISTERED_TOOL_MODULES:
+    for tool_id, entry in TOOL_MANIFEST.items():
         try:
-            # The tool_id is derived from the module's name (e.g., 'tools.renamer.renamer' -> 'renamer')
-            tool_id = module.__name__.split('.')[-1]
-
-            if hasattr(module, 'TOOL_DEFINITION'):
-                definition = module.TOOL_DEFINITION
-                widget_class = getattr(module, definition['widget_class_name'])
-
-                loaded_tools[tool_id] = {
-                    "display_name": definition['display_name'],
-                    "widget_class": widget_class,
-                    "description": definition.get('description', ''),
-                    "can_open_file": definition.get('can_open_file', False),
-                    "stylesheet_module": definition.get('stylesheet_module', None),
-                }
-            else:
-                print(f"Warning: Tool module '{module.__name__}' is missing a 'TOOL_DEFINITION'.")
-
-        except (AttributeError, KeyError) as e:
-            print(f"Warning: Tool module '{module.__name__}' has a misconfigured definition: {e}")
-            traceback.print_exc()
+            loaded_tools[tool_id] = {
+                "display_name": entry['display_name'],
+                "description": entry.get('description', ''),
+                "can_open_file": entry.get('can_open_file', False),
+                "widget_class_path": entry['widget_class_path'],
+            }
+        except KeyError as e:
+            print(f"Warning: Tool '{tool_id}' has a misconfigured manifest entry: {e}")
 
     if not loaded_tools:
-        print("Warning: No tools were loaded. Run build_tool_registry.py to generate the tool registry.")
+        print("Warning: No tools were loaded. Run build_registries.py to generate the tool manifest.")
 
     return loaded_tools
 
-# The single source of truth, now populated at runtime from the static registry.
-AVAILABLE_TOOLS = load_tools()
\ No newline at end of file
+# The single source of truth, populated at startup from the static manifest.
+AVAILABLE_TOOLS = load_tools()
+
+# Widget classes of the tools opened so far, by tool_id.
+_widget_classes = {}
+
+def get_widget_class(tool_id):
+    """
+    Returns the widget class of a tool, importing its module on first use.
+    Returns None if the tool is unknown or its module fails to load.
+    """
+    if tool_id in _widget_classes:
+        return _widget_classes[tool_id]
+    if tool_id not in AVAILABLE_TOOLS:
+        return None
+
+    class_name = AVAILABLE_TOOLS[tool_id]['widget_class_path'].rsplit('.', 1)[-1]
+    try:
+        module = import_tool_module(tool_id)
+        widget_class = getattr(module, class_name)
+    except Exception as e:
+        print(f"Warning: Tool '{tool_id}' could not be loaded: {e}")
+        traceback.print_exc()
+        return None
+
+    _widget_classes[tool_id] = widget_class
+    return widget_class
+
+def loaded_widget_class(tool_id):
+    """Returns the widget class of a tool whose module was imported already, or None."""
+    return _widget_classes.get(tool_id)
@@ -0,0 +1,227 @@
+# tool_manifest.py
+#
+# !!! THIS FILE IS AUTO-GENERATED BY build_registries.py !!!
+# !!! DO NOT EDIT MANUALLY. YOUR CHANGES WILL BE OVERWRITTEN. !!!
+#
+# Static metadata of every tool, read from their TOOL_DEFINITION. The UI is
+# rendered from this manifest and a tool module is only imported when the tool
+# is first opened. The imports below stay explicit, one per tool, so Nuitka
+# can still trace and include every tool.
+
+# --- Tool Metadata ---
+TOOL_MANIFEST = {
+    'max_length': {
+        'display_name': '📏 Maximum Length',
+        'description': 'Adjust the maximum display time of subtitles.',
+        'can_open_file': True,
+        'widget_class_path': 'tools.max_length.max_length.MaxLengthTool',
+        'batch_function_name': 'apply_max_length_to_file',
+        'batch_output_suffix': '_Subtl_MaxLength',
+        'batch_options': {
+            'max_length': {
+                'type': 'int',
+                'default': 7,
+                'help': 'Maximum display time of a subtitle.',
+            },
+            'unit': {
+                'type': 'str',
+                'default': 's',
+                'choices': ['ms', 's', 'm'],
+                'help': 'Unit of --max-length.',
+            },
+            'min_gap': {
+                'type': 'int',
+                'default': None,
+                'help': 'Also keep cues at least this many ms apart.',
+            },
+        },
+    },
+    'merge': {
+        'display_name': '🔗 Merge Lines',
+        'description': 'Combine multiple subtitle lines into one.',
+        'can_open_file': False,
+        'widget_class_path': 'tools.merge.merge.MergeTool',
+        'batch_function_name': 'merge_subtitle_files',
+        'batch_output_suffix': '_Subtl_Merged',
+        'batch_options': {
+            'mode': {
+                'type': 'str',
+                'default': 'stacked',
+                'choices': ['glue', 'stacked'],
+                'help': 'Merge mode.',
+            },
+            'secondary': {
+                'type': 'str',
+                'multiple': True,
+                'default': [],
+                'companion': True,
+                'help': "Secondary file next to each input, '{stem}' is replaced by the input's name (e.g. '{stem}.fr.srt'). Repeat for several files.",
+            },
+            'color': {
+                'type': 'str',
+                'default': None,
+                'help': 'Hex color for stacked secondary lines.',
+            },
+            'base_length': {
+                'type': 'str',
+                'multiple': True,
+                'default': [],
+                'help': 'Video length of a glued part as hh:mm:ss, repeat for the parts in order. Parts without one use their last end time.',
+            },
+        },
+    },
+    'min_length': {
+        'display_name': '📏 Minimum Length',
+        'description': 'Adjust the minimum display time of subtitles.',
+        'can_open_file': True,
+        'widget_class_path': 'tools.min_length.min_length.MinLengthTool',
+        'batch_function_name': 'apply_min_length_to_file',
+        'batch_output_suffix': '_Subtl_MinLength',
+        'batch_options': {
+            'min_length': {
+                'type': 'int',
+                'default': 1000,
+                'help': 'Minimum display time of a subtitle.',
+            },
+            'unit': {
+                'type': 'str',
+                'default': 'ms',
+                'choices': ['ms', 's', 'm'],
+                'help': 'Unit of --min-length.',
+            },
+            'min_gap': {
+                'type': 'int',
+                'default': None,
+                'help': 'Keep cues at least this many ms apart. By default extended cues only stop at the next one.',
+            },
+            'max_cps': {
+                'type': 'float',
+                'default': None,
+                'help': 'Also extend cues to be readable at this many characters per second.',
+            },
+        },
+    },
+    'multilingual_merge': {
+        'display_name': '🌍 Multilingual Merge',
+        'description': 'Merge subtitles from different languages.',
+        'can_open_file': True,
+        'widget_class_path': 'tools.multilingual_merge.multilingual_merge.MultilingualMergeTool',
+        'batch_function_name': 'multilingual_merge_file',
+        'batch_output_suffix': '_Subtl_Multilingual',
+        'batch_options': {
+            'track': {
+                'type': 'str',
+                'multiple': True,
+                'default': [],
+                'companion': True,
+                'help': "Language track next to each input, '{stem}' is replaced by the input's name (e.g. '{stem}.fr.srt'). Repeat for every track, the input is the first one.",
+            },
+            'min_overlap': {
+                'type': 'int',
+                'default': 250,
+                'help': 'Milliseconds two cues must overlap to be merged into one.',
+            },
+        },
+    },
+    'placeholder_tool': {
+        'display_name': '✂️ coming soon',
+        'description': 'This tool is a placeholder for future development.',
+        'can_open_file': False,
+        'widget_class_path': 'tools.placeholder_tool.placeholder_tool.PlaceholderTool',
+    },
+    'split': {
+        'display_name': '✂️ Split Lines',
+        'description': 'Split long subtitle lines into two.',
+        'can_open_file': True,
+        'widget_class_path': 'tools.split.split.SplitTool',
+        'batch_function_name': 'split_lines_in_file',
+        'batch_output_suffix': '_Subtl_Split',
+        'batch_options': {
+            'max_width': {
+                'type': 'int',
+                'default': 42,
+                'help': 'Maximum line width in characters, CJK characters count twice.',
+            },
+            'mode': {
+                'type': 'str',
+                'default': 'lines',
+                'choices': ['lines', 'cues'],
+                'help': "'lines' wraps long cues onto two lines and only splits them into two cues when two lines are not enough, 'cues' always splits them into two cues.",
+            },
+        },
+    },
+    'srt_editor': {
+        'display_name': '📝 SRT Editor',
+        'description': 'A color-coded editor for SRT subtitle files.',
+        'can_open_file': True,
+        'widget_class_path': 'tools.srt_editor.srt_editor.SrtEditorTool',
+    },
+    'subtitle_converter': {
+        'display_name': '🔄 Subtitle Converter',
+        'description': 'Convert subtitles to various formats.',
+        'can_open_file': True,
+        'widget_class_path': 'tools.subtitle_converter.subtitle_converter.SubtitleConverterTool',
+        'batch_function_name': 'convert_subtitle_file',
+        'batch_output_suffix': '_Subtl_Converted',
+        'batch_input_extensions': ['.srt', '.vtt', '.ass', '.ssa', '.sbv'],
+        'batch_output_extension_option': 'to',
+        'batch_options': {
+            'to': {
+                'type': 'str',
+                'default': 'srt',
+                'choices': ['srt', 'vtt', 'ass', 'sbv'],
+                'help': 'Format to convert to.',
+            },
+        },
+    },
+    'subtitle_shifter': {
+        'display_name': '⏰ Subtitle Shifter',
+        'description': 'Shift subtitle timings forwards or backwards.',
+        'can_open_file': True,
+        'widget_class_path': 'tools.subtitle_shifter.subtitle_shifter.SubtitleShifterTool',
+        'batch_function_name': 'shift_subtitle_file',
+        'batch_output_suffix': '_Subtl_Shifted',
+        'batch_options': {
+            'shift_ms': {
+                'type': 'int',
+                'default': 0,
+                'help': 'Milliseconds to shift by, negative moves subtitles earlier.',
+            },
+            'source_fps': {
+                'type': 'float',
+                'default': None,
+                'help': 'Frame rate the subtitles are timed for.',
+            },
+            'target_fps': {
+                'type': 'float',
+                'default': None,
+                'help': 'Frame rate to convert the timings to.',
+            },
+        },
+    },
+}
+
+# --- Lazy Tool Imports ---
+def import_tool_module(tool_id):
+    """Imports and returns the module of a tool. Only called when the tool is opened."""
+    if tool_id == "max_length":
+        from tools.max_length import max_length as module
+    elif tool_id == "merge":
+        from tools.merge import merge as module
+    elif tool_id == "min_length":
+        from tools.min_length import min_length as module
+    elif tool_id == "multilingual_merge":
+        from tools.multilingual_merge import multilingual_merge as module
+    elif tool_id == "placeholder_tool":
+        from tools.placeholder_tool import placeholder_tool as module
+    elif tool_id == "split":
+        from tools.split import split as module
+    elif tool_id == "srt_editor":
+        from tools.srt_editor import srt_editor as module
+    elif tool_id == "subtitle_converter":
+        from tools.subtitle_converter import subtitle_converter as module
+    elif tool_id == "subtitle_shifter":
+        from tools.subtitle_shifter import subtitle_shifter as module
+    else:
+        raise KeyError(f"Unknown tool '{tool_id}'")
+    return module
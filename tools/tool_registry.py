@@ -4,8 +4,8 @@
 # !!! DO NOT EDIT MANUALLY. YOUR CHANGES WILL BE OVERWRITTEN. !!!
 #
 # This file contains the explicit list of all tools to be included in the
-# application. It is used by the tool_loader to populate the list of
-# available tools in a way that is compatible with compilers like Nuitka.
+# application. Importing it loads every tool module at once; the application
+# itself lists tools from tool_manifest.py and imports them lazily.
 
 # --- Tool Module Imports ---
 # Nuitka will trace these imports and include them in the final build.
@@ -22,7 +22,7 @@ from tools.subtitle_converter import subtitle_converter as subtitle_converter_mo
 from tools.subtitle_shifter import subtitle_shifter as subtitle_shifter_module
 
 # --- Tool Registration List ---
-# The tool_loader will iterate through this list to build the AVAILABLE_TOOLS dict.
+# Every registered tool module, in a stable order.
 REGISTERED_TOOL_MODULES = [
     max_length_module,
     merge_module,